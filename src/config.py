@@ -23,3 +23,93 @@ SMTP_CONFIG = {
     'sender_password': os.getenv('SMTP_PASSWORD') # Your Google App Password
 }
 
+
+# Pengaturan pool koneksi database (lihat src/database/db_connector.py)
+DB_POOL_CONFIG = {
+    'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),                    # Jumlah maksimum koneksi terbuka
+    'checkout_timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),       # Detik menunggu koneksi bebas
+    'idle_recycle_seconds': int(os.getenv('DB_POOL_RECYCLE', '1800')),   # Koneksi idle lebih lama dari ini ditutup
+    'ping_interval': int(os.getenv('DB_POOL_PING_INTERVAL', '30'))       # Ping koneksi yang idle lebih lama dari ini
+}
+
+# Pengaturan pemuat gambar bersama untuk GUI (lihat src/image_storage/image_loader.py)
+IMAGE_LOADER_CONFIG = {
+    'max_workers': int(os.getenv('IMAGE_LOADER_WORKERS', '4')),          # Jumlah thread pengunduh gambar
+    'timeout': float(os.getenv('IMAGE_LOADER_TIMEOUT', '10'))            # Timeout request HTTP (detik)
+}
+
+# Pengaturan cache gambar dua tingkat: memori + disk (lihat src/image_storage/image_cache.py)
+IMAGE_CACHE_CONFIG = {
+    'memory_max_bytes': int(os.getenv('IMAGE_CACHE_MEMORY_MB', '64')) * 1024 * 1024,   # Batas cache thumbnail di memori
+    'disk_dir': os.getenv('IMAGE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'lostfound', 'images')),
+    'disk_max_bytes': int(os.getenv('IMAGE_CACHE_DISK_MB', '256')) * 1024 * 1024,      # Batas ukuran cache di disk
+    'fresh_seconds': int(os.getenv('IMAGE_CACHE_FRESH_SECONDS', '86400'))              # Lama entri disk dipakai tanpa revalidasi
+}
+
+# Pengaturan thread pool untuk pekerjaan latar belakang GUI, misal query DAO (lihat src/utils/task_runner.py)
+TASK_RUNNER_CONFIG = {
+    'max_workers': int(os.getenv('TASK_RUNNER_WORKERS', '4'))            # Jumlah thread worker
+}
+
+# Pengaturan unggah gambar paralel ke ImageKit.io (lihat src/image_storage/upload_manager.py)
+UPLOAD_CONFIG = {
+    'max_workers': int(os.getenv('UPLOAD_WORKERS', '3')),                # Jumlah file yang diunggah bersamaan
+    'process_images': os.getenv('UPLOAD_PROCESS_IMAGES', 'true').lower() == 'true'  # Perkecil & encode ulang sebelum diunggah
+}
+
+# Pengaturan pemrosesan gambar sebelum diunggah (lihat src/image_storage/image_processing.py)
+IMAGE_PROCESSING_CONFIG = {
+    'max_workers': int(os.getenv('IMAGE_PROCESSING_WORKERS')) if os.getenv('IMAGE_PROCESSING_WORKERS') else None, # None = semua core CPU
+    'max_dimension': int(os.getenv('UPLOAD_MAX_DIMENSION', '1600')),     # Sisi terpanjang maksimum (piksel)
+    'output_format': os.getenv('UPLOAD_IMAGE_FORMAT', 'JPEG'),           # 'JPEG' atau 'WEBP'
+    'quality': int(os.getenv('UPLOAD_IMAGE_QUALITY', '85'))              # Kualitas encoding (1-100)
+}
+
+# Pengaturan worker yang mengirim email dari tabel EmailOutbox (lihat src/utils/email_worker.py)
+EMAIL_WORKER_CONFIG = {
+    'batch_size': int(os.getenv('EMAIL_WORKER_BATCH_SIZE', '50')),        # Email yang diklaim per batch
+    'max_attempts': int(os.getenv('EMAIL_WORKER_MAX_ATTEMPTS', '8')),     # Percobaan sebelum masuk dead-letter
+    'backoff_base': int(os.getenv('EMAIL_WORKER_BACKOFF_BASE', '30')),    # Jeda retry awal (detik), dikali dua tiap gagal
+    'backoff_max': int(os.getenv('EMAIL_WORKER_BACKOFF_MAX', '3600')),    # Jeda retry maksimum (detik)
+    'lease_seconds': int(os.getenv('EMAIL_WORKER_LEASE_SECONDS', '300')), # Lama klaim batch sebelum boleh diambil worker lain
+    'poll_interval': float(os.getenv('EMAIL_WORKER_POLL_INTERVAL', '5'))  # Jeda cek outbox saat kosong (detik)
+}
+# Jalankan worker email sebagai thread di dalam aplikasi GUI (matikan jika worker dijalankan sebagai proses terpisah)
+EMAIL_WORKER_IN_APP = os.getenv('EMAIL_WORKER_IN_APP', 'true').lower() == 'true'
+
+# Pengaturan hashing/verifikasi bcrypt di process pool (lihat src/utils/password_service.py)
+PASSWORD_SERVICE_CONFIG = {
+    'max_workers': int(os.getenv('PASSWORD_WORKERS', '2')),              # Jumlah proses bcrypt paralel
+    'rounds': int(os.getenv('BCRYPT_ROUNDS', '12'))                      # Cost factor bcrypt; hash lama di-rehash saat login
+}
+
+# Pengaturan instrumentasi query database (lihat src/database/query_stats.py)
+QUERY_STATS_CONFIG = {
+    'enabled': os.getenv('QUERY_STATS_ENABLED', 'true').lower() == 'true',  # Catat waktu setiap query DAO
+    'slow_query_ms': float(os.getenv('SLOW_QUERY_MS', '200')),            # Query lebih lambat dari ini masuk slow log
+    'window_size': int(os.getenv('QUERY_STATS_WINDOW', '1000'))            # Sampel terakhir per fungsi untuk p50/p95/p99
+}
+
+# Pengaturan pengecekan notifikasi baru di halaman utama (lihat MainAppFrame.update_notification_count)
+NOTIFICATION_POLL_CONFIG = {
+    'interval_ms': int(os.getenv('NOTIFICATION_POLL_MS', '5000'))         # Jeda antar pengecekan versi notifikasi
+}
+
+# Pengarsipan notifikasi lama yang sudah dibaca (lihat src/utils/notification_maintenance.py)
+NOTIFICATION_ARCHIVE_CONFIG = {
+    'older_than_days': int(os.getenv('NOTIFICATION_ARCHIVE_DAYS', '90')),           # Umur minimum notifikasi yang diarsipkan
+    'batch_size': int(os.getenv('NOTIFICATION_ARCHIVE_BATCH_SIZE', '1000')),        # Notifikasi per batch/transaksi
+    'pause_seconds': float(os.getenv('NOTIFICATION_ARCHIVE_PAUSE_SECONDS', '0.1'))  # Jeda antar batch (detik)
+}
+
+# Pengaturan logging aplikasi (lihat src/utils/log_utils.py)
+LOGGING_CONFIG = {
+    'level': os.getenv('LOG_LEVEL', 'INFO'),                             # DEBUG, INFO, WARNING, ERROR
+    'json': os.getenv('LOG_FORMAT', 'text').lower() == 'json',           # 'json' = satu baris JSON per log
+    'file': os.getenv('LOG_FILE') or None,                               # Kosong = tulis ke stderr
+    # Level per modul, misal "src.database=DEBUG,src.gui=WARNING"
+    'module_levels': dict(
+        (name.strip(), level.strip().upper())
+        for name, level in (part.split('=', 1) for part in os.getenv('LOG_MODULE_LEVELS', '').split(',') if '=' in part)
+    )
+}
@@ -4,8 +4,27 @@ import mysql.connector
 import datetime
 import random
 import os
+import threading
 from src.database.db_connector import create_db_connection, close_db_connection
-from src.utils.auth_utils import check_password, hash_password
+from src.database.email_outbox_dao import insert_outbox_email
+from src.utils.password_service import get_password_service
+from src.utils.email_utils import get_reset_password_email_body
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Query pencarian yang juga diperiksa dengan EXPLAIN oleh src/database/migrations.py (--check-plans)
+SQL_FETCH_USER_FOR_LOGIN = "SELECT UserID, PasswordHash, IsActive, IsAdmin FROM Users WHERE Username = %s"
+SQL_FIND_EMAIL_TOKEN = """
+    SELECT TokenID, ExpiryTime, IsUsed
+    FROM EmailVerificationToken
+    WHERE UserID = %s AND Token = %s
+"""
+SQL_FIND_RESET_TOKEN = """
+    SELECT TokenID, UserID, ExpiryTime, IsUsed
+    FROM PasswordResetToken
+    WHERE Token = %s
+"""
 
 def _convert_user_id(user_id):
     """Helper function to safely convert user_id to integer"""
@@ -25,8 +44,12 @@ def _convert_user_id(user_id):
          raise ValueError(f"Cannot convert user_id to integer: {user_id}")
 
 
-def create_new_user_with_token(full_name, nim_nip, email, role_id, username, password_hash, token, expiry_time):
-    """Menyimpan data pengguna baru ke tabel CampusUsers dan Users."""
+def create_new_user_with_token(full_name, nim_nip, email, role_id, username, password_hash, token, expiry_time, email_subject=None, email_body=None):
+    """
+    Menyimpan data pengguna baru ke tabel CampusUsers dan Users.
+    Jika email_subject dan email_body diberikan, email OTP dimasukkan ke EmailOutbox
+    dalam transaksi yang sama dengan token, lalu dikirim oleh worker email.
+    """
     conn = create_db_connection()
     if conn is None:
         return None, None
@@ -47,48 +70,118 @@ def create_new_user_with_token(full_name, nim_nip, email, role_id, username, pas
         sql_token = "INSERT INTO EmailVerificationToken (UserID, Token, ExpiryTime) VALUES (%s, %s, %s)"
         cursor.execute(sql_token, (user_id, token, expiry_time))
 
+        if email_subject and email_body:
+            insert_outbox_email(cursor, email, email_subject, email_body)
+
         conn.commit()
         return user_id, token
 
     except mysql.connector.Error as err:
         conn.rollback()
-        print(f"Database Error in create_new_user_with_token: {err}")
+        logger.error("Database Error in create_new_user_with_token: %s", err)
         return None, None
     finally:
         cursor.close()
         close_db_connection(conn)
 
 def authenticate_user(username, plain_password):
-    """Memverifikasi kredensial login pengguna."""
+    """
+    Memverifikasi kredensial login pengguna.
+    Koneksi dikembalikan ke pool sebelum verifikasi bcrypt, agar login yang bersamaan
+    tidak menahan koneksi database selama ratusan milidetik.
+    """
     conn = create_db_connection()
     if conn is None:
         return None
 
     cursor = conn.cursor(dictionary=True)
-    user_data = None
+    user = None
 
     try:
-        sql_fetch_user = "SELECT UserID, PasswordHash, IsActive, IsAdmin FROM Users WHERE Username = %s"
-        cursor.execute(sql_fetch_user, (username,))
+        cursor.execute(SQL_FETCH_USER_FOR_LOGIN, (username,))
         user = cursor.fetchone()
 
-        if user:
-            stored_password_hash = user['PasswordHash']
-            is_active = user['IsActive']
-            user_id = user['UserID']
-            is_admin = user['IsAdmin']
+    except mysql.connector.Error as err:
+        logger.error("Database Error in authenticate_user: %s", err)
+        return None
+    finally:
+        cursor.close()
+        close_db_connection(conn)
 
-            if check_password(plain_password, stored_password_hash):
-                 # Return user data regardless of active status,
-                 # the GUI will handle the IsActive check
-                 user_data = {'UserID': user_id, 'IsActive': is_active, 'IsAdmin': is_admin}
+    if not user:
+        return None
+
+    stored_password_hash = user['PasswordHash']
+    # Verifikasi bcrypt dijalankan di process pool (lihat PasswordService)
+    try:
+        password_ok = get_password_service().check(plain_password, stored_password_hash)
+    except ValueError as e:
+        # Hash tersimpan tidak valid (bukan hash bcrypt): diperlakukan sebagai login gagal
+        logger.error("Invalid password hash stored for UserID %s: %s", user['UserID'], e)
+        return None
+    if not password_ok:
+        return None
+
+    # Hash dengan cost factor lama dibuat ulang di latar belakang; login tidak menunggu
+    if get_password_service().needs_rehash(stored_password_hash):
+        _rehash_password_in_background(user['UserID'], plain_password, stored_password_hash)
+
+    # Return user data regardless of active status,
+    # the GUI will handle the IsActive check
+    return {'UserID': user['UserID'], 'IsActive': user['IsActive'], 'IsAdmin': user['IsAdmin']}
+
+def _rehash_password_in_background(user_id, plain_password, old_password_hash):
+    """
+    Membuat hash baru dengan cost factor yang dikonfigurasi di process pool PasswordService,
+    lalu menyimpannya saat hash selesai. Tidak memblokir pemanggil.
+    """
+    def store(new_password_hash):
+        try:
+            if update_password_hash_if_unchanged(user_id, old_password_hash, new_password_hash):
+                logger.info("Password hash for UserID %s upgraded to the configured bcrypt cost factor.", user_id)
+        except Exception as e:
+            logger.error("Error while storing rehashed password for UserID %s: %s", user_id, e)
+
+    def on_hashed(future):
+        # Dipanggil di thread internal process pool: jangan melakukan I/O di sini, karena selama
+        # callback berjalan Future PasswordService lain (login bersamaan) tidak bisa selesai.
+        # UPDATE ke database diserahkan ke thread singkat tersendiri.
+        try:
+            new_password_hash = future.result()
+        except Exception as e:
+            logger.error("Error while rehashing password for UserID %s: %s", user_id, e)
+            return
+        threading.Thread(target=store, args=(new_password_hash,), name="password-rehash-store", daemon=True).start()
+
+    get_password_service().submit_hash(plain_password).add_done_callback(on_hashed)
+
+def update_password_hash_if_unchanged(user_id, old_password_hash, new_password_hash):
+    """
+    Mengganti PasswordHash hanya jika nilainya masih old_password_hash (compare-and-set),
+    sehingga rehash tidak menimpa password yang diganti/di-reset di antara login dan rehash.
+
+    Returns:
+        bool: True jika hash diperbarui, False jika hash sudah berubah atau terjadi error.
+    """
+    conn = create_db_connection()
+    if conn is None:
+        return False
+
+    cursor = conn.cursor()
+
+    try:
+        sql = "UPDATE Users SET PasswordHash = %s WHERE UserID = %s AND PasswordHash = %s"
+        cursor.execute(sql, (new_password_hash, user_id, old_password_hash))
+        conn.commit()
+        return cursor.rowcount == 1
 
     except mysql.connector.Error as err:
-        print(f"Database Error in authenticate_user: {err}")
+        conn.rollback()
+        logger.error("Database Error in update_password_hash_if_unchanged: %s", err)
+        return False
     finally:
         cursor.close()
         close_db_connection(conn)
-        return user_data
 
 def activate_user_account(user_id):
     """Mengaktifkan akun pengguna."""
@@ -106,7 +199,7 @@ def activate_user_account(user_id):
         success = True
     except mysql.connector.Error as err:
         conn.rollback()
-        print(f"Database Error in activate_user_account: {err}")
+        logger.error("Database Error in activate_user_account: %s", err)
     finally:
         cursor.close()
         close_db_connection(conn)
@@ -119,7 +212,7 @@ def verify_email_token(user_id, token):
         user_id = _convert_user_id(user_id) # Use the helper function
         token = str(token)
     except ValueError as e:
-        print(f"Error converting parameters in verify_email_token: {e}")
+        logger.error("Error converting parameters in verify_email_token: %s", e)
         return False
 
     conn = create_db_connection()
@@ -131,12 +224,7 @@ def verify_email_token(user_id, token):
 
     try:
         conn.start_transaction()
-        sql_find_token = """
-            SELECT TokenID, ExpiryTime, IsUsed
-            FROM EmailVerificationToken
-            WHERE UserID = %s AND Token = %s
-        """
-        cursor.execute(sql_find_token, (user_id, token))
+        cursor.execute(SQL_FIND_EMAIL_TOKEN, (user_id, token))
         token_data = cursor.fetchone()
 
         if token_data:
@@ -161,12 +249,12 @@ def verify_email_token(user_id, token):
     except mysql.connector.Error as err:
         if conn: # Ensure conn exists before rolling back
             conn.rollback()
-        print(f"Database Error in verify_email_token: {err}")
+        logger.error("Database Error in verify_email_token: %s", err)
         verification_success = False
     except Exception as e:
         if conn: # Ensure conn exists before rolling back
              conn.rollback()
-        print(f"Unexpected error in verify_email_token: {e}")
+        logger.error("Unexpected error in verify_email_token: %s", e)
         verification_success = False
     finally:
         if cursor:
@@ -176,7 +264,11 @@ def verify_email_token(user_id, token):
         return verification_success
 
 def request_password_reset(username_or_email):
-    """Memproses permintaan reset password."""
+    """
+    Memproses permintaan reset password.
+    Email instruksi reset dimasukkan ke EmailOutbox dalam transaksi yang sama dengan token,
+    lalu dikirim oleh worker email.
+    """
     conn = create_db_connection()
     if conn is None:
         return None, None, None
@@ -203,7 +295,11 @@ def request_password_reset(username_or_email):
                 VALUES (%s, %s, %s, %s)
             """
             cursor.execute(sql_insert_token, (user_id, reset_token, expiry_time, False))
-            conn.commit()
+
+            subject = "Instruksi Reset Password Akun CLFS Anda"
+            body = get_reset_password_email_body(user_email, reset_token, 30)
+            insert_outbox_email(cursor, user_email, subject, body)
+            conn.commit() # Token dan email di outbox tersimpan bersama (autocommit nonaktif)
             return user_id, reset_token, user_email
         else:
              # User not found
@@ -213,7 +309,7 @@ def request_password_reset(username_or_email):
     except mysql.connector.Error as err:
         if conn: # Ensure conn exists before rolling back
             conn.rollback()
-        print(f"Database Error in request_password_reset: {err}")
+        logger.error("Database Error in request_password_reset: %s", err)
         return None, None, None
     finally:
         if cursor:
@@ -223,6 +319,9 @@ def request_password_reset(username_or_email):
 
 def reset_password_with_token(token, new_plain_password):
     """Memverifikasi token reset password dan mengupdate password."""
+    # Hash dihitung sebelum transaksi dibuka agar transaksi tidak menunggu bcrypt
+    new_password_hash = get_password_service().hash(new_plain_password)
+
     conn = create_db_connection()
     if conn is None:
         return False
@@ -232,12 +331,7 @@ def reset_password_with_token(token, new_plain_password):
 
     try:
         conn.start_transaction()
-        sql_find_token = """
-            SELECT TokenID, UserID, ExpiryTime, IsUsed
-            FROM PasswordResetToken
-            WHERE Token = %s
-        """
-        cursor.execute(sql_find_token, (token,))
+        cursor.execute(SQL_FIND_RESET_TOKEN, (token,))
         token_data = cursor.fetchone()
 
         if token_data:
@@ -245,7 +339,6 @@ def reset_password_with_token(token, new_plain_password):
 
             # Check if token is not used and not expired
             if not is_used and expiry_time >= datetime.datetime.now():
-                new_password_hash = hash_password(new_plain_password)
                 cursor.execute("UPDATE Users SET PasswordHash = %s WHERE UserID = %s", (new_password_hash, user_id))
                 cursor.execute("UPDATE PasswordResetToken SET IsUsed = TRUE WHERE TokenID = %s", (token_id,))
                 conn.commit()
@@ -263,7 +356,7 @@ def reset_password_with_token(token, new_plain_password):
     except mysql.connector.Error as err:
         if conn: # Ensure conn exists before rolling back
             conn.rollback()
-        print(f"Database Error in reset_password_with_token: {err}")
+        logger.error("Database Error in reset_password_with_token: %s", err)
         reset_success = False
     finally:
         if cursor:
@@ -321,19 +414,19 @@ def delete_user_and_campus_user_by_id(user_id):
             success = True
         else:
             # User not found, consider it successful in terms of no record left
-            print(f"Warning: User with ID {user_id} not found for deletion.")
+            logger.warning("User with ID %s not found for deletion.", user_id)
             success = True # Or False if not finding is an error condition
 
     except ValueError as e:
         # Handle the case where _convert_user_id fails
-        print(f"Error converting user_id in delete_user_and_campus_user_by_id: {e}")
+        logger.error("Error converting user_id in delete_user_and_campus_user_by_id: %s", e)
         if conn: # Ensure conn exists before rolling back
             conn.rollback() # Rollback any potential implicit transaction
         success = False
     except mysql.connector.Error as err:
         if conn:
             conn.rollback() # Rollback on error
-        print(f"Database error in delete_user_and_campus_user_by_id: {err}")
+        logger.error("Database error in delete_user_and_campus_user_by_id: %s", err)
         success = False # Ensure success is False on error
     finally:
         if cursor:
@@ -3,12 +3,29 @@
 import mysql.connector
 import datetime
 # Mengimpor fungsi koneksi database dari db_connector
-from src.database.db_connector import create_db_connection, close_db_connection
-# Mengimpor fungsi untuk update item status dari item_dao
-# Kita akan tambahkan atau pastikan fungsi ini ada di item_dao.py nanti
-from src.database.item_dao import update_item_status # Asumsi fungsi ini ada/akan ada
-# Mengimpor fungsi add_notification dari notification_dao
-from src.database.notification_dao import add_notification # Impor fungsi add_notification
+from src.database.db_connector import create_db_connection, close_db_connection, transaction
+from src.database.notification_dao import insert_notifications
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Kata kerja untuk pesan notifikasi/GUI per status verifikasi
+CLAIM_STATUS_VERBS = {'Approved': 'disetujui', 'Rejected': 'ditolak'}
+
+# Skema ClaimChangeSeq dan Claims.ChangeSeq: src/database/sql/0009_claims_change_seq.sql
+
+def _next_claim_change_seq(cursor):
+    """
+    Menaikkan ClaimChangeSeq dan mengembalikan nilainya untuk kolom Claims.ChangeSeq.
+    Harus dipanggil di dalam transaksi, sebelum baris Claims diubah: kunci baris ClaimChangeSeq
+    ditahan sampai commit, sehingga transaksi yang mengubah klaim berurutan dan ChangeSeq
+    mengikuti urutan commit (dipakai get_pending_claims_changes).
+    """
+    cursor.execute("UPDATE ClaimChangeSeq SET Seq = LAST_INSERT_ID(Seq + 1) WHERE ID = 1")
+    cursor.execute("SELECT LAST_INSERT_ID() AS Seq")
+    row = cursor.fetchone()
+    # Cursor bisa berupa dictionary cursor atau cursor biasa (tuple)
+    return int(row['Seq'] if isinstance(row, dict) else row[0])
 
 def add_claim(item_id, claimed_by_user_id, claim_details, proof_image_urls):
     """
@@ -23,7 +40,7 @@ def add_claim(item_id, claimed_by_user_id, claim_details, proof_image_urls):
     Returns:
         int: ClaimID dari klaim yang baru ditambahkan jika berhasil, None jika gagal.
     """
-    print(f"Attempting to add new claim for ItemID {item_id} by UserID {claimed_by_user_id}") # Debugging print
+    logger.debug("Attempting to add new claim for ItemID %s by UserID %s", item_id, claimed_by_user_id)
     conn = create_db_connection()
     if conn is None:
         return None # Gagal koneksi
@@ -33,14 +50,15 @@ def add_claim(item_id, claimed_by_user_id, claim_details, proof_image_urls):
 
     try:
         conn.start_transaction()
+        change_seq = _next_claim_change_seq(cursor) # Agar klaim baru terambil refresh inkremental Panel Admin
 
         # 1. Masukkan data ke tabel Claims
         # ClaimDate otomatis diisi oleh database (CURDATE())
         # VerificationStatus default adalah 'Pending'
-        sql_claim = "INSERT INTO Claims (ItemID, ClaimedBy, ClaimDate, ClaimDetails) VALUES (%s, %s, CURDATE(), %s)" # Menggunakan CURDATE() untuk tanggal saja
-        cursor.execute(sql_claim, (item_id, claimed_by_user_id, claim_details))
+        sql_claim = "INSERT INTO Claims (ItemID, ClaimedBy, ClaimDate, ClaimDetails, ChangeSeq) VALUES (%s, %s, CURDATE(), %s, %s)" # Menggunakan CURDATE() untuk tanggal saja
+        cursor.execute(sql_claim, (item_id, claimed_by_user_id, claim_details, change_seq))
         claim_id = cursor.lastrowid # Ambil ClaimID yang baru dibuat
-        print(f"Claim inserted with ClaimID: {claim_id}") # Debugging print
+        logger.debug("Claim inserted with ClaimID: %s", claim_id)
 
 
         # 2. Masukkan URL gambar bukti ke tabel ClaimImages
@@ -48,31 +66,50 @@ def add_claim(item_id, claimed_by_user_id, claim_details, proof_image_urls):
             sql_image = "INSERT INTO ClaimImages (ClaimID, ImageURL) VALUES (%s, %s)"
             image_values = [(claim_id, url) for url in proof_image_urls]
             cursor.executemany(sql_image, image_values)
-            print(f"Inserted {len(proof_image_urls)} proof image URLs for ClaimID {claim_id}.") # Debugging print
+            logger.debug("Inserted %s proof image URLs for ClaimID %s.", len(proof_image_urls), claim_id)
 
 
         conn.commit()
-        print(f"New claim (ClaimID: {claim_id}) and proof images added successfully.") # Debugging print
+        logger.debug("New claim (ClaimID: %s) and proof images added successfully.", claim_id)
         return claim_id # Kembalikan ClaimID yang baru dibuat
 
     except mysql.connector.Error as err:
         conn.rollback() # Rollback jika terjadi error
-        print(f"Database Error in add_claim: {err}") # Log error
+        logger.error("Database Error in add_claim: %s", err)
         return None
     except Exception as e:
         conn.rollback()
-        print(f"An unexpected error occurred in add_claim: {e}") # Log error tak terduga
+        logger.error("An unexpected error occurred in add_claim: %s", e) # Log error tak terduga
         return None
     finally:
         cursor.close()
         close_db_connection(conn)
 
+# Klaim milik satu pengguna, terbaru dulu (indeks idx_claims_claimedby_date)
+SQL_GET_CLAIMS_BY_USER = """
+    SELECT
+        C.ClaimID,
+        C.ItemID,
+        I.ItemName, -- Ambil nama barang dari tabel Items
+        C.ClaimDate,
+        C.ClaimDetails, -- Ambil detail klaim
+        C.VerificationStatus
+    FROM
+        Claims C
+    JOIN
+        Items I ON C.ItemID = I.ItemID -- Join dengan Items untuk nama barang
+    WHERE
+        C.ClaimedBy = %s
+    ORDER BY
+        C.ClaimDate DESC -- Urutkan berdasarkan tanggal klaim terbaru
+"""
+
 def get_claims_by_user_id(user_id):
     """
     Mengambil daftar klaim yang diajukan oleh pengguna tertentu.
     Mengembalikan list of dictionaries klaim jika ditemukan, list kosong jika tidak atau error.
     """
-    print(f"Attempting to fetch claims for UserID: {user_id}") # Debugging print
+    logger.debug("Attempting to fetch claims for UserID: %s", user_id)
     conn = create_db_connection()
     if conn is None:
         return [] # Gagal koneksi
@@ -84,42 +121,53 @@ def get_claims_by_user_id(user_id):
         # Query untuk mengambil klaim berdasarkan UserID pengklaim
         # Join dengan tabel Items untuk mendapatkan nama barang yang diklaim
         # Anda mungkin ingin join juga ke ItemImages untuk gambar item, atau ClaimImages untuk gambar bukti
-        sql = """
-            SELECT
-                C.ClaimID,
-                C.ItemID,
-                I.ItemName, -- Ambil nama barang dari tabel Items
-                C.ClaimDate,
-                C.ClaimDetails, -- Ambil detail klaim
-                C.VerificationStatus
-            FROM
-                Claims C
-            JOIN
-                Items I ON C.ItemID = I.ItemID -- Join dengan Items untuk nama barang
-            WHERE
-                C.ClaimedBy = %s
-            ORDER BY
-                C.ClaimDate DESC -- Urutkan berdasarkan tanggal klaim terbaru
-        """
-        cursor.execute(sql, (user_id,))
+        cursor.execute(SQL_GET_CLAIMS_BY_USER, (user_id,))
         claims_list = cursor.fetchall() # Ambil semua baris hasil
 
-        print(f"Found {len(claims_list)} claims for UserID {user_id}.") # Debugging print
+        logger.debug("Found %s claims for UserID %s.", len(claims_list), user_id)
         return claims_list
 
     except mysql.connector.Error as err:
-        print(f"Database Error in get_claims_by_user_id: {err}") # Log error
+        logger.error("Database Error in get_claims_by_user_id: %s", err)
         return [] # Kembalikan list kosong jika terjadi error
     finally:
         cursor.close()
         close_db_connection(conn)
 
+# Semua klaim 'Pending' untuk Panel Admin (indeks idx_claims_status_date)
+SQL_GET_PENDING_CLAIMS = """
+    SELECT
+        C.ClaimID,
+        C.ItemID,
+        I.ItemName,
+        I.Description AS ItemDescription, -- Deskripsi barang
+        I.Location AS ItemLocation, -- Lokasi penemuan barang
+        C.ClaimedBy,
+        CU.FullName AS ClaimedByFullName, -- Nama lengkap pengklaim
+        U.Username AS ClaimedByUsername, -- Username pengklaim
+        C.ClaimDate,
+        C.ClaimDetails, -- Detail klaim
+        C.VerificationStatus
+    FROM
+        Claims C
+    JOIN
+        Items I ON C.ItemID = I.ItemID
+    JOIN -- Join dengan Users dan CampusUsers untuk info pengklaim
+        Users U ON C.ClaimedBy = U.UserID
+    JOIN
+        CampusUsers CU ON U.CampusUserID = CU.CampusUserID
+    WHERE
+        C.VerificationStatus = 'Pending'
+    ORDER BY
+        C.ClaimDate ASC -- Urutkan berdasarkan tanggal klaim terlama (untuk diproses duluan)
+"""
+
 def get_pending_claims():
     """
     Mengambil daftar semua klaim dengan status 'Pending'.
     Mengembalikan list of dictionaries klaim jika ditemukan, list kosong jika tidak atau error.
     """
-    print("Attempting to fetch all 'Pending' claims from DB for admin review...") # Debugging print
+    logger.debug("Attempting to fetch all 'Pending' claims from DB for admin review...")
     conn = create_db_connection()
     if conn is None:
         return [] # Gagal koneksi
@@ -130,165 +178,307 @@ def get_pending_claims():
     try:
         # Query untuk mengambil klaim dengan status 'Pending'
         # Join dengan Items dan Users/CampusUsers untuk mendapatkan detail barang dan pengklaim
-        sql = """
-            SELECT
-                C.ClaimID,
-                C.ItemID,
-                I.ItemName,
-                I.Description AS ItemDescription, -- Deskripsi barang
-                I.Location AS ItemLocation, -- Lokasi penemuan barang
-                C.ClaimedBy,
-                CU.FullName AS ClaimedByFullName, -- Nama lengkap pengklaim
-                U.Username AS ClaimedByUsername, -- Username pengklaim
-                C.ClaimDate,
-                C.ClaimDetails, -- Detail klaim
-                C.VerificationStatus
-            FROM
-                Claims C
-            JOIN
-                Items I ON C.ItemID = I.ItemID
-            JOIN -- Join dengan Users dan CampusUsers untuk info pengklaim
-                Users U ON C.ClaimedBy = U.UserID
-            JOIN
-                CampusUsers CU ON U.CampusUserID = CU.CampusUserID
-            WHERE
-                C.VerificationStatus = 'Pending'
-            ORDER BY
-                C.ClaimDate ASC -- Urutkan berdasarkan tanggal klaim terlama (untuk diproses duluan)
-        """
-        cursor.execute(sql)
+        cursor.execute(SQL_GET_PENDING_CLAIMS)
         claims_list = cursor.fetchall() # Ambil semua baris hasil
 
-        print(f"Found {len(claims_list)} 'Pending' claims.") # Debugging print
+        logger.debug("Found %s 'Pending' claims.", len(claims_list))
         return claims_list
 
     except mysql.connector.Error as err:
-        print(f"Database Error in get_pending_claims: {err}") # Log error
+        logger.error("Database Error in get_pending_claims: %s", err)
         return [] # Kembalikan list kosong jika terjadi error
     finally:
         cursor.close()
         close_db_connection(conn)
 
-def update_claim_status(claim_id, new_status):
+def build_pending_claims_changes_query(since=None):
     """
-    Memperbarui status verifikasi klaim di tabel Claims.
-    Mengirim notifikasi ke pengguna yang mengajukan klaim.
-    Jika status disetujui ('Approved'), juga perbarui status item terkait menjadi 'Claimed'
-    dan set IsActive item menjadi FALSE.
+    Membuat query untuk get_pending_claims_changes: semua klaim 'Pending' jika since None,
+    atau klaim yang berubah setelah since. Juga diperiksa dengan EXPLAIN oleh src/database/migrations.py.
 
     Args:
-        claim_id (int): ClaimID dari klaim yang akan diperbarui.
-        new_status (str): Status baru ('Approved' atau 'Rejected').
+        since (int, optional): ChangeSeq terakhir yang sudah diambil (kolom Claims.ChangeSeq).
 
     Returns:
-        bool: True jika berhasil, False jika gagal.
+        tuple: (sql, params)
     """
-    print(f"Attempting to update status for ClaimID {claim_id} to '{new_status}'") # Debugging print
+    if since is None:
+        where_clause = "C.VerificationStatus = 'Pending'"
+        params = ()
+    else:
+        where_clause = "C.ChangeSeq > %s" # Memakai indeks idx_claims_change_seq
+        params = (since,)
+
+    sql = f"""
+        SELECT
+            C.ClaimID,
+            C.ItemID,
+            I.ItemName,
+            I.Description AS ItemDescription, -- Deskripsi barang
+            I.Location AS ItemLocation, -- Lokasi penemuan barang
+            C.ClaimedBy,
+            CU.FullName AS ClaimedByFullName, -- Nama lengkap pengklaim
+            U.Username AS ClaimedByUsername, -- Username pengklaim
+            C.ClaimDate,
+            C.ClaimDetails, -- Detail klaim
+            C.VerificationStatus,
+            C.ChangeSeq
+        FROM
+            Claims C
+        JOIN
+            Items I ON C.ItemID = I.ItemID
+        JOIN -- Join dengan Users dan CampusUsers untuk info pengklaim
+            Users U ON C.ClaimedBy = U.UserID
+        JOIN
+            CampusUsers CU ON U.CampusUserID = CU.CampusUserID
+        WHERE
+            {where_clause}
+        ORDER BY
+            C.ClaimDate ASC, C.ClaimID ASC -- Klaim terlama diproses duluan
+    """
+    return sql, params
+
+
+def get_pending_claims_changes(since=None):
+    """
+    Mengambil perubahan daftar klaim pending untuk refresh inkremental di Panel Admin.
+
+    Jika since None, semua klaim 'Pending' dikembalikan (muat penuh). Jika diisi, hanya klaim
+    yang berubah setelah ChangeSeq tersebut (kolom Claims.ChangeSeq, lihat
+    src/database/sql/0009_claims_change_seq.sql), termasuk klaim yang sudah tidak 'Pending'
+    agar bisa dihapus dari tampilan. ChangeSeq mengikuti urutan commit, jadi perubahan dari
+    transaksi yang lama menunggu kunci tidak terlewat. Pemanggil harus menerapkan perubahan
+    secara idempoten (klaim yang sama bisa terambil lagi).
+
+    Args:
+        since (int, optional): Nilai 'next_since' dari pemanggilan sebelumnya.
+
+    Returns:
+        dict: {'claims': list of dictionaries (kolom sama seperti get_pending_claims + ChangeSeq),
+               'full': True jika muat penuh, 'next_since': ChangeSeq untuk pemanggilan berikutnya},
+              atau None jika terjadi error.
+    """
+    logger.debug("Attempting to fetch claim changes since %s", since)
     conn = create_db_connection()
     if conn is None:
-        return False
+        return None # Gagal koneksi
 
-    cursor = conn.cursor(dictionary=True) # Gunakan dictionary=True untuk mengambil data klaim
-    success = False
-    claimed_by_user_id = None
-    item_id = None
-    item_name = None
+    cursor = conn.cursor(dictionary=True)
 
     try:
-        conn.start_transaction() # Mulai transaksi
-
-        # 1. Ambil data klaim (terutama ClaimedBy dan ItemID) SEBELUM diupdate
-        sql_get_claim_info = """
-            SELECT
-                C.ClaimedBy,
-                C.ItemID,
-                I.ItemName -- Ambil nama barang untuk notifikasi
-            FROM
-                Claims C
-            JOIN
-                Items I ON C.ItemID = I.ItemID
-            WHERE
-                C.ClaimID = %s
-        """
-        cursor.execute(sql_get_claim_info, (claim_id,))
-        claim_info = cursor.fetchone()
-
-        if claim_info:
-            claimed_by_user_id = claim_info['ClaimedBy']
-            item_id = claim_info['ItemID']
-            item_name = claim_info['ItemName']
-            print(f"Claim info found: ClaimedBy={claimed_by_user_id}, ItemID={item_id}, ItemName='{item_name}'") # Debugging print
-        else:
-            print(f"ClaimID {claim_id} not found for status update.")
-            conn.rollback() # Rollback karena klaim tidak ditemukan
-            return False # Gagal karena klaim tidak ada
-
-
-        # 2. Perbarui status verifikasi klaim di tabel Claims
-        # Pastikan new_status adalah nilai yang valid untuk ENUM
-        if new_status not in ['Approved', 'Rejected']:
-            print(f"Invalid status '{new_status}' for claim update.")
-            conn.rollback() # Rollback karena status tidak valid
-            return False
-
-        sql_update_claim = "UPDATE Claims SET VerificationStatus = %s WHERE ClaimID = %s"
-        cursor.execute(sql_update_claim, (new_status, claim_id))
-        print(f"ClaimID {claim_id} status updated to '{new_status}'.") # Debugging print
-
-
-        # 3. Jika status disetujui, perbarui status item terkait
-        if new_status == 'Approved' and item_id is not None:
-            print(f"Claim Approved. Attempting to update ItemID {item_id} status to 'Claimed'...") # Debugging print
-            # Panggil fungsi update_item_status dari item_dao
-            # Fungsi ini juga akan set IsActive item menjadi FALSE
-            item_update_success = update_item_status(item_id, 'Claimed')
-            if item_update_success:
-                print(f"ItemID {item_id} status successfully updated to 'Claimed'.") # Debugging print
-            else:
-                print(f"Failed to update ItemID {item_id} status to 'Claimed'.") # Debugging print
-                # Anda bisa memilih untuk membatalkan seluruh transaksi di sini
-                # atau melanjutkan tapi log errornya. Kita log error dan lanjutkan.
-
-
-        # 4. Kirim notifikasi ke pengguna yang mengajukan klaim
-        if claimed_by_user_id is not None:
-            notification_message = f"Status klaim Anda untuk barang '{item_name}' telah diperbarui menjadi '{new_status}'."
-            print(f"Attempting to send notification to UserID {claimed_by_user_id}: '{notification_message}'") # Debugging print
-            # Panggil fungsi add_notification dari notification_dao
-            notification_id = add_notification(claimed_by_user_id, notification_message)
-            if notification_id:
-                print(f"Notification sent successfully with ID: {notification_id}") # Debugging print
-            else:
-                print("Failed to send notification.") # Debugging print
-                # Log error, tapi jangan batalkan transaksi utama hanya karena notifikasi gagal
-
-
-        # Commit transaksi jika semua operasi database berhasil
-        conn.commit()
-        success = True
-        print(f"ClaimID {claim_id} status update process completed successfully.") # Debugging print
-
+        # ChangeSeq terakhir yang sudah di-commit, dibaca SEBELUM query klaim: semua klaim dengan
+        # ChangeSeq <= nilai ini sudah terlihat, yang lebih besar terambil di refresh berikutnya
+        cursor.execute("SELECT Seq FROM ClaimChangeSeq WHERE ID = 1")
+        row = cursor.fetchone()
+        committed_seq = int(row['Seq']) if row else 0
+
+        sql, params = build_pending_claims_changes_query(since)
+        cursor.execute(sql, params)
+        claims_list = cursor.fetchall()
+
+        logger.debug("Found %s changed claims (full load: %s).", len(claims_list), since is None)
+        return {
+            'claims': claims_list,
+            'full': since is None,
+            'next_since': committed_seq
+        }
 
     except mysql.connector.Error as err:
-        conn.rollback() # Rollback jika terjadi error database
-        print(f"Database Error in update_claim_status: {err}") # Log error
-        success = False
-    except Exception as e:
-        conn.rollback()
-        print(f"An unexpected error occurred in update_claim_status: {e}") # Log error tak terduga
-        success = False
+        logger.error("Database Error in get_pending_claims_changes: %s", err)
+        return None
     finally:
         cursor.close()
         close_db_connection(conn)
-        return success
+
+
+def update_claim_status(claim_id, new_status):
+    """
+    Memperbarui status verifikasi satu klaim. Lihat update_claims_status_bulk() untuk detailnya:
+    status item, notifikasi pengklaim/penemu, dan penolakan otomatis klaim pesaing dilakukan
+    dalam satu transaksi.
+
+    Args:
+        claim_id (int): ClaimID dari klaim yang akan diperbarui.
+        new_status (str): Status baru ('Approved' atau 'Rejected').
+
+    Returns:
+        bool: True jika berhasil, False jika gagal (termasuk jika klaim sudah diproses).
+    """
+    result = update_claims_status_bulk([claim_id], new_status)
+    return bool(result and result['updated'])
+
+
+def _in_placeholders(values):
+    """Membuat placeholder "%s, %s, ..." untuk klausa IN."""
+    return ", ".join(["%s"] * len(values))
+
+
+def build_competing_claims_query(item_ids):
+    """
+    Membuat query (dengan kunci) untuk klaim 'Pending' pada item yang sudah diklaim, yang ditolak
+    otomatis oleh update_claims_status_bulk. Juga diperiksa dengan EXPLAIN oleh src/database/migrations.py.
+
+    Args:
+        item_ids (list): ItemID yang sudah diklaim (tidak boleh kosong).
+
+    Returns:
+        tuple: (sql, params)
+    """
+    sql = f"""
+        SELECT ClaimID, ClaimedBy, ItemID
+        FROM Claims
+        WHERE ItemID IN ({_in_placeholders(item_ids)})
+          AND VerificationStatus = 'Pending'
+        ORDER BY ClaimID
+        FOR UPDATE
+    """
+    return sql, list(item_ids)
+
+
+def update_claims_status_bulk(claim_ids, new_status):
+    """
+    Memperbarui status verifikasi banyak klaim sekaligus dalam satu transaksi dengan SQL berbasis himpunan.
+
+    - Klaim dan item terkait dikunci dengan SELECT ... FOR UPDATE; klaim yang sudah tidak
+      'Pending' dilewati, sehingga dua admin tidak bisa memproses klaim yang sama dua kali.
+    - Jika disetujui ('Approved'): item terkait menjadi 'Claimed' (IsActive = FALSE), dan klaim
+      'Pending' lain untuk item yang sama ditolak otomatis. Jika beberapa klaim terpilih untuk
+      item yang sama, hanya klaim dengan ClaimID terkecil yang disetujui. Klaim 'Pending' untuk
+      item yang sudah 'Claimed' sebelumnya juga ditolak otomatis.
+    - Notifikasi untuk pengklaim, penemu barang, dan pengklaim yang ditolak otomatis
+      dimasukkan dengan satu executemany (insert_notifications).
+
+    Args:
+        claim_ids (list): ClaimID yang akan diperbarui.
+        new_status (str): Status baru ('Approved' atau 'Rejected').
+
+    Returns:
+        dict: {'updated': [ClaimID...], 'auto_rejected': [ClaimID...], 'skipped': [ClaimID...]},
+              atau None jika terjadi error (tidak ada perubahan yang disimpan).
+    """
+    claim_ids = sorted({int(claim_id) for claim_id in claim_ids})
+    logger.debug("Attempting to update %s claims to '%s'", len(claim_ids), new_status)
+    # Pastikan new_status adalah nilai yang valid untuk ENUM
+    if new_status not in ['Approved', 'Rejected']:
+        logger.warning("Invalid status '%s' for claim update.", new_status)
+        return None
+    if not claim_ids:
+        return {'updated': [], 'auto_rejected': [], 'skipped': []}
+
+    try:
+        with transaction() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                # 0. Nomor urut perubahan untuk semua klaim yang diubah transaksi ini; diambil lebih dulu
+                #    agar semua transaksi pengubah klaim mengunci ClaimChangeSeq dalam urutan yang sama
+                change_seq = _next_claim_change_seq(cursor)
+
+                # 1. Ambil dan kunci klaim terpilih beserta itemnya (urut ClaimID agar urutan kunci konsisten)
+                sql_get_claims = f"""
+                    SELECT
+                        C.ClaimID,
+                        C.ClaimedBy,
+                        C.ItemID,
+                        C.VerificationStatus,
+                        I.ItemName, -- Ambil nama barang untuk notifikasi
+                        I.FoundBy,
+                        I.Status AS ItemStatus
+                    FROM
+                        Claims C
+                    JOIN
+                        Items I ON C.ItemID = I.ItemID
+                    WHERE
+                        C.ClaimID IN ({_in_placeholders(claim_ids)})
+                    ORDER BY
+                        C.ClaimID
+                    FOR UPDATE
+                """
+                cursor.execute(sql_get_claims, claim_ids)
+                claims = cursor.fetchall()
+
+                selected = []
+                approved_items = {} # ItemID -> klaim yang disetujui
+                already_claimed_items = set() # ItemID yang sudah 'Claimed' sebelum transaksi ini
+                item_names = {claim['ItemID']: claim['ItemName'] for claim in claims}
+                for claim in claims:
+                    if claim['VerificationStatus'] != 'Pending':
+                        continue
+                    if new_status == 'Approved':
+                        if claim['ItemStatus'] == 'Claimed':
+                            already_claimed_items.add(claim['ItemID'])
+                            continue # Barang sudah diklaim; klaim ini ditolak otomatis di langkah 4
+                        if claim['ItemID'] in approved_items:
+                            continue # Klaim lain untuk barang ini disetujui; klaim ini ditolak otomatis di langkah 4
+                        approved_items[claim['ItemID']] = claim
+                    selected.append(claim)
+                updated_ids = [claim['ClaimID'] for claim in selected]
+
+                notifications = [] # (ReceiverID, Message)
+                auto_rejected = []
+                if updated_ids:
+                    # 2. Perbarui status semua klaim terpilih sekaligus
+                    sql_update_claims = f"UPDATE Claims SET VerificationStatus = %s, ChangeSeq = %s WHERE ClaimID IN ({_in_placeholders(updated_ids)})"
+                    cursor.execute(sql_update_claims, [new_status, change_seq] + updated_ids)
+
+                    for claim in selected:
+                        notifications.append((claim['ClaimedBy'], f"Status klaim Anda untuk barang '{claim['ItemName']}' telah {CLAIM_STATUS_VERBS[new_status]} oleh admin."))
+
+                if approved_items:
+                    item_ids = list(approved_items)
+                    # 3. Item dari klaim yang disetujui menjadi 'Claimed' dan tidak aktif
+                    sql_update_items = f"UPDATE Items SET Status = 'Claimed', IsActive = FALSE WHERE ItemID IN ({_in_placeholders(item_ids)})"
+                    cursor.execute(sql_update_items, item_ids)
+
+                    for claim in approved_items.values():
+                        if claim['FoundBy'] and claim['FoundBy'] != claim['ClaimedBy']:
+                            notifications.append((claim['FoundBy'], f"Barang '{claim['ItemName']}' yang Anda temukan telah berhasil diklaim oleh pengguna lain."))
+
+                if approved_items or already_claimed_items:
+                    item_ids = sorted(set(approved_items) | already_claimed_items)
+                    # 4. Tolak otomatis klaim 'Pending' lain untuk item yang sudah diklaim (di transaksi ini atau sebelumnya)
+                    sql_get_competing, competing_params = build_competing_claims_query(item_ids)
+                    cursor.execute(sql_get_competing, competing_params)
+                    auto_rejected = cursor.fetchall()
+                    if auto_rejected:
+                        rejected_ids = [claim['ClaimID'] for claim in auto_rejected]
+                        sql_reject = f"UPDATE Claims SET VerificationStatus = 'Rejected', ChangeSeq = %s WHERE ClaimID IN ({_in_placeholders(rejected_ids)})"
+                        cursor.execute(sql_reject, [change_seq] + rejected_ids)
+
+                    for claim in auto_rejected:
+                        item_name = item_names[claim['ItemID']]
+                        notifications.append((claim['ClaimedBy'], f"Klaim Anda untuk barang '{item_name}' ditolak karena barang tersebut telah diklaim oleh pengguna lain."))
+
+                # 5. Semua notifikasi dimasukkan sekaligus (juga memperbarui NotificationState)
+                insert_notifications(cursor, notifications)
+            finally:
+                cursor.close()
+
+        auto_rejected_ids = [claim['ClaimID'] for claim in auto_rejected]
+        result = {
+            'updated': updated_ids,
+            'auto_rejected': auto_rejected_ids,
+            'skipped': [claim_id for claim_id in claim_ids if claim_id not in updated_ids and claim_id not in auto_rejected_ids]
+        }
+        logger.info("Claims set to '%s': %s updated, %s auto-rejected, %s skipped.",
+                    new_status, len(result['updated']), len(result['auto_rejected']), len(result['skipped']))
+        return result
+
+    except mysql.connector.Error as err:
+        logger.error("Database Error in update_claims_status_bulk: %s", err)
+        return None
+    except Exception as e:
+        logger.error("An unexpected error occurred in update_claims_status_bulk: %s", e) # Log error tak terduga
+        return None
 
 # --- Fungsi Baru: get_claim_images_by_claim_id ---
+SQL_GET_CLAIM_IMAGES = "SELECT ImageURL FROM ClaimImages WHERE ClaimID = %s" # Covering: idx_claimimages_claim_url
+
 def get_claim_images_by_claim_id(claim_id):
     """
     Mengambil daftar semua URL gambar bukti untuk klaim tertentu berdasarkan ClaimID.
     Mengembalikan list of strings (URL gambar), atau list kosong jika tidak ada gambar atau error.
     """
-    print(f"Attempting to fetch all proof image URLs for ClaimID: {claim_id}") # Debugging print
+    logger.debug("Attempting to fetch all proof image URLs for ClaimID: %s", claim_id)
     conn = create_db_connection()
     if conn is None:
         return [] # Gagal koneksi
@@ -298,16 +488,15 @@ def get_claim_images_by_claim_id(claim_id):
 
     try:
         # Query untuk mengambil semua ImageURL berdasarkan ClaimID dari tabel ClaimImages
-        sql = "SELECT ImageURL FROM ClaimImages WHERE ClaimID = %s"
-        cursor.execute(sql, (claim_id,))
+        cursor.execute(SQL_GET_CLAIM_IMAGES, (claim_id,))
         # fetchall() akan mengembalikan list of tuples, ambil elemen pertama dari setiap tuple
         image_urls_list = [row[0] for row in cursor.fetchall()]
 
-        print(f"Found {len(image_urls_list)} proof image URLs for ClaimID {claim_id}.") # Debugging print
+        logger.debug("Found %s proof image URLs for ClaimID %s.", len(image_urls_list), claim_id)
         return image_urls_list
 
     except mysql.connector.Error as err:
-        print(f"Database Error in get_claim_images_by_claim_id: {err}") # Log error
+        logger.error("Database Error in get_claim_images_by_claim_id: %s", err)
         return [] # Kembalikan list kosong jika terjadi error
     finally:
         cursor.close()
@@ -3,35 +3,420 @@
 import tkinter as tk # Import Tkinter
 from tkinter import messagebox # Menggunakan messagebox untuk menampilkan error koneksi GUI
 import mysql.connector
+import os
+import sys
+import threading
+import time
+import atexit
+import contextlib
+from collections import deque
 from dotenv import load_dotenv # Import load_dotenv untuk test block
 
 load_dotenv()
 
-from src.config import DB_CONFIG
+from src.config import DB_CONFIG, DB_POOL_CONFIG
+from src.database.query_stats import get_query_stats
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Dilempar jika tidak ada koneksi bebas di pool dalam batas waktu checkout."""
+    pass
+
+
+class _PoolEntry:
+    """Menyimpan satu koneksi beserta waktu pembuatan dan waktu terakhir digunakan."""
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """
+    Pool koneksi MySQL yang dibatasi (bounded) dan thread-safe.
+
+    Koneksi dipinjam dengan checkout() dan dikembalikan dengan checkin().
+    Koneksi yang terlalu lama idle ditutup (recycle), dan koneksi yang sudah
+    idle lebih dari ping_interval di-ping dulu sebelum dipinjamkan lagi.
+    """
+    def __init__(self, db_config, pool_size=5, checkout_timeout=10.0, idle_recycle_seconds=1800, ping_interval=30):
+        """
+        Args:
+            db_config (dict): Parameter untuk mysql.connector.connect().
+            pool_size (int): Jumlah maksimum koneksi terbuka (idle + dipinjam).
+            checkout_timeout (float): Detik menunggu koneksi bebas sebelum PoolTimeoutError.
+            idle_recycle_seconds (int): Koneksi idle lebih lama dari ini ditutup dan dibuat ulang.
+            ping_interval (int): Koneksi idle lebih lama dari ini di-ping sebelum dipakai.
+        """
+        self._db_config = dict(db_config)
+        # Hasil query yang belum dibaca (misal: fetchone() pada cursor unbuffered) dibuang
+        # otomatis, agar koneksi tetap bersih saat dipakai ulang oleh DAO lain.
+        self._db_config.setdefault('consume_results', True)
+        self.pool_size = max(1, int(pool_size))
+        self.checkout_timeout = checkout_timeout
+        self.idle_recycle_seconds = idle_recycle_seconds
+        self.ping_interval = ping_interval
+
+        self._cond = threading.Condition()
+        self._idle = deque() # _PoolEntry yang siap dipinjam (LIFO, yang terakhir dipakai di kanan)
+        self._checked_out = {} # id(conn) -> _PoolEntry yang sedang dipinjam
+        self._total = 0 # Jumlah koneksi terbuka (idle + dipinjam + sedang dibuat)
+        self._closed = False # True setelah close_all(): koneksi yang dikembalikan ditutup, tidak di-pool lagi
+
+    def checkout(self):
+        """
+        Meminjam satu koneksi dari pool. Membuat koneksi baru jika pool belum penuh,
+        atau menunggu hingga checkout_timeout jika semua koneksi sedang dipinjam.
+
+        Returns:
+            Koneksi MySQL yang siap dipakai.
+
+        Raises:
+            PoolTimeoutError: Jika tidak ada koneksi bebas dalam batas waktu.
+            mysql.connector.Error: Jika gagal membuat koneksi baru.
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            entry = None
+            with self._cond:
+                while True:
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._total < self.pool_size:
+                        self._total += 1 # Reservasi slot untuk koneksi baru
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"Tidak ada koneksi database yang bebas setelah {self.checkout_timeout} detik "
+                            f"(pool_size={self.pool_size})."
+                        )
+                    self._cond.wait(remaining)
+
+            # Validasi / pembuatan koneksi dilakukan di luar lock agar thread lain tidak ikut menunggu
+            if entry is not None:
+                if self._is_usable(entry):
+                    break
+                self._discard(entry.conn)
+                continue # Slot sudah dilepas oleh _discard, coba lagi
+
+            try:
+                entry = _PoolEntry(mysql.connector.connect(**self._db_config))
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                raise
+            break
+
+        entry.last_used = time.monotonic()
+        with self._cond:
+            self._checked_out[id(entry.conn)] = entry
+        return entry.conn
+
+    def checkin(self, conn):
+        """
+        Mengembalikan koneksi ke pool. Transaksi yang masih terbuka di-rollback
+        agar peminjam berikutnya tidak melihat snapshot data yang sudah basi.
+        Koneksi yang bukan berasal dari pool langsung ditutup.
+        """
+        with self._cond:
+            entry = self._checked_out.pop(id(conn), None)
+
+        if entry is None:
+            try:
+                if conn.is_connected():
+                    conn.close()
+            except mysql.connector.Error:
+                pass
+            return
+
+        try:
+            if conn.unread_result:
+                conn.consume_results()
+            if conn.in_transaction:
+                conn.rollback()
+        except mysql.connector.Error:
+            self._discard(conn)
+            return
+
+        entry.last_used = time.monotonic()
+        with self._cond:
+            if not self._closed:
+                self._idle.append(entry)
+                self._cond.notify()
+                return
+        self._discard(conn) # Pool sudah ditutup (close_all)
+
+    def close_all(self):
+        """Menutup semua koneksi idle. Koneksi yang sedang dipinjam ditutup saat dikembalikan."""
+        with self._cond:
+            self._closed = True
+            idle_entries = list(self._idle)
+            self._idle.clear()
+        for entry in idle_entries:
+            self._discard(entry.conn)
+
+    def stats(self):
+        """Mengembalikan ringkasan kondisi pool (untuk debugging)."""
+        with self._cond:
+            return {
+                'pool_size': self.pool_size,
+                'open': self._total,
+                'idle': len(self._idle),
+                'checked_out': len(self._checked_out)
+            }
+
+    def _is_usable(self, entry):
+        """Memeriksa apakah koneksi idle masih layak dipinjamkan (belum basi dan masih hidup)."""
+        idle_for = time.monotonic() - entry.last_used
+        if idle_for > self.idle_recycle_seconds:
+            return False
+        if idle_for > self.ping_interval:
+            try:
+                entry.conn.ping(reconnect=False)
+            except mysql.connector.Error:
+                return False
+        return True
+
+    def _discard(self, conn):
+        """Menutup koneksi dan melepaskan slotnya di pool."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+
+def _caller_name(depth=2):
+    """
+    Mengembalikan nama fungsi pemanggil di luar modul ini, misal "item_dao.get_items_page".
+    depth adalah jumlah frame yang dilewati dari fungsi yang memanggil _caller_name.
+    """
+    frame = sys._getframe(depth)
+    # Frame contextlib dilewati agar koneksi dari transaction() dicatat atas nama fungsi DAO
+    while frame is not None and frame.f_code.co_filename in (__file__, contextlib.__file__):
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+    return f"{module}.{frame.f_code.co_name}"
+
+
+class InstrumentedCursor:
+    """
+    Pembungkus cursor MySQL yang mencatat waktu dan jumlah baris setiap query ke QueryStats.
+
+    Waktu satu query dihitung dari execute() sampai query berikutnya dieksekusi atau cursor
+    ditutup, termasuk waktu fetch (cursor unbuffered baru membaca baris saat fetch).
+    Atribut lain (lastrowid, rowcount, description, ...) diteruskan ke cursor asli.
+    """
+    def __init__(self, cursor, caller):
+        self._cursor = cursor
+        self._caller = caller
+        self._pending = None # [sql, detik_total, baris_di-fetch] untuk query yang sedang berjalan
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            if self._pending is not None:
+                self._pending[2] += 1
+            yield row
+
+    def _finish_pending(self):
+        if self._pending is None:
+            return
+        sql, elapsed, fetched = self._pending
+        self._pending = None
+        # Untuk SELECT dipakai jumlah baris yang dibaca; untuk INSERT/UPDATE/DELETE jumlah baris yang terpengaruh
+        rows = fetched if self._cursor.description else self._cursor.rowcount
+        get_query_stats().record_query(self._caller, sql, elapsed * 1000, rows)
+
+    def _timed(self, sql, func, *args, **kwargs):
+        self._finish_pending()
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._pending = [sql, time.perf_counter() - start, 0]
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        return self._timed(operation, self._cursor.execute, operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        return self._timed(operation, self._cursor.executemany, operation, seq_params, *args, **kwargs)
+
+    def _timed_fetch(self, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        if self._pending is not None:
+            self._pending[1] += time.perf_counter() - start
+            if isinstance(result, list):
+                self._pending[2] += len(result)
+            elif result is not None:
+                self._pending[2] += 1
+        return result
+
+    def fetchone(self):
+        return self._timed_fetch(self._cursor.fetchone)
+
+    def fetchall(self):
+        return self._timed_fetch(self._cursor.fetchall)
+
+    def fetchmany(self, size=1):
+        return self._timed_fetch(self._cursor.fetchmany, size)
+
+    def close(self):
+        self._finish_pending()
+        return self._cursor.close()
+
+
+class InstrumentedConnection:
+    """
+    Pembungkus koneksi dari pool yang menghasilkan InstrumentedCursor.
+    Dikembalikan oleh create_db_connection(); close_db_connection() mengembalikan koneksi aslinya ke pool.
+    Atribut lain (commit, rollback, start_transaction, ...) diteruskan ke koneksi asli.
+    """
+    def __init__(self, conn, caller):
+        self._conn = conn
+        self._caller = caller
+        self._cursors = []
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._caller)
+        self._cursors.append(cursor)
+        return cursor
+
+    def finish(self):
+        """Mencatat query terakhir dari cursor yang belum ditutup, lalu mengembalikan koneksi asli."""
+        for cursor in self._cursors:
+            cursor._finish_pending()
+        self._cursors = []
+        return self._conn
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool():
+    """Mengembalikan pool koneksi bersama, dibuat saat pertama kali dibutuhkan."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_CONFIG, **DB_POOL_CONFIG)
+    return _pool
+
+
+def _close_pool():
+    if _pool is not None:
+        _pool.close_all()
+
+atexit.register(_close_pool)
+
+
+def _show_connection_error(message):
+    """
+    Menampilkan error koneksi di GUI menggunakan messagebox.
+    Tkinter hanya boleh dipanggil dari thread utama, jadi dari thread worker
+    (misal: TaskRunner) error hanya dicetak ke konsol.
+    """
+    if threading.current_thread() is threading.main_thread():
+        messagebox.showerror("Kesalahan Database", message)
+    else:
+        logger.error("Kesalahan Database: %s", message)
 
 
 def create_db_connection():
     """
-    Membuat dan mengembalikan objek koneksi ke database MySQL.
+    Meminjam koneksi ke database MySQL dari pool koneksi.
+    Koneksi harus dikembalikan dengan close_db_connection().
     Menampilkan pesan error GUI jika koneksi gagal.
+
+    Jika instrumentasi aktif (QUERY_STATS_CONFIG), koneksi dibungkus InstrumentedConnection
+    sehingga waktu checkout dan setiap query dicatat atas nama fungsi DAO pemanggil.
     """
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
+        stats = get_query_stats()
+        start = time.perf_counter()
+        conn = get_connection_pool().checkout()
         # print("Koneksi database berhasil!") # Opsional: untuk debugging
-        return conn
+        if not stats.enabled:
+            return conn
+        caller = _caller_name()
+        stats.record_checkout(caller, (time.perf_counter() - start) * 1000)
+        return InstrumentedConnection(conn, caller)
+    except PoolTimeoutError as err:
+        _show_connection_error(f"Database sedang sibuk:\n{err}")
+        return None
     except mysql.connector.Error as err:
-        # Menampilkan error koneksi di GUI menggunakan messagebox
-        messagebox.showerror("Kesalahan Database", f"Gagal terhubung ke database:\n{err}")
+        _show_connection_error(f"Gagal terhubung ke database:\n{err}")
         return None
 
 
 def close_db_connection(conn):
     """
-    Menutup objek koneksi database jika valid.
+    Mengembalikan objek koneksi database ke pool.
+    """
+    if conn:
+        if isinstance(conn, InstrumentedConnection):
+            conn = conn.finish()
+        get_connection_pool().checkin(conn)
+        # print("Koneksi database dikembalikan ke pool.") # Opsional: untuk debugging
+
+
+@contextlib.contextmanager
+def transaction(conn=None):
+    """
+    Unit of work: satu koneksi dan satu commit untuk beberapa operasi DAO.
+
+        with transaction() as conn:
+            update_item_status(item_id, 'Claimed', conn=conn)
+            add_notification(user_id, message, conn=conn)
+
+    Commit dilakukan saat blok selesai tanpa error; jika ada exception, transaksi
+    di-rollback dan exception diteruskan. Fungsi DAO yang menerima conn tidak melakukan
+    commit sendiri dan meneruskan error database ke pemanggil.
+
+    Args:
+        conn (optional): Koneksi dari transaction() luar. Jika diisi, blok ini ikut transaksi
+            tersebut (tanpa commit/rollback sendiri), sehingga fungsi DAO bisa dipanggil
+            baik secara mandiri maupun sebagai bagian dari transaksi yang lebih besar.
+
+    Raises:
+        mysql.connector.Error: Jika koneksi tidak bisa didapat, atau dari query di dalam blok.
     """
-    if conn and conn.is_connected():
-        conn.close()
-        # print("Koneksi database ditutup.") # Opsional: untuk debugging
+    if conn is not None:
+        yield conn
+        return
+
+    conn = create_db_connection()
+    if conn is None:
+        raise mysql.connector.errors.InterfaceError("Tidak dapat terhubung ke database.")
+    try:
+        conn.start_transaction()
+        yield conn
+        conn.commit()
+    except BaseException:
+        try:
+            conn.rollback()
+        except mysql.connector.Error as err:
+            logger.warning("Rollback failed: %s", err)
+        raise
+    finally:
+        close_db_connection(conn)
 
 
 # --- Test Block ---
@@ -49,6 +434,22 @@ if __name__ == "__main__":
     if conn:
         print("Database connection successful!")
         close_db_connection(conn)
+
+        # Koneksi kedua seharusnya memakai ulang koneksi yang sama dari pool
+        start = time.perf_counter()
+        conn = create_db_connection()
+        print(f"Second checkout took {(time.perf_counter() - start) * 1000:.2f} ms (reused from pool).")
+        close_db_connection(conn)
+        print(f"Pool stats: {get_connection_pool().stats()}")
+
+        # Query sederhana untuk melihat hasil instrumentasi
+        conn = create_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+        cursor.close()
+        close_db_connection(conn)
+        print(get_query_stats().report())
     else:
         print("Database connection failed.")
 
@@ -0,0 +1,256 @@
+# src/database/email_outbox_dao.py
+
+import mysql.connector
+# Mengimpor fungsi koneksi database dari db_connector
+from src.database.db_connector import create_db_connection, close_db_connection
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Skema tabel: src/database/sql/0003_email_outbox.sql
+
+# Status baris EmailOutbox
+OUTBOX_PENDING = 'pending'   # Menunggu dikirim (atau menunggu retry setelah NextAttemptAt)
+OUTBOX_SENDING = 'sending'   # Sedang diklaim worker sampai LockedUntil
+OUTBOX_SENT = 'sent'
+OUTBOX_DEAD = 'dead'         # Gagal permanen / melebihi batas percobaan; bisa dikirim ulang dengan requeue_dead_outbox_emails
+
+
+def insert_outbox_email(cursor, recipient, subject, body):
+    """
+    Menambahkan email ke outbox memakai cursor milik pemanggil.
+    Tidak melakukan commit: dipanggil di dalam transaksi yang sama dengan data yang memicu email
+    (misal token OTP), sehingga email hanya tercatat jika transaksinya berhasil.
+
+    Args:
+        cursor: Cursor dari koneksi yang sedang dalam transaksi.
+        recipient (str): Alamat email penerima.
+        subject (str): Subjek email.
+        body (str): Isi email (plain text).
+
+    Returns:
+        int: EmailID baris baru.
+    """
+    sql = "INSERT INTO EmailOutbox (Recipient, Subject, Body, Status) VALUES (%s, %s, %s, %s)"
+    cursor.execute(sql, (recipient, subject, body, OUTBOX_PENDING))
+    return cursor.lastrowid
+
+def claim_outbox_batch(batch_size, lease_seconds):
+    """
+    Mengklaim sejumlah email yang siap dikirim untuk satu worker.
+
+    Baris yang diambil: 'pending' yang NextAttemptAt-nya sudah lewat, atau 'sending' yang
+    LockedUntil-nya sudah lewat (worker sebelumnya mati di tengah jalan). SKIP LOCKED membuat
+    beberapa worker bisa berjalan bersamaan tanpa mengambil baris yang sama.
+
+    Args:
+        batch_size (int): Jumlah maksimum email yang diklaim.
+        lease_seconds (int): Lama klaim berlaku sebelum baris boleh diambil worker lain.
+
+    Returns:
+        list: List of dictionaries (EmailID, Recipient, Subject, Body, Attempts), kosong jika tidak ada atau error.
+            Attempts sudah termasuk percobaan yang sedang diklaim.
+    """
+    conn = create_db_connection()
+    if conn is None:
+        return []
+
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+        conn.start_transaction()
+        sql_select = """
+            SELECT EmailID, Recipient, Subject, Body, Attempts
+            FROM EmailOutbox
+            WHERE (Status = %s AND NextAttemptAt <= NOW())
+               OR (Status = %s AND LockedUntil < NOW())
+            ORDER BY EmailID
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        """
+        cursor.execute(sql_select, (OUTBOX_PENDING, OUTBOX_SENDING, int(batch_size)))
+        emails = cursor.fetchall()
+        if not emails:
+            conn.commit()
+            return []
+
+        email_ids = [email['EmailID'] for email in emails]
+        placeholders = ', '.join(['%s'] * len(email_ids))
+        sql_claim = f"""
+            UPDATE EmailOutbox
+            SET Status = %s, Attempts = Attempts + 1, LockedUntil = NOW() + INTERVAL %s SECOND
+            WHERE EmailID IN ({placeholders})
+        """
+        cursor.execute(sql_claim, (OUTBOX_SENDING, int(lease_seconds), *email_ids))
+        conn.commit()
+
+        for email in emails:
+            email['Attempts'] += 1
+        return emails
+
+    except mysql.connector.Error as err:
+        conn.rollback()
+        logger.error("Database Error in claim_outbox_batch: %s", err)
+        return []
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+def _update_outbox_emails(func_name, sql, params, email_ids):
+    """Menjalankan UPDATE untuk sekumpulan EmailID. Mengembalikan jumlah baris yang berubah, atau -1 jika error."""
+    if not email_ids:
+        return 0
+
+    conn = create_db_connection()
+    if conn is None:
+        return -1
+
+    cursor = conn.cursor()
+
+    try:
+        placeholders = ', '.join(['%s'] * len(email_ids))
+        cursor.execute(sql.format(placeholders=placeholders), (*params, *email_ids))
+        conn.commit()
+        return cursor.rowcount
+
+    except mysql.connector.Error as err:
+        conn.rollback()
+        logger.error("Database Error in %s: %s", func_name, err)
+        return -1
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+def mark_outbox_sent(email_ids):
+    """
+    Menandai email sebagai terkirim.
+
+    Args:
+        email_ids (list): EmailID yang berhasil dikirim.
+
+    Returns:
+        int: Jumlah baris yang diperbarui, -1 jika error.
+    """
+    sql = """
+        UPDATE EmailOutbox
+        SET Status = %s, SentAt = NOW(), LockedUntil = NULL, LastError = NULL
+        WHERE EmailID IN ({placeholders})
+    """
+    return _update_outbox_emails("mark_outbox_sent", sql, (OUTBOX_SENT,), email_ids)
+
+def reschedule_outbox_emails(email_ids, delay_seconds, error=None, refund_attempt=False):
+    """
+    Mengembalikan email ke status 'pending' untuk dicoba lagi setelah delay_seconds.
+
+    Args:
+        email_ids (list): EmailID yang akan dicoba lagi.
+        delay_seconds (int): Jeda sebelum email boleh diklaim lagi.
+        error (str, optional): Pesan error terakhir.
+        refund_attempt (bool): True jika email belum sempat dicoba (misal sisa batch setelah koneksi putus),
+            sehingga percobaan yang diklaim tidak dihitung.
+
+    Returns:
+        int: Jumlah baris yang diperbarui, -1 jika error.
+    """
+    attempts_sql = "GREATEST(Attempts - 1, 0)" if refund_attempt else "Attempts"
+    sql = f"""
+        UPDATE EmailOutbox
+        SET Status = %s, Attempts = {attempts_sql}, NextAttemptAt = NOW() + INTERVAL %s SECOND,
+            LockedUntil = NULL, LastError = COALESCE(%s, LastError)
+        WHERE EmailID IN ({{placeholders}})
+    """
+    error = error[:512] if error else None
+    return _update_outbox_emails("reschedule_outbox_emails", sql, (OUTBOX_PENDING, int(delay_seconds), error), email_ids)
+
+def mark_outbox_dead(email_ids, error=None):
+    """
+    Memindahkan email ke dead-letter ('dead'): tidak dicoba lagi sampai dikirim ulang manual.
+
+    Args:
+        email_ids (list): EmailID yang gagal permanen.
+        error (str, optional): Pesan error terakhir.
+
+    Returns:
+        int: Jumlah baris yang diperbarui, -1 jika error.
+    """
+    sql = """
+        UPDATE EmailOutbox
+        SET Status = %s, LockedUntil = NULL, LastError = COALESCE(%s, LastError)
+        WHERE EmailID IN ({placeholders})
+    """
+    error = error[:512] if error else None
+    return _update_outbox_emails("mark_outbox_dead", sql, (OUTBOX_DEAD, error), email_ids)
+
+def requeue_dead_outbox_emails(email_ids=None):
+    """
+    Mengirim ulang email dari dead-letter, misal setelah gangguan SMTP selesai.
+
+    Args:
+        email_ids (list, optional): EmailID tertentu. Jika None, semua email 'dead' dikirim ulang.
+
+    Returns:
+        int: Jumlah email yang dikembalikan ke antrean, -1 jika error.
+    """
+    if email_ids is not None:
+        sql = """
+            UPDATE EmailOutbox
+            SET Status = %s, Attempts = 0, NextAttemptAt = NOW()
+            WHERE Status = %s AND EmailID IN ({placeholders})
+        """
+        return _update_outbox_emails("requeue_dead_outbox_emails", sql, (OUTBOX_PENDING, OUTBOX_DEAD), email_ids)
+
+    conn = create_db_connection()
+    if conn is None:
+        return -1
+
+    cursor = conn.cursor()
+
+    try:
+        sql = "UPDATE EmailOutbox SET Status = %s, Attempts = 0, NextAttemptAt = NOW() WHERE Status = %s"
+        cursor.execute(sql, (OUTBOX_PENDING, OUTBOX_DEAD))
+        conn.commit()
+        return cursor.rowcount
+
+    except mysql.connector.Error as err:
+        conn.rollback()
+        logger.error("Database Error in requeue_dead_outbox_emails: %s", err)
+        return -1
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+def get_outbox_status_counts():
+    """
+    Menghitung jumlah email di outbox per status.
+
+    Returns:
+        dict: Status -> jumlah, misal {'pending': 3, 'sent': 120}. Kosong jika error.
+    """
+    conn = create_db_connection()
+    if conn is None:
+        return {}
+
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+        cursor.execute("SELECT Status, COUNT(*) AS Total FROM EmailOutbox GROUP BY Status")
+        return {row['Status']: row['Total'] for row in cursor.fetchall()}
+
+    except mysql.connector.Error as err:
+        logger.error("Database Error in get_outbox_status_counts: %s", err)
+        return {}
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+
+# --- Test Block ---
+if __name__ == "__main__":
+    # Ini akan dijalankan hanya jika Anda menjalankan email_outbox_dao.py langsung
+    print("Testing email outbox DAO...")
+    print(f"Status counts: {get_outbox_status_counts()}")
+
+    claimed = claim_outbox_batch(batch_size=5, lease_seconds=60)
+    print(f"Claimed {len(claimed)} emails: {[email['EmailID'] for email in claimed]}")
+    # Kembalikan email yang diklaim tanpa menghitung percobaan
+    print(f"Released: {reschedule_outbox_emails([email['EmailID'] for email in claimed], 0, refund_attempt=True)}")
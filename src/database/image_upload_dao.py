@@ -0,0 +1,90 @@
+# src/database/image_upload_dao.py
+
+import mysql.connector
+# Mengimpor fungsi koneksi database dari db_connector
+from src.database.db_connector import create_db_connection, close_db_connection
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Skema tabel: src/database/sql/0002_image_uploads.sql
+
+def get_image_upload_url(content_hash):
+    """
+    Mencari URL gambar yang sudah pernah diunggah berdasarkan hash kontennya.
+
+    Args:
+        content_hash (str): SHA-256 (hex) dari byte gambar.
+
+    Returns:
+        str: URL gambar di ImageKit.io jika sudah pernah diunggah, None jika belum atau terjadi error.
+    """
+    conn = create_db_connection()
+    if conn is None:
+        return None
+
+    cursor = conn.cursor(dictionary=True)
+
+    try:
+        sql = "SELECT ImageURL FROM ImageUploads WHERE ContentHash = %s"
+        cursor.execute(sql, (content_hash,))
+        row = cursor.fetchone()
+        return row['ImageURL'] if row else None
+
+    except mysql.connector.Error as err:
+        logger.error("Database Error in get_image_upload_url: %s", err)
+        return None
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+def add_image_upload(content_hash, image_url, file_id=None, file_size=None):
+    """
+    Menyimpan hasil unggahan ke indeks hash -> URL.
+    Jika hash sudah ada (unggahan paralel dengan konten sama), entri lama dipertahankan.
+
+    Args:
+        content_hash (str): SHA-256 (hex) dari byte gambar.
+        image_url (str): URL gambar di ImageKit.io.
+        file_id (str, optional): fileId dari ImageKit.io.
+        file_size (int, optional): Ukuran byte yang diunggah.
+
+    Returns:
+        bool: True jika berhasil disimpan (atau sudah ada), False jika gagal.
+    """
+    conn = create_db_connection()
+    if conn is None:
+        return False
+
+    cursor = conn.cursor()
+
+    try:
+        sql = """
+            INSERT IGNORE INTO ImageUploads (ContentHash, ImageURL, FileID, FileSize)
+            VALUES (%s, %s, %s, %s)
+        """
+        cursor.execute(sql, (content_hash, image_url, file_id, file_size))
+        conn.commit()
+        return True
+
+    except mysql.connector.Error as err:
+        conn.rollback()
+        logger.error("Database Error in add_image_upload: %s", err)
+        return False
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+
+# --- Test Block ---
+if __name__ == "__main__":
+    # Ini akan dijalankan hanya jika Anda menjalankan image_upload_dao.py langsung
+    import hashlib
+    print("Testing image upload index...")
+
+    test_hash = hashlib.sha256(b"dummy image bytes").hexdigest()
+    test_url = "https://ik.imagekit.io/ilsoqlnic/dummy_wallet_1.jpg" # Ganti dengan URL gambar asli
+
+    print(f"Before insert: {get_image_upload_url(test_hash)}")
+    print(f"Insert: {add_image_upload(test_hash, test_url, file_size=17)}")
+    print(f"After insert: {get_image_upload_url(test_hash)}")
@@ -4,6 +4,10 @@ import mysql.connector
 import datetime
 # Mengimpor fungsi koneksi database dari db_connector
 from src.database.db_connector import create_db_connection, close_db_connection
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
 # Anda mungkin perlu mengimpor modul untuk mengunggah gambar (misal: ImageKit.io service)
 # from src.firebase.imagekit_service import upload_image # Asumsi menggunakan ImageKit.io
 
@@ -13,7 +17,7 @@ def get_all_found_items():
     Mengembalikan list of dictionaries, di mana setiap dictionary merepresentasikan satu item.
     Mengembalikan list kosong jika tidak ada item ditemukan atau jika terjadi error.
     """
-    print("Attempting to fetch all 'Found' items from DB...") # Debugging print
+    logger.debug("Attempting to fetch all 'Found' items from DB...")
     conn = create_db_connection()
     if conn is None:
         return [] # Gagal koneksi, kembalikan list kosong
@@ -45,11 +49,11 @@ def get_all_found_items():
         cursor.execute(sql)
         items_list = cursor.fetchall() # Ambil semua baris hasil
 
-        print(f"Found {len(items_list)} 'Found' items.") # Debugging print
+        logger.debug("Found %s 'Found' items.", len(items_list))
         return items_list
 
     except mysql.connector.Error as err:
-        print(f"Database Error in get_all_found_items: {err}") # Log error
+        logger.error("Database Error in get_all_found_items: %s", err)
         return [] # Kembalikan list kosong jika terjadi error
     finally:
         cursor.close()
@@ -60,7 +64,7 @@ def get_item_by_id(item_id):
     Mengambil detail satu item berdasarkan ItemID.
     Mengembalikan dictionary data item jika ditemukan, None jika tidak.
     """
-    print(f"Attempting to fetch item with ItemID: {item_id}") # Debugging print
+    logger.debug("Attempting to fetch item with ItemID: %s", item_id)
     conn = create_db_connection()
     if conn is None:
         return None
@@ -91,21 +95,21 @@ def get_item_by_id(item_id):
         item_data = cursor.fetchone() # Ambil satu baris hasil
 
         if item_data:
-            print(f"Item found: {item_data.get('ItemName')}") # Debugging print
+            logger.debug("Item found: %s", item_data.get('ItemName'))
         else:
-            print(f"Item with ItemID {item_id} not found.") # Debugging print
+            logger.warning("Item with ItemID %s not found.", item_id)
 
         return item_data
 
     except mysql.connector.Error as err:
-        print(f"Database Error in get_item_by_id: {err}") # Log error
+        logger.error("Database Error in get_item_by_id: %s", err)
         return None
     finally:
         cursor.close()
         close_db_connection(conn)
 
 def get_item_images_by_item_id(item_id):
-    print(f"Attempting to fetch item images for ItemID: {item_id}") 
+    logger.debug("Attempting to fetch item images for ItemID: %s", item_id) 
     conn = create_db_connection()
     if conn is None:
         return []
@@ -119,20 +123,142 @@ def get_item_images_by_item_id(item_id):
         results = cursor.fetchall()
 
         image_urls = [row[0] for row in results]
-        for url in image_urls:
-            print(f"DEBUG: Fetched image URL: {url}")  # Log URL
-            
-        print(f"Found {len(image_urls)} images for ItemID {item_id}.")
+        logger.debug("Found %s images for ItemID %s: %s", len(image_urls), item_id, image_urls)
         return image_urls
 
     except mysql.connector.Error as err:
-        print(f"Database Error: {err}")
+        logger.error("Database Error: %s", err)
         return []
     finally:
         cursor.close()
         close_db_connection(conn)
 
 
+def build_item_images_query(item_ids):
+    """
+    Membuat query gambar untuk banyak item sekaligus (IN (...)).
+    Dipakai oleh _fetch_images_for_items dan pemeriksaan EXPLAIN di src/database/migrations.py.
+
+    Args:
+        item_ids (list): List ItemID (tidak boleh kosong).
+
+    Returns:
+        tuple: (sql, params)
+    """
+    placeholders = ", ".join(["%s"] * len(item_ids))
+    sql = f"SELECT ItemID, ImageURL FROM ItemImages WHERE ItemID IN ({placeholders})"
+    return sql, tuple(item_ids)
+
+def _fetch_images_for_items(cursor, item_ids):
+    """
+    Mengambil URL gambar untuk banyak item sekaligus dengan query IN (...).
+    Memakai cursor yang sudah ada agar tidak membuka koneksi baru.
+
+    Returns:
+        dict: {ItemID: [ImageURL, ...]} untuk setiap ItemID yang diminta.
+    """
+    images_by_item = {item_id: [] for item_id in item_ids}
+    if not item_ids:
+        return images_by_item
+
+    sql, params = build_item_images_query(item_ids)
+    cursor.execute(sql, params)
+    for row in cursor.fetchall():
+        # Cursor bisa berupa dictionary cursor atau cursor biasa (tuple)
+        if isinstance(row, dict):
+            item_id, url = row['ItemID'], row['ImageURL']
+        else:
+            item_id, url = row[0], row[1]
+        images_by_item.setdefault(item_id, []).append(url)
+    return images_by_item
+
+def build_found_items_page_query(page_size, after_cursor=None):
+    """
+    Membuat query satu halaman item aktif untuk get_found_items_page (keyset pada (CreatedAt, ItemID)).
+    Juga diperiksa dengan EXPLAIN oleh src/database/migrations.py.
+
+    Args:
+        page_size (int): Jumlah item per halaman.
+        after_cursor (tuple, optional): (CreatedAt, ItemID) dari item terakhir halaman sebelumnya.
+
+    Returns:
+        tuple: (sql, params)
+    """
+    sql = """
+        SELECT
+            I.ItemID,
+            I.ItemName,
+            I.Description,
+            I.Location,
+            I.CreatedAt,
+            I.FoundBy,
+            U.Username AS FoundByUsername
+        FROM
+            Items I
+        LEFT JOIN
+            Users U ON I.FoundBy = U.UserID
+        WHERE
+            I.Status = 'Lost' AND I.IsActive = TRUE
+    """
+    params = []
+    if after_cursor is not None:
+        last_created_at, last_item_id = after_cursor
+        sql += " AND (I.CreatedAt < %s OR (I.CreatedAt = %s AND I.ItemID < %s))"
+        params.extend([last_created_at, last_created_at, last_item_id])
+
+    # Ambil satu baris ekstra untuk mengetahui apakah masih ada halaman berikutnya
+    sql += " ORDER BY I.CreatedAt DESC, I.ItemID DESC LIMIT %s"
+    params.append(page_size + 1)
+    return sql, tuple(params)
+
+def get_found_items_page(page_size=20, after_cursor=None):
+    """
+    Mengambil satu halaman item aktif beserta URL gambarnya menggunakan keyset pagination
+    pada (CreatedAt, ItemID), diurutkan dari yang terbaru.
+    Berbeda dengan OFFSET, biaya setiap halaman tetap sebanding dengan page_size,
+    bukan dengan jumlah baris yang sudah dilewati.
+
+    Args:
+        page_size (int): Jumlah item per halaman.
+        after_cursor (tuple, optional): (CreatedAt, ItemID) dari item terakhir halaman sebelumnya.
+                                        None untuk halaman pertama.
+
+    Returns:
+        tuple: (items_list, next_cursor). next_cursor adalah None jika tidak ada halaman berikutnya.
+               Mengembalikan ([], None) jika terjadi error.
+    """
+    logger.debug("Attempting to fetch page of 'Found' items after cursor: %s", after_cursor)
+    conn = create_db_connection()
+    if conn is None:
+        return [], None
+
+    cursor = conn.cursor(dictionary=True)
+    try:
+        sql, params = build_found_items_page_query(page_size, after_cursor)
+        cursor.execute(sql, params)
+        items_list = cursor.fetchall()
+
+        next_cursor = None
+        if len(items_list) > page_size:
+            items_list = items_list[:page_size]
+            last_item = items_list[-1]
+            next_cursor = (last_item['CreatedAt'], last_item['ItemID'])
+
+        images_by_item = _fetch_images_for_items(cursor, [item['ItemID'] for item in items_list])
+        for item in items_list:
+            item['ImageURLs'] = images_by_item.get(item['ItemID'], [])
+
+        logger.debug("Fetched %s items, has next page: %s", len(items_list), next_cursor is not None)
+        return items_list, next_cursor
+
+    except mysql.connector.Error as err:
+        logger.error("Database Error in get_found_items_page: %s", err)
+        return [], None
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+
 def add_item(found_by_user_id, item_name, description, location, image_urls):
     """
     Menyimpan data barang yang ditemukan ke tabel Items dan ItemImages.
@@ -147,7 +273,7 @@ def add_item(found_by_user_id, item_name, description, location, image_urls):
     Returns:
         int: ItemID dari barang yang baru ditambahkan jika berhasil, None jika gagal.
     """
-    print(f"Attempting to add new item: {item_name} found by UserID {found_by_user_id}") # Debugging print
+    logger.debug("Attempting to add new item: %s found by UserID %s", item_name, found_by_user_id)
     conn = create_db_connection()
     if conn is None:
         return None # Gagal koneksi
@@ -163,7 +289,7 @@ def add_item(found_by_user_id, item_name, description, location, image_urls):
         sql_item = "INSERT INTO Items (FoundBy, ItemName, Description, Location) VALUES (%s, %s, %s, %s)"
         cursor.execute(sql_item, (found_by_user_id, item_name, description, location))
         item_id = cursor.lastrowid # Ambil ItemID yang baru dibuat
-        print(f"Item inserted with ItemID: {item_id}") # Debugging print
+        logger.debug("Item inserted with ItemID: %s", item_id)
 
 
         # 2. Masukkan URL gambar ke tabel ItemImages
@@ -171,26 +297,26 @@ def add_item(found_by_user_id, item_name, description, location, image_urls):
             sql_image = "INSERT INTO ItemImages (ItemID, ImageURL) VALUES (%s, %s)"
             image_values = [(item_id, url) for url in image_urls]
             cursor.executemany(sql_image, image_values)
-            print(f"Inserted {len(image_urls)} image URLs for ItemID {item_id}.") # Debugging print
+            logger.debug("Inserted %s image URLs for ItemID %s.", len(image_urls), item_id)
 
 
         conn.commit()
-        print(f"New item (ItemID: {item_id}) and images added successfully.") # Debugging print
+        logger.debug("New item (ItemID: %s) and images added successfully.", item_id)
         return item_id # Kembalikan ItemID yang baru dibuat
 
     except mysql.connector.Error as err:
         conn.rollback() # Rollback jika terjadi error
-        print(f"Database Error in add_item: {err}") # Log error
+        logger.error("Database Error in add_item: %s", err)
         return None
     except Exception as e:
         conn.rollback()
-        print(f"An unexpected error occurred in add_item: {e}") # Log error tak terduga
+        logger.error("An unexpected error occurred in add_item: %s", e) # Log error tak terduga
         return None
     finally:
         cursor.close()
         close_db_connection(conn)
 
-def update_item_status(item_id, new_status):
+def update_item_status(item_id, new_status, conn=None):
     """
     Memperbarui status item di tabel Items.
     Juga set IsActive = FALSE jika status diubah menjadi 'Claimed' atau 'Lost'.
@@ -199,50 +325,57 @@ def update_item_status(item_id, new_status):
     Args:
         item_id (int): ItemID dari item yang akan diperbarui.
         new_status (str): Status baru ('Found', 'Claimed', atau 'Lost').
+        conn (optional): Koneksi dari transaction(). Jika diisi, update menjadi bagian dari
+            transaksi tersebut (tidak di-commit di sini) dan error database diteruskan ke pemanggil.
 
     Returns:
         bool: True jika berhasil, False jika gagal.
     """
-    print(f"Attempting to update status for ItemID {item_id} to '{new_status}'") # Debugging print
-    conn = create_db_connection()
-    if conn is None:
+    logger.debug("Attempting to update status for ItemID %s to '%s'", item_id, new_status)
+    # Pastikan new_status adalah nilai yang valid untuk ENUM
+    valid_statuses = ['Found', 'Claimed', 'Lost']
+    if new_status not in valid_statuses:
+        logger.warning("Invalid status '%s' for item update.", new_status)
         return False
 
+    owns_conn = conn is None
+    if owns_conn:
+        conn = create_db_connection()
+        if conn is None:
+            return False
+
     cursor = conn.cursor()
     success = False
 
     try:
-        # Pastikan new_status adalah nilai yang valid untuk ENUM
-        valid_statuses = ['Found', 'Claimed', 'Lost']
-        if new_status not in valid_statuses:
-            print(f"Invalid status '{new_status}' for item update.")
-            return False
-
         # Jika status diubah menjadi 'Claimed' atau 'Lost', set IsActive menjadi FALSE
         # Jika diubah menjadi 'Found', set IsActive menjadi TRUE
         new_is_active_status = True if new_status == 'Found' else False
 
         sql = "UPDATE Items SET Status = %s, IsActive = %s WHERE ItemID = %s"
         cursor.execute(sql, (new_status, new_is_active_status, item_id))
-        conn.commit() # Commit perubahan
+        if owns_conn:
+            conn.commit() # Commit perubahan (di dalam transaction(), commit dilakukan pemanggil)
 
         # Periksa apakah ada baris yang terpengaruh (opsional tapi bagus)
         if cursor.rowcount > 0:
             success = True
-            print(f"ItemID {item_id} status updated to '{new_status}' and IsActive set to {new_is_active_status}.")
+            logger.debug("ItemID %s status updated to '%s' and IsActive set to %s.", item_id, new_status, new_is_active_status)
         else:
             # ItemID tidak ditemukan
-            print(f"ItemID {item_id} not found for status update.")
+            logger.warning("ItemID %s not found for status update.", item_id)
             success = False # Gagal karena item tidak ada
 
     except mysql.connector.Error as err:
-        # conn.rollback() # Rollback jika pakai transaksi
-        print(f"Database Error in update_item_status: {err}") # Log error
+        if not owns_conn:
+            raise # Biarkan transaction() pemanggil melakukan rollback
+        logger.error("Database Error in update_item_status: %s", err)
         success = False
     finally:
         cursor.close()
-        close_db_connection(conn)
-        return success
+        if owns_conn:
+            close_db_connection(conn)
+    return success
 
 
 # TODO: Tambahkan fungsi DAO lain untuk Items (misal: delete_item)
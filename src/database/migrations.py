@@ -0,0 +1,370 @@
+# src/database/migrations.py
+
+import argparse
+import datetime
+import hashlib
+import os
+import re
+
+import mysql.connector
+
+from src.database.db_connector import create_db_connection, close_db_connection
+from src.database.item_dao import build_found_items_page_query, build_item_images_query
+from src.database.claim_dao import (
+    SQL_GET_CLAIMS_BY_USER, SQL_GET_PENDING_CLAIMS, SQL_GET_CLAIM_IMAGES,
+    build_pending_claims_changes_query, build_competing_claims_query
+)
+from src.database.notification_dao import build_notifications_page_query, build_mark_read_query
+from src.database.auth_dao import SQL_FETCH_USER_FOR_LOGIN, SQL_FIND_EMAIL_TOKEN, SQL_FIND_RESET_TOKEN
+from src.utils.log_utils import get_logger, configure_logging
+
+logger = get_logger(__name__)
+
+# File migrasi: src/database/sql/<versi>_<nama>.sql, dijalankan berurutan menurut versi
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sql')
+_MIGRATION_FILE_RE = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+SCHEMA_MIGRATIONS_SQL = """
+    CREATE TABLE IF NOT EXISTS SchemaMigrations (
+        Version INT NOT NULL PRIMARY KEY,
+        Name VARCHAR(255) NOT NULL,
+        Checksum CHAR(64) NOT NULL, -- SHA-256 isi file saat diterapkan
+        AppliedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+class Migration:
+    """Satu file migrasi SQL."""
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    def read(self):
+        with open(self.path, encoding='utf-8') as f:
+            return f.read()
+
+    @property
+    def checksum(self):
+        return hashlib.sha256(self.read().encode('utf-8')).hexdigest()
+
+    def statements(self):
+        """
+        Memecah isi file menjadi statement-statement SQL.
+        Komentar "--" dibuang lalu dipecah pada ";", jadi file migrasi tidak boleh memakai
+        "--" atau ";" di dalam string literal.
+        """
+        sql = re.sub(r'--[^\n]*', '', self.read())
+        return [statement.strip() for statement in sql.split(';') if statement.strip()]
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """
+    Membaca semua file migrasi di directory.
+
+    Returns:
+        list: List of Migration, terurut menurut versi.
+    """
+    migrations = {}
+    for filename in os.listdir(directory):
+        match = _MIGRATION_FILE_RE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: {migrations[version].path} and {filename}")
+        migrations[version] = Migration(version, match.group(2), os.path.join(directory, filename))
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def _fetch_applied(cursor):
+    """Membuat tabel SchemaMigrations jika belum ada, lalu mengembalikan {Version: Checksum}."""
+    cursor.execute(SCHEMA_MIGRATIONS_SQL)
+    cursor.execute("SELECT Version, Checksum FROM SchemaMigrations")
+    return {version: checksum for version, checksum in cursor.fetchall()}
+
+
+def _warn_changed(migrations, applied):
+    for migration in migrations:
+        if migration.version in applied and applied[migration.version] != migration.checksum:
+            logger.warning("Migration %s_%s was changed after it was applied; add a new migration instead.",
+                           migration.version, migration.name)
+
+
+def migrate(target=None, migrations=None):
+    """
+    Menerapkan semua migrasi yang belum tercatat di SchemaMigrations, berurutan.
+
+    DDL di MySQL langsung di-commit per statement, jadi satu migrasi tidak bisa di-rollback
+    sepenuhnya. Jika sebuah statement gagal, proses berhenti dan versinya tidak dicatat;
+    perbaiki databasenya lalu jalankan ulang (atau tandai dengan mark_migrations_applied).
+
+    Args:
+        target (int, optional): Berhenti setelah versi ini. None = sampai migrasi terakhir.
+        migrations (list, optional): List of Migration. Default: load_migrations().
+
+    Returns:
+        list: Versi yang diterapkan (kosong jika sudah terbaru), None jika terjadi error.
+    """
+    migrations = load_migrations() if migrations is None else migrations
+    conn = create_db_connection()
+    if conn is None:
+        return None # Gagal koneksi
+
+    cursor = conn.cursor()
+    applied_now = []
+    try:
+        applied = _fetch_applied(cursor)
+        _warn_changed(migrations, applied)
+
+        for migration in migrations:
+            if migration.version in applied or (target is not None and migration.version > target):
+                continue
+            logger.info("Applying migration %s_%s...", migration.version, migration.name)
+            for index, statement in enumerate(migration.statements(), start=1):
+                try:
+                    cursor.execute(statement)
+                except mysql.connector.Error as err:
+                    logger.error("Migration %s_%s failed at statement %s: %s\n%s",
+                                 migration.version, migration.name, index, err, statement)
+                    raise
+            cursor.execute(
+                "INSERT INTO SchemaMigrations (Version, Name, Checksum) VALUES (%s, %s, %s)",
+                (migration.version, migration.name, migration.checksum)
+            )
+            conn.commit() # Statement DML di migrasi (misal isi awal) tersimpan bersama catatan versinya
+            applied_now.append(migration.version)
+
+        logger.info("Applied %s migrations: %s", len(applied_now), applied_now)
+        return applied_now
+
+    except mysql.connector.Error as err:
+        conn.rollback()
+        logger.error("Database Error in migrate after %s: %s", applied_now, err)
+        return None
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+
+def mark_migrations_applied(up_to, migrations=None):
+    """
+    Mencatat migrasi sampai versi up_to sebagai sudah diterapkan tanpa menjalankannya.
+    Dipakai untuk database lama yang skemanya dibuat manual (misal --mark-applied 1 jika
+    hanya tabel dasar yang ada, atau versi terakhir file src/database/sql yang sudah dijalankan).
+
+    Returns:
+        list: Versi yang baru ditandai, None jika terjadi error.
+    """
+    migrations = load_migrations() if migrations is None else migrations
+    conn = create_db_connection()
+    if conn is None:
+        return None
+
+    cursor = conn.cursor()
+    try:
+        applied = _fetch_applied(cursor)
+        marked = [migration for migration in migrations if migration.version <= up_to and migration.version not in applied]
+        if marked:
+            cursor.executemany(
+                "INSERT INTO SchemaMigrations (Version, Name, Checksum) VALUES (%s, %s, %s)",
+                [(migration.version, migration.name, migration.checksum) for migration in marked]
+            )
+        conn.commit()
+        return [migration.version for migration in marked]
+
+    except mysql.connector.Error as err:
+        conn.rollback()
+        logger.error("Database Error in mark_migrations_applied: %s", err)
+        return None
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+
+def migration_status(migrations=None):
+    """
+    Returns:
+        list: List of dictionaries {'version', 'name', 'applied', 'changed'} untuk setiap file
+              migrasi, atau None jika terjadi error.
+    """
+    migrations = load_migrations() if migrations is None else migrations
+    conn = create_db_connection()
+    if conn is None:
+        return None
+
+    cursor = conn.cursor()
+    try:
+        applied = _fetch_applied(cursor)
+        return [
+            {
+                'version': migration.version,
+                'name': migration.name,
+                'applied': migration.version in applied,
+                'changed': migration.version in applied and applied[migration.version] != migration.checksum
+            }
+            for migration in migrations
+        ]
+
+    except mysql.connector.Error as err:
+        logger.error("Database Error in migration_status: %s", err)
+        return None
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+
+# --- Pemeriksaan rencana query ---
+
+# Full scan pada tabel yang lebih kecil dari ini tidak dianggap regresi: untuk tabel sekecil itu
+# optimizer memang bisa memilih scan karena lebih murah daripada indeks.
+PLAN_CHECK_MIN_ROWS = 1000
+
+_NOW = datetime.datetime.now()
+
+def _plan_check(caller, table, index, sql, params):
+    """Satu entri QUERY_PLAN_CHECKS; sql dan params diambil langsung dari konstanta/builder DAO."""
+    return {'caller': caller, 'table': table, 'index': index, 'sql': sql, 'params': tuple(params)}
+
+
+# Query DAO yang harus memakai indeks. SQL-nya adalah konstanta/builder yang sama dengan yang
+# dijalankan DAO, jadi pemeriksaan ini tidak bisa tertinggal dari query aslinya.
+# 'table' adalah nama/alias tabel seperti yang muncul di kolom "table" hasil EXPLAIN,
+# 'index' adalah indeks yang harus termasuk possible_keys (None = hanya cek full scan).
+QUERY_PLAN_CHECKS = [
+    _plan_check('item_dao.get_found_items_page', 'I', 'idx_items_status_active_created',
+                *build_found_items_page_query(20, (_NOW, 1000))),
+    _plan_check('item_dao._fetch_images_for_items', 'ItemImages', 'idx_itemimages_item_url',
+                *build_item_images_query([1, 2, 3])),
+    _plan_check('claim_dao.get_claim_images_by_claim_id', 'ClaimImages', 'idx_claimimages_claim_url',
+                SQL_GET_CLAIM_IMAGES, (1,)),
+    _plan_check('claim_dao.get_pending_claims', 'C', 'idx_claims_status_date',
+                SQL_GET_PENDING_CLAIMS, ()),
+    _plan_check('claim_dao.get_pending_claims_changes (full)', 'C', 'idx_claims_status_date',
+                *build_pending_claims_changes_query()),
+    _plan_check('claim_dao.get_pending_claims_changes', 'C', 'idx_claims_change_seq',
+                *build_pending_claims_changes_query(1000)),
+    _plan_check('claim_dao.get_claims_by_user_id', 'C', 'idx_claims_claimedby_date',
+                SQL_GET_CLAIMS_BY_USER, (1,)),
+    _plan_check('claim_dao.update_claims_status_bulk', 'Claims', 'idx_claims_item_status',
+                *build_competing_claims_query([1, 2])),
+    _plan_check('notification_dao.get_notifications_page', 'Notification', 'idx_notification_receiver_sent',
+                *build_notifications_page_query(1, 50, (_NOW, 1000))),
+    _plan_check('notification_dao.get_notifications_page (unread)', 'Notification', 'idx_notification_receiver_read_sent',
+                *build_notifications_page_query(1, 50, include_read=False)),
+    _plan_check('notification_dao.get_notifications_page (archive)', 'NotificationArchive', 'idx_notification_archive_receiver_sent',
+                *build_notifications_page_query(1, 50, (_NOW, 1000), include_archived=True)),
+    _plan_check('notification_dao.mark_notifications_read', 'Notification', 'idx_notification_receiver_read_sent',
+                *build_mark_read_query(1, notification_ids=[1, 2, 3])),
+    _plan_check('notification_dao.mark_all_read', 'Notification', 'idx_notification_receiver_read_sent',
+                *build_mark_read_query(1, up_to_id=1000)),
+    _plan_check('auth_dao.authenticate_user', 'Users', None,
+                SQL_FETCH_USER_FOR_LOGIN, ('username',)),
+    _plan_check('auth_dao.verify_email_token', 'EmailVerificationToken', 'idx_emailtoken_user_token',
+                SQL_FIND_EMAIL_TOKEN, (1, '123456')),
+    _plan_check('auth_dao.reset_password_with_token', 'PasswordResetToken', 'idx_resettoken_token',
+                SQL_FIND_RESET_TOKEN, ('0' * 64,)),
+]
+
+
+def _text(value):
+    # Beberapa versi mysql-connector mengembalikan kolom EXPLAIN sebagai bytes
+    return value.decode('utf-8') if isinstance(value, (bytes, bytearray)) else value
+
+
+def check_query_plans(checks=None, min_rows=PLAN_CHECK_MIN_ROWS):
+    """
+    Menjalankan EXPLAIN untuk setiap query di QUERY_PLAN_CHECKS dan melaporkan regresi:
+    indeks yang diharapkan tidak bisa dipakai (hilang, atau query tidak lagi cocok dengan
+    indeksnya), atau full table scan (type = ALL) pada tabel dengan minimal min_rows baris.
+    Paling berguna dijalankan di database dengan data yang realistis (misal staging).
+
+    Args:
+        checks (list, optional): Default: QUERY_PLAN_CHECKS.
+        min_rows (int): Perkiraan jumlah baris minimum agar full scan dianggap regresi.
+
+    Returns:
+        list: Pesan masalah (kosong jika semua query lolos), None jika terjadi error.
+    """
+    checks = QUERY_PLAN_CHECKS if checks is None else checks
+    conn = create_db_connection()
+    if conn is None:
+        return None
+
+    cursor = conn.cursor(dictionary=True)
+    problems = []
+    try:
+        for check in checks:
+            cursor.execute("EXPLAIN " + check['sql'], check['params'])
+            plan = cursor.fetchall()
+            logger.debug("Plan for %s: %s", check['caller'], plan)
+
+            for row in plan:
+                table = _text(row.get('table'))
+                access_type = _text(row.get('type'))
+                estimated_rows = row.get('rows') or 0
+                possible_keys = (_text(row.get('possible_keys')) or '').split(',')
+
+                if table == check['table'] and check['index'] and check['index'] not in possible_keys:
+                    problems.append(f"{check['caller']}: index {check['index']} is not usable on {table} "
+                                    f"(possible_keys: {_text(row.get('possible_keys'))})")
+                if access_type == 'ALL' and estimated_rows >= min_rows:
+                    problems.append(f"{check['caller']}: full table scan on {table} (~{estimated_rows} rows)")
+
+        for problem in problems:
+            logger.warning("Query plan check: %s", problem)
+        return problems
+
+    except mysql.connector.Error as err:
+        logger.error("Database Error in check_query_plans: %s", err)
+        return None
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+
+# --- Entry Point ---
+#   python -m src.database.migrations                   # terapkan semua migrasi yang belum
+#   python -m src.database.migrations --status          # tampilkan migrasi yang sudah/belum diterapkan
+#   python -m src.database.migrations --mark-applied 7  # database lama: tandai 1..7 tanpa menjalankannya
+#   python -m src.database.migrations --check-plans     # EXPLAIN query DAO; exit code 1 jika ada regresi
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Menjalankan migrasi skema database dari src/database/sql.")
+    parser.add_argument('--target', type=int, help="Terapkan migrasi sampai versi ini saja.")
+    parser.add_argument('--status', action='store_true', help="Tampilkan status migrasi lalu keluar.")
+    parser.add_argument('--mark-applied', type=int, metavar='VERSION', help="Tandai migrasi sampai VERSION sebagai sudah diterapkan.")
+    parser.add_argument('--check-plans', action='store_true', help="Periksa rencana query DAO dengan EXPLAIN.")
+    parser.add_argument('--min-rows', type=int, default=PLAN_CHECK_MIN_ROWS, help="Ukuran tabel minimum agar full scan dianggap regresi.")
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.status:
+        status = migration_status()
+        if status is None:
+            raise SystemExit(1)
+        for entry in status:
+            state = "applied" if entry['applied'] else "pending"
+            if entry['changed']:
+                state += " (file changed)"
+            print(f"{entry['version']:>4} {entry['name']:<30} {state}")
+    elif args.mark_applied is not None:
+        marked = mark_migrations_applied(args.mark_applied)
+        if marked is None:
+            raise SystemExit(1)
+        print(f"Marked as applied: {marked}")
+    elif args.check_plans:
+        problems = check_query_plans(min_rows=args.min_rows)
+        if problems is None:
+            raise SystemExit(1)
+        for problem in problems:
+            print(f"FAIL {problem}")
+        print(f"Checked {len(QUERY_PLAN_CHECKS)} queries, {len(problems)} problems.")
+        if problems:
+            raise SystemExit(1)
+    else:
+        applied = migrate(target=args.target)
+        if applied is None:
+            print("Migration failed (see log).")
+            raise SystemExit(1)
+        print(f"Applied migrations: {applied}")
@@ -2,10 +2,76 @@
 
 import mysql.connector
 import datetime
+import time
 # Mengimpor fungsi koneksi database dari db_connector
-from src.database.db_connector import create_db_connection, close_db_connection
+from src.database.db_connector import create_db_connection, close_db_connection, transaction
+from src.utils.log_utils import get_logger
 
-def get_notifications_by_user(user_id, include_read=True):
+logger = get_logger(__name__)
+
+# Skema tabel NotificationState: src/database/sql/0005_notification_state.sql
+# Skema tabel NotificationArchive: src/database/sql/0007_notification_archive.sql
+
+# Jumlah baris per executemany di add_notifications_bulk (satu INSERT multi-baris per chunk)
+NOTIFICATION_INSERT_CHUNK_SIZE = 1000
+
+# Penerima untuk broadcast_notification
+AUDIENCE_ALL_USERS = 'all_users' # Semua pengguna aktif
+AUDIENCE_ADMINS = 'admins' # Semua admin aktif
+_AUDIENCE_CONDITIONS = {
+    AUDIENCE_ALL_USERS: "IsActive = TRUE",
+    AUDIENCE_ADMINS: "IsActive = TRUE AND IsAdmin = TRUE",
+}
+
+
+def _bump_notification_state(cursor, unread_deltas, chunk_size=NOTIFICATION_INSERT_CHUNK_SIZE):
+    """
+    Memperbarui NotificationState (jumlah belum dibaca dan versi) untuk beberapa pengguna.
+    Dipanggil dalam transaksi yang sama dengan perubahan tabel Notification; tidak melakukan commit.
+
+    Args:
+        cursor: Cursor dari koneksi yang sedang dalam transaksi.
+        unread_deltas (dict): UserID -> perubahan jumlah belum dibaca (misal +1 untuk notifikasi baru).
+        chunk_size (int): Jumlah pengguna per executemany.
+    """
+    if not unread_deltas:
+        return
+    # Diurutkan berdasarkan UserID agar urutan kunci baris konsisten antar transaksi
+    rows = [(user_id, delta) for user_id, delta in sorted(unread_deltas.items())]
+    sql = """
+        INSERT INTO NotificationState (UserID, UnreadCount, Version)
+        VALUES (%s, %s, 1)
+        ON DUPLICATE KEY UPDATE
+            UnreadCount = GREATEST(UnreadCount + VALUES(UnreadCount), 0),
+            Version = Version + 1
+    """
+    for start in range(0, len(rows), chunk_size):
+        cursor.executemany(sql, rows[start:start + chunk_size])
+
+
+def insert_notifications(cursor, notifications, chunk_size=NOTIFICATION_INSERT_CHUNK_SIZE):
+    """
+    Memasukkan banyak notifikasi dengan executemany per chunk (satu INSERT multi-baris per chunk),
+    lalu memperbarui NotificationState sekali per penerima.
+    Tidak melakukan commit; dipakai di dalam transaksi DAO lain (misal update_claims_status_bulk).
+
+    Args:
+        cursor: Cursor dari koneksi yang sedang dalam transaksi.
+        notifications (list): List of tuple (ReceiverID, Message).
+        chunk_size (int): Jumlah baris per INSERT.
+    """
+    if not notifications:
+        return
+    chunk_size = max(1, int(chunk_size))
+    for start in range(0, len(notifications), chunk_size):
+        cursor.executemany("INSERT INTO Notification (ReceiverID, Message) VALUES (%s, %s)", notifications[start:start + chunk_size])
+    unread_deltas = {}
+    for receiver_id, _ in notifications:
+        unread_deltas[receiver_id] = unread_deltas.get(receiver_id, 0) + 1
+    _bump_notification_state(cursor, unread_deltas, chunk_size)
+
+
+def get_notifications_by_user(user_id, include_read=True, include_archived=False):
     """
     Mengambil daftar notifikasi untuk pengguna tertentu dari database.
 
@@ -13,12 +79,14 @@ def get_notifications_by_user(user_id, include_read=True):
         user_id (int): UserID dari pengguna penerima notifikasi.
         include_read (bool): Jika True, sertakan notifikasi yang sudah dibaca.
                              Jika False, hanya ambil notifikasi yang belum dibaca.
+        include_archived (bool): Jika True (dan include_read True), sertakan juga notifikasi lama
+                                 yang sudah dipindah ke NotificationArchive (lihat archive_read_notifications).
 
     Returns:
         list: List of dictionaries, di mana setiap dictionary merepresentasikan satu notifikasi.
               Mengembalikan list kosong jika tidak ada notifikasi atau jika terjadi error.
     """
-    print(f"Attempting to fetch notifications for UserID: {user_id}, Include Read: {include_read}") # Debugging print
+    logger.debug("Attempting to fetch notifications for UserID: %s, Include Read: %s", user_id, include_read)
     conn = create_db_connection()
     if conn is None:
         return [] # Gagal koneksi, kembalikan list kosong
@@ -46,6 +114,15 @@ def get_notifications_by_user(user_id, include_read=True):
         # Tambahkan kondisi WHERE jika hanya ingin notifikasi yang belum dibaca
         if not include_read:
             sql += " AND IsRead = FALSE"
+        elif include_archived:
+            # Notifikasi di arsip semuanya sudah dibaca
+            sql += """
+                UNION ALL
+                SELECT NotificationID, ReceiverID, Message, SentAt, IsRead
+                FROM NotificationArchive
+                WHERE ReceiverID = %s
+            """
+            params = (user_id, user_id)
 
         # Urutkan berdasarkan waktu pengiriman terbaru
         sql += " ORDER BY SentAt DESC"
@@ -53,16 +130,105 @@ def get_notifications_by_user(user_id, include_read=True):
         cursor.execute(sql, params)
         notifications_list = cursor.fetchall() # Ambil semua baris hasil
 
-        print(f"Found {len(notifications_list)} notifications for UserID {user_id}.") # Debugging print
+        logger.debug("Found %s notifications for UserID %s.", len(notifications_list), user_id)
         return notifications_list
 
     except mysql.connector.Error as err:
-        print(f"Database Error in get_notifications_by_user: {err}") # Log error
+        logger.error("Database Error in get_notifications_by_user: %s", err)
         return [] # Kembalikan list kosong jika terjadi error
     finally:
         cursor.close()
         close_db_connection(conn)
 
+def build_notifications_page_query(user_id, page_size, after_cursor=None, include_read=True, include_archived=False):
+    """
+    Membuat query satu halaman notifikasi untuk get_notifications_page (keyset pada
+    (SentAt, NotificationID)). Juga diperiksa dengan EXPLAIN oleh src/database/migrations.py.
+    Argumen sama seperti get_notifications_page.
+
+    Returns:
+        tuple: (sql, params)
+    """
+    def page_query(table, unread_only):
+        # Satu sumber (tabel aktif atau arsip), sudah dibatasi page_size + 1 baris lewat indeks
+        sql = f"""
+            SELECT
+                NotificationID,
+                ReceiverID,
+                Message,
+                SentAt,
+                IsRead
+            FROM
+                {table}
+            WHERE
+                ReceiverID = %s
+        """
+        params = [user_id]
+        if unread_only:
+            sql += " AND IsRead = FALSE"
+        if after_cursor is not None:
+            last_sent_at, last_notification_id = after_cursor
+            sql += " AND (SentAt < %s OR (SentAt = %s AND NotificationID < %s))"
+            params.extend([last_sent_at, last_sent_at, last_notification_id])
+        # Ambil satu baris ekstra untuk mengetahui apakah masih ada halaman berikutnya
+        sql += " ORDER BY SentAt DESC, NotificationID DESC LIMIT %s"
+        params.append(page_size + 1)
+        return sql, params
+
+    sql, params = page_query("Notification", not include_read)
+    if include_read and include_archived:
+        archive_sql, archive_params = page_query("NotificationArchive", False)
+        sql = f"({sql}) UNION ALL ({archive_sql}) ORDER BY SentAt DESC, NotificationID DESC LIMIT %s"
+        params = params + archive_params + [page_size + 1]
+    return sql, tuple(params)
+
+def get_notifications_page(user_id, page_size=50, after_cursor=None, include_read=True, include_archived=False):
+    """
+    Mengambil satu halaman notifikasi pengguna menggunakan keyset pagination pada
+    (SentAt, NotificationID), diurutkan dari yang terbaru. Biaya setiap halaman sebanding
+    dengan page_size, bukan dengan jumlah notifikasi pengguna
+    (indeks: src/database/sql/0006_notification_indexes.sql).
+
+    Args:
+        user_id (int): UserID dari pengguna penerima notifikasi.
+        page_size (int): Jumlah notifikasi per halaman.
+        after_cursor (tuple, optional): (SentAt, NotificationID) dari notifikasi terakhir halaman
+                                        sebelumnya. None untuk halaman pertama.
+        include_read (bool): Jika False, hanya ambil notifikasi yang belum dibaca.
+        include_archived (bool): Jika True (dan include_read True), halaman juga diambil dari
+                                 NotificationArchive, sehingga riwayat lama tetap bisa di-scroll.
+
+    Returns:
+        tuple: (notifications_list, next_cursor). next_cursor adalah None jika tidak ada halaman berikutnya.
+               Mengembalikan ([], None) jika terjadi error.
+    """
+    logger.debug("Attempting to fetch notifications page for UserID %s after cursor: %s", user_id, after_cursor)
+    conn = create_db_connection()
+    if conn is None:
+        return [], None
+
+    cursor = conn.cursor(dictionary=True)
+    try:
+        sql, params = build_notifications_page_query(user_id, page_size, after_cursor, include_read, include_archived)
+        cursor.execute(sql, params)
+        notifications_list = cursor.fetchall()
+
+        next_cursor = None
+        if len(notifications_list) > page_size:
+            notifications_list = notifications_list[:page_size]
+            last_notification = notifications_list[-1]
+            next_cursor = (last_notification['SentAt'], last_notification['NotificationID'])
+
+        logger.debug("Fetched %s notifications, has next page: %s", len(notifications_list), next_cursor is not None)
+        return notifications_list, next_cursor
+
+    except mysql.connector.Error as err:
+        logger.error("Database Error in get_notifications_page: %s", err)
+        return [], None
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
 def mark_notification_as_read(notification_id):
     """
     Menandai notifikasi tertentu sebagai sudah dibaca di database.
@@ -73,7 +239,7 @@ def mark_notification_as_read(notification_id):
     Returns:
         bool: True jika berhasil, False jika gagal.
     """
-    print(f"Attempting to mark notification ID {notification_id} as read.") # Debugging print
+    logger.debug("Attempting to mark notification ID %s as read.", notification_id)
     conn = create_db_connection()
     if conn is None:
         return False # Gagal koneksi
@@ -89,42 +255,144 @@ def mark_notification_as_read(notification_id):
             WHERE NotificationID = %s AND IsRead = FALSE -- Hanya update jika statusnya masih FALSE
         """
         cursor.execute(sql, (notification_id,))
-        conn.commit()
 
         # Periksa apakah ada baris yang terpengaruh (berarti notifikasi ditemukan dan statusnya diubah)
         if cursor.rowcount > 0:
+            # Kurangi jumlah belum dibaca dan naikkan versi pemilik notifikasi (transaksi yang sama)
+            sql_state = """
+                UPDATE NotificationState S
+                JOIN Notification N ON N.ReceiverID = S.UserID
+                SET S.UnreadCount = GREATEST(S.UnreadCount - 1, 0), S.Version = S.Version + 1
+                WHERE N.NotificationID = %s
+            """
+            cursor.execute(sql_state, (notification_id,))
             success = True
-            print(f"Notification ID {notification_id} marked as read successfully.") # Debugging print
+            logger.debug("Notification ID %s marked as read successfully.", notification_id)
         else:
             # Notifikasi tidak ditemukan atau statusnya sudah TRUE
-            print(f"Notification ID {notification_id} not found or already marked as read.") # Debugging print
+            logger.debug("Notification ID %s not found or already marked as read.", notification_id)
             success = True # Dianggap berhasil jika sudah dibaca
+        conn.commit()
 
     except mysql.connector.Error as err:
         conn.rollback() # Rollback jika terjadi error
-        print(f"Database Error in mark_notification_as_read: {err}") # Log error
+        logger.error("Database Error in mark_notification_as_read: %s", err)
         success = False
     finally:
         cursor.close()
         close_db_connection(conn)
         return success
 
-def add_notification(receiver_id, message):
+def mark_notifications_read(user_id, notification_ids):
+    """
+    Menandai beberapa notifikasi milik pengguna sebagai sudah dibaca dengan satu UPDATE
+    (dipakai oleh buffer tanda-baca di NotificationsFrame).
+
+    Args:
+        user_id (int): UserID pemilik notifikasi. Notifikasi milik pengguna lain diabaikan.
+        notification_ids (list): NotificationID yang akan ditandai.
+
+    Returns:
+        int: Jumlah notifikasi yang berubah dari belum dibaca menjadi dibaca, None jika gagal.
+    """
+    notification_ids = sorted({int(notification_id) for notification_id in notification_ids})
+    if not notification_ids:
+        return 0
+    sql, params = build_mark_read_query(user_id, notification_ids=notification_ids)
+    return _mark_read("mark_notifications_read", user_id, sql, params)
+
+
+def mark_all_read(user_id, up_to_id=None):
+    """
+    Menandai semua notifikasi pengguna yang belum dibaca sebagai sudah dibaca dengan satu UPDATE.
+
+    Args:
+        user_id (int): UserID pemilik notifikasi.
+        up_to_id (int, optional): Hanya notifikasi dengan NotificationID <= up_to_id, misal ID
+            terbesar yang sudah tampil di layar, agar notifikasi yang baru masuk tetap belum dibaca.
+            None = semua.
+
+    Returns:
+        int: Jumlah notifikasi yang ditandai, None jika gagal.
+    """
+    sql, params = build_mark_read_query(user_id, up_to_id=up_to_id)
+    return _mark_read("mark_all_read", user_id, sql, params)
+
+
+def build_mark_read_query(user_id, notification_ids=None, up_to_id=None):
+    """
+    Membuat UPDATE IsRead = TRUE untuk notifikasi pengguna yang belum dibaca, dipakai oleh
+    mark_notifications_read dan mark_all_read. Juga diperiksa dengan EXPLAIN oleh src/database/migrations.py.
+
+    Args:
+        user_id (int): UserID pemilik notifikasi.
+        notification_ids (list, optional): Hanya NotificationID ini (tidak boleh kosong jika diisi).
+        up_to_id (int, optional): Hanya notifikasi dengan NotificationID <= up_to_id.
+
+    Returns:
+        tuple: (sql, params)
+    """
+    sql = """
+        UPDATE Notification
+        SET IsRead = TRUE
+        WHERE ReceiverID = %s AND IsRead = FALSE
+    """
+    params = [user_id]
+    if notification_ids is not None:
+        placeholders = ", ".join(["%s"] * len(notification_ids))
+        sql += f" AND NotificationID IN ({placeholders})"
+        params.extend(notification_ids)
+    if up_to_id is not None:
+        sql += " AND NotificationID <= %s"
+        params.append(up_to_id)
+    return sql, tuple(params)
+
+
+def _mark_read(caller, user_id, sql, params):
+    """Menjalankan UPDATE dari build_mark_read_query, lalu memperbarui NotificationState pengguna."""
+    logger.debug("%s: marking notifications of UserID %s as read.", caller, user_id)
+    conn = create_db_connection()
+    if conn is None:
+        return None # Gagal koneksi
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        marked = cursor.rowcount
+        if marked > 0:
+            _bump_notification_state(cursor, {user_id: -marked})
+        conn.commit()
+        logger.debug("%s: %s notifications marked as read for UserID %s.", caller, marked, user_id)
+        return marked
+
+    except mysql.connector.Error as err:
+        conn.rollback() # Rollback jika terjadi error
+        logger.error("Database Error in %s: %s", caller, err)
+        return None
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+def add_notification(receiver_id, message, conn=None):
     """
     Menambahkan notifikasi baru ke database.
 
     Args:
         receiver_id (int): UserID dari pengguna yang akan menerima notifikasi.
         message (str): Isi pesan notifikasi.
+        conn (optional): Koneksi dari transaction(). Jika diisi, notifikasi ikut transaksi
+            tersebut (tidak di-commit di sini) dan error database diteruskan ke pemanggil.
 
     Returns:
         int: NotificationID dari notifikasi yang baru ditambahkan jika berhasil,
              None jika gagal.
     """
-    print(f"Attempting to add notification for ReceiverID: {receiver_id} with message: '{message[:50]}...'") # Debugging print
-    conn = create_db_connection()
-    if conn is None:
-        return None # Gagal koneksi
+    logger.debug("Attempting to add notification for ReceiverID: %s with message: '%s...'", receiver_id, message[:50])
+    owns_conn = conn is None
+    if owns_conn:
+        conn = create_db_connection()
+        if conn is None:
+            return None # Gagal koneksi
 
     cursor = conn.cursor()
     notification_id = None
@@ -138,23 +406,137 @@ def add_notification(receiver_id, message):
             VALUES (%s, %s)
         """
         cursor.execute(sql, (receiver_id, message))
-        conn.commit()
         notification_id = cursor.lastrowid # Ambil ID yang baru dibuat
+        _bump_notification_state(cursor, {receiver_id: 1})
+        if owns_conn:
+            conn.commit()
 
-        print(f"Notification added successfully with NotificationID: {notification_id}") # Debugging print
+        logger.debug("Notification added successfully with NotificationID: %s", notification_id)
         return notification_id
 
     except mysql.connector.Error as err:
+        if not owns_conn:
+            raise # Biarkan transaction() pemanggil melakukan rollback
         conn.rollback() # Rollback jika terjadi error
-        print(f"Database Error in add_notification: {err}") # Log error
+        logger.error("Database Error in add_notification: %s", err)
         return None
     except Exception as e:
+        if not owns_conn:
+            raise
         conn.rollback()
-        print(f"An unexpected error occurred in add_notification: {e}") # Log error tak terduga
+        logger.error("An unexpected error occurred in add_notification: %s", e) # Log error tak terduga
         return None
     finally:
         cursor.close()
-        close_db_connection(conn)
+        if owns_conn:
+            close_db_connection(conn)
+
+def add_notifications_bulk(notifications, chunk_size=NOTIFICATION_INSERT_CHUNK_SIZE, conn=None):
+    """
+    Menambahkan banyak notifikasi (penerima dan pesan boleh berbeda-beda) dalam satu transaksi.
+    Baris dimasukkan per chunk dengan executemany (satu INSERT multi-baris per chunk), beserta
+    pembaruan NotificationState.
+
+    Args:
+        notifications (list): List of tuple (ReceiverID, Message).
+        chunk_size (int): Jumlah baris per INSERT.
+        conn (optional): Koneksi dari transaction(). Jika diisi, notifikasi ikut transaksi tersebut
+            dan error database diteruskan ke pemanggil.
+
+    Returns:
+        int: Jumlah notifikasi yang ditambahkan, None jika gagal (tidak ada yang disimpan).
+    """
+    notifications = list(notifications)
+    logger.debug("Attempting to add %s notifications in chunks of %s", len(notifications), chunk_size)
+    if not notifications:
+        return 0
+
+    try:
+        with transaction(conn) as tx_conn:
+            cursor = tx_conn.cursor()
+            try:
+                insert_notifications(cursor, notifications, chunk_size)
+            finally:
+                cursor.close()
+        logger.info("Added %s notifications.", len(notifications))
+        return len(notifications)
+
+    except mysql.connector.Error as err:
+        if conn is not None:
+            raise
+        logger.error("Database Error in add_notifications_bulk: %s", err)
+        return None
+
+
+def _notify_selected_users(cursor, recipients_sql, params, message):
+    """
+    Menambahkan notifikasi yang sama untuk semua UserID hasil recipients_sql dengan INSERT ... SELECT
+    (tanpa membawa daftar penerima ke aplikasi), lalu memperbarui NotificationState dengan cara yang sama.
+
+    Returns:
+        int: Jumlah notifikasi yang ditambahkan.
+    """
+    sql_insert = f"""
+        INSERT INTO Notification (ReceiverID, Message)
+        SELECT R.UserID, %s FROM ({recipients_sql}) R
+    """
+    cursor.execute(sql_insert, [message] + list(params))
+    inserted = cursor.rowcount
+    if inserted > 0:
+        sql_state = f"""
+            INSERT INTO NotificationState (UserID, UnreadCount, Version)
+            SELECT R.UserID, 1, 1 FROM ({recipients_sql}) R
+            ON DUPLICATE KEY UPDATE UnreadCount = UnreadCount + 1, Version = Version + 1
+        """
+        cursor.execute(sql_state, list(params))
+    return inserted
+
+
+def _notify_users_where(caller, recipients_sql, params, message, conn):
+    """Menjalankan _notify_selected_users dalam transaction(conn) dengan penanganan error standar DAO."""
+    try:
+        with transaction(conn) as tx_conn:
+            cursor = tx_conn.cursor()
+            try:
+                inserted = _notify_selected_users(cursor, recipients_sql, params, message)
+            finally:
+                cursor.close()
+        logger.info("%s: notification sent to %s users.", caller, inserted)
+        return inserted
+
+    except mysql.connector.Error as err:
+        if conn is not None:
+            raise
+        logger.error("Database Error in %s: %s", caller, err)
+        return None
+
+
+def broadcast_notification(message, audience=AUDIENCE_ALL_USERS, exclude_user_id=None, conn=None):
+    """
+    Mengirim notifikasi yang sama ke sekelompok pengguna (misal pengumuman kampus atau
+    pemberitahuan untuk semua admin) dengan satu INSERT ... SELECT.
+
+    Args:
+        message (str): Isi pesan notifikasi.
+        audience (str): AUDIENCE_ALL_USERS atau AUDIENCE_ADMINS.
+        exclude_user_id (int, optional): Pengguna yang tidak ikut menerima (misal pengirimnya sendiri).
+        conn (optional): Koneksi dari transaction(). Jika diisi, notifikasi ikut transaksi tersebut
+            dan error database diteruskan ke pemanggil.
+
+    Returns:
+        int: Jumlah notifikasi yang ditambahkan, None jika gagal.
+    """
+    condition = _AUDIENCE_CONDITIONS.get(audience)
+    if condition is None:
+        logger.warning("Unknown notification audience '%s'.", audience)
+        return None
+    recipients_sql = f"SELECT UserID FROM Users WHERE {condition}"
+    params = []
+    if exclude_user_id is not None:
+        recipients_sql += " AND UserID <> %s"
+        params.append(exclude_user_id)
+    return _notify_users_where("broadcast_notification", recipients_sql, params, message, conn)
+
 
 # --- Fungsi Baru: get_unread_notifications_count ---
 def get_unread_notifications_count(user_id):
@@ -167,38 +549,156 @@ def get_unread_notifications_count(user_id):
     Returns:
         int: Jumlah notifikasi yang belum dibaca, atau 0 jika terjadi error.
     """
-    print(f"Attempting to fetch unread notifications count for UserID: {user_id}") # Debugging print
+    state = get_notification_state(user_id)
+    return state['UnreadCount'] if state else 0
+
+
+def get_notification_state(user_id):
+    """
+    Mengambil jumlah notifikasi belum dibaca dan nomor versi notifikasi pengguna dari
+    NotificationState (satu baris lewat primary key, tanpa COUNT(*)). Versi naik setiap kali
+    notifikasi pengguna ditambahkan atau dibaca, sehingga pemanggil cukup membandingkan versi
+    untuk mengetahui apakah ada perubahan sejak pengecekan terakhir.
+
+    Args:
+        user_id (int): UserID dari pengguna penerima notifikasi.
+
+    Returns:
+        dict: {'UnreadCount': int, 'Version': int} ({0, 0} jika pengguna belum pernah
+              menerima notifikasi), atau None jika terjadi error.
+    """
     conn = create_db_connection()
     if conn is None:
-        return 0 # Gagal koneksi, kembalikan 0
+        return None # Gagal koneksi
 
-    cursor = conn.cursor() # Tidak perlu dictionary=True karena hanya mengambil satu nilai
-    count = 0
+    cursor = conn.cursor(dictionary=True)
 
     try:
-        # Query untuk menghitung baris dengan ReceiverID dan IsRead = FALSE
-        sql = """
-            SELECT
-                COUNT(*)
-            FROM
-                Notification
-            WHERE
-                ReceiverID = %s AND IsRead = FALSE
-        """
+        sql = "SELECT UnreadCount, Version FROM NotificationState WHERE UserID = %s"
         cursor.execute(sql, (user_id,))
-        result = cursor.fetchone() # Ambil satu baris hasil (tuple)
+        row = cursor.fetchone()
+        if row is None:
+            return {'UnreadCount': 0, 'Version': 0}
+        return {'UnreadCount': max(0, int(row['UnreadCount'])), 'Version': int(row['Version'])}
 
-        if result and result[0] is not None:
-            count = int(result[0]) # Ambil nilai count dari tuple
-        else:
-             count = 0 # Jika hasil query kosong atau nilai pertama None
+    except mysql.connector.Error as err:
+        logger.error("Database Error in get_notification_state: %s", err)
+        return None
+    finally:
+        cursor.close()
+        close_db_connection(conn)
+
+
+def archive_read_notifications(older_than_days=90, batch_size=1000, max_batches=None, pause_seconds=0.1):
+    """
+    Memindahkan notifikasi yang sudah dibaca dan lebih tua dari older_than_days ke NotificationArchive.
+
+    Dikerjakan per batch, masing-masing dalam transaksi pendek sendiri (INSERT ... SELECT ke arsip
+    lalu DELETE dari Notification), dengan jeda pause_seconds di antaranya. Kandidat dipilih
+    dengan SELECT biasa (tanpa kunci) secara keyset pada NotificationID, sehingga hanya baris yang
+    dipindahkan yang dikunci, dan hanya selama batch-nya. Notifikasi yang sudah dibaca tidak
+    memengaruhi UnreadCount, jadi NotificationState tidak berubah.
+
+    Args:
+        older_than_days (int): Umur minimum (hari, dihitung dari SentAt) notifikasi yang diarsipkan.
+        batch_size (int): Jumlah notifikasi per batch/transaksi.
+        max_batches (int, optional): Berhenti setelah sekian batch. None = sampai habis.
+        pause_seconds (float): Jeda antar batch agar beban database tetap rendah.
+
+    Returns:
+        int: Jumlah notifikasi yang diarsipkan, None jika terjadi error (batch yang sudah selesai tetap tersimpan).
+    """
+    batch_size = max(1, int(batch_size))
+    archived = 0
+    batches = 0
+    last_id = 0
+    cutoff = None
+
+    while max_batches is None or batches < max_batches:
+        conn = create_db_connection()
+        if conn is None:
+            return None # Gagal koneksi
+
+        cursor = conn.cursor()
+        try:
+            if cutoff is None:
+                # Batas waktu dihitung sekali dari jam server, agar konsisten di semua batch
+                cursor.execute("SELECT NOW() - INTERVAL %s DAY", (int(older_than_days),))
+                cutoff = cursor.fetchone()[0]
+                logger.info("Archiving read notifications sent before %s (batch size %s).", cutoff, batch_size)
+
+            sql_candidates = """
+                SELECT NotificationID
+                FROM Notification
+                WHERE NotificationID > %s AND IsRead = TRUE AND SentAt < %s
+                ORDER BY NotificationID
+                LIMIT %s
+            """
+            cursor.execute(sql_candidates, (last_id, cutoff, batch_size))
+            notification_ids = [row[0] for row in cursor.fetchall()]
+            if not notification_ids:
+                conn.commit()
+                break
+
+            # SELECT di atas sudah membuka transaksi implisit (autocommit mati); tutup dulu agar
+            # start_transaction() tidak gagal dan transaksi tulis batch ini tetap pendek
+            conn.commit()
+
+            placeholders = ", ".join(["%s"] * len(notification_ids))
+            conn.start_transaction()
+            sql_copy = f"""
+                INSERT INTO NotificationArchive (NotificationID, ReceiverID, Message, SentAt, IsRead)
+                SELECT NotificationID, ReceiverID, Message, SentAt, IsRead
+                FROM Notification
+                WHERE NotificationID IN ({placeholders})
+            """
+            cursor.execute(sql_copy, notification_ids)
+            cursor.execute(f"DELETE FROM Notification WHERE NotificationID IN ({placeholders})", notification_ids)
+            conn.commit()
+
+            archived += len(notification_ids)
+            batches += 1
+            last_id = notification_ids[-1]
+            logger.debug("Archived batch %s: %s notifications (up to ID %s).", batches, len(notification_ids), last_id)
+
+        except mysql.connector.Error as err:
+            conn.rollback()
+            logger.error("Database Error in archive_read_notifications after %s notifications: %s", archived, err)
+            return None
+        finally:
+            cursor.close()
+            close_db_connection(conn)
+
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    logger.info("Archived %s notifications in %s batches.", archived, batches)
+    return archived
+
+
+def get_notification_table_counts():
+    """
+    Mengembalikan jumlah baris di Notification (dibaca/belum) dan NotificationArchive, untuk
+    memantau hasil pengarsipan.
 
-        print(f"Found {count} unread notifications for UserID {user_id}.") # Debugging print
-        return count
+    Returns:
+        dict: {'active_unread': int, 'active_read': int, 'archived': int}, atau None jika terjadi error.
+    """
+    conn = create_db_connection()
+    if conn is None:
+        return None
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT COALESCE(SUM(IsRead = FALSE), 0), COALESCE(SUM(IsRead = TRUE), 0) FROM Notification")
+        active_unread, active_read = cursor.fetchone()
+        cursor.execute("SELECT COUNT(*) FROM NotificationArchive")
+        archived = cursor.fetchone()[0]
+        return {'active_unread': int(active_unread), 'active_read': int(active_read), 'archived': int(archived)}
 
     except mysql.connector.Error as err:
-        print(f"Database Error in get_unread_notifications_count: {err}") # Log error
-        return 0 # Kembalikan 0 jika terjadi error
+        logger.error("Database Error in get_notification_table_counts: %s", err)
+        return None
     finally:
         cursor.close()
         close_db_connection(conn)
@@ -282,6 +782,11 @@ if __name__ == "__main__":
     else:
         print("Failed to add new notification.")
 
+    # --- Test add_notifications_bulk ---
+    print("\n--- Testing add_notifications_bulk ---")
+    bulk_count = add_notifications_bulk([(test_receiver_id, f"Notifikasi uji massal #{i}") for i in range(5)])
+    print(f"Bulk notifications added: {bulk_count}")
+
     # --- Test get_unread_notifications_count ---
     print("\n--- Testing get_unread_notifications_count ---")
     test_user_id_count = 1 # Ganti dengan UserID yang ada di database Anda
@@ -0,0 +1,202 @@
+# src/database/query_stats.py
+
+import math
+import re
+import threading
+import time
+from collections import deque
+
+from src.config import QUERY_STATS_CONFIG
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_sql(sql):
+    """
+    Meringkas teks SQL agar query yang sama dengan format berbeda dihitung sebagai satu:
+    spasi/baris baru dirapatkan dan daftar placeholder "IN (%s, %s, ...)" disamakan.
+    """
+    if isinstance(sql, bytes):
+        sql = sql.decode('utf-8', errors='replace')
+    sql = re.sub(r'\s+', ' ', sql or '').strip()
+    return re.sub(r'\(\s*%s(\s*,\s*%s)+\s*\)', '(%s, ...)', sql)
+
+
+def percentile(sorted_values, fraction):
+    """Mengembalikan persentil (fraction 0..1) dari list yang sudah diurutkan (nearest-rank)."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class _RollingSeries:
+    """Menyimpan window_size nilai terakhir beserta total kumulatif, untuk histogram bergulir."""
+    def __init__(self, window_size):
+        self.values = deque(maxlen=window_size)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        self.values.append(value)
+        self.count += 1
+        self.total += value
+
+    def summary(self):
+        ordered = sorted(self.values)
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 2),
+            'p50_ms': percentile(ordered, 0.50),
+            'p95_ms': percentile(ordered, 0.95),
+            'p99_ms': percentile(ordered, 0.99),
+            'max_ms': ordered[-1] if ordered else None
+        }
+
+
+class QueryStats:
+    """
+    Mengumpulkan statistik query database dari InstrumentedCursor/create_db_connection.
+
+    Untuk setiap fungsi DAO pemanggil dicatat: waktu eksekusi query (termasuk fetch),
+    jumlah baris, dan waktu checkout koneksi dari pool. Persentil (p50/p95/p99) dihitung
+    dari window_size sampel terakhir. Query yang lebih lambat dari slow_query_ms dicetak
+    dan disimpan di slow log.
+    """
+    def __init__(self, enabled=True, slow_query_ms=200, window_size=1000, slow_log_size=100):
+        """
+        Args:
+            enabled (bool): Jika False, tidak ada yang dicatat.
+            slow_query_ms (float): Query yang lebih lama dari ini masuk slow log.
+            window_size (int): Jumlah sampel terakhir per fungsi untuk perhitungan persentil.
+            slow_log_size (int): Jumlah entri slow log terakhir yang disimpan.
+        """
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.window_size = max(1, int(window_size))
+        self._lock = threading.Lock()
+        self._queries = {} # caller -> _RollingSeries waktu query
+        self._rows = {} # caller -> total baris
+        self._checkouts = {} # caller -> _RollingSeries waktu checkout koneksi
+        self._statements = {} # (caller, sql_normalized) -> _RollingSeries
+        self._slow_log = deque(maxlen=max(1, int(slow_log_size)))
+
+    def record_query(self, caller, sql, duration_ms, rows):
+        """Mencatat satu query yang sudah selesai (eksekusi + fetch)."""
+        if not self.enabled:
+            return
+        statement = normalize_sql(sql)
+        with self._lock:
+            self._queries.setdefault(caller, _RollingSeries(self.window_size)).add(duration_ms)
+            self._statements.setdefault((caller, statement), _RollingSeries(self.window_size)).add(duration_ms)
+            if rows is not None and rows > 0:
+                self._rows[caller] = self._rows.get(caller, 0) + rows
+            if duration_ms >= self.slow_query_ms:
+                self._slow_log.append({
+                    'time': time.time(), 'caller': caller, 'sql': statement,
+                    'duration_ms': round(duration_ms, 2), 'rows': rows
+                })
+                is_slow = True
+            else:
+                is_slow = False
+        if is_slow:
+            logger.warning("QueryStats: Slow query (%.1f ms, %s rows) in %s: %s", duration_ms, rows, caller, statement[:200])
+
+    def record_checkout(self, caller, duration_ms):
+        """Mencatat waktu meminjam koneksi dari pool."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._checkouts.setdefault(caller, _RollingSeries(self.window_size)).add(duration_ms)
+
+    def summary(self):
+        """
+        Ringkasan per fungsi DAO pemanggil, diurutkan dari total waktu query terbesar.
+
+        Returns:
+            list: List of dictionaries (caller, count, total_ms, p50_ms, p95_ms, p99_ms, max_ms, rows,
+                checkout_p50_ms, checkout_p95_ms).
+        """
+        with self._lock:
+            rows = []
+            for caller in set(self._queries) | set(self._checkouts):
+                entry = {'caller': caller}
+                series = self._queries.get(caller)
+                entry.update(series.summary() if series else _RollingSeries(1).summary())
+                entry['rows'] = self._rows.get(caller, 0)
+                checkout = self._checkouts.get(caller)
+                checkout_summary = checkout.summary() if checkout else {}
+                entry['checkout_p50_ms'] = checkout_summary.get('p50_ms')
+                entry['checkout_p95_ms'] = checkout_summary.get('p95_ms')
+                rows.append(entry)
+        rows.sort(key=lambda entry: entry['total_ms'], reverse=True)
+        return rows
+
+    def statement_summary(self, caller=None):
+        """Ringkasan per (fungsi, teks SQL), opsional hanya untuk satu fungsi pemanggil."""
+        with self._lock:
+            rows = [
+                dict(series.summary(), caller=key[0], sql=key[1])
+                for key, series in self._statements.items()
+                if caller is None or key[0] == caller
+            ]
+        rows.sort(key=lambda entry: entry['total_ms'], reverse=True)
+        return rows
+
+    def slow_queries(self):
+        """Mengembalikan salinan slow log (entri terbaru di akhir)."""
+        with self._lock:
+            return list(self._slow_log)
+
+    def reset(self):
+        with self._lock:
+            self._queries.clear()
+            self._rows.clear()
+            self._checkouts.clear()
+            self._statements.clear()
+            self._slow_log.clear()
+
+    def report(self, limit=20):
+        """Mengembalikan laporan teks ringkas (untuk dicetak di konsol)."""
+        def fmt(value):
+            return "-" if value is None else f"{value:.1f}"
+
+        lines = [f"{'caller':<45} {'count':>6} {'total':>9} {'p50':>7} {'p95':>7} {'p99':>7} {'rows':>7} {'chk95':>7}"]
+        for entry in self.summary()[:limit]:
+            lines.append(
+                f"{entry['caller'][:45]:<45} {entry['count']:>6} {entry['total_ms']:>9.1f} {fmt(entry['p50_ms']):>7} "
+                f"{fmt(entry['p95_ms']):>7} {fmt(entry['p99_ms']):>7} {entry['rows']:>7} {fmt(entry['checkout_p95_ms']):>7}"
+            )
+        return "\n".join(lines)
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_query_stats():
+    """Mengembalikan QueryStats bersama, dibuat saat pertama kali dibutuhkan."""
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = QueryStats(**QUERY_STATS_CONFIG)
+    return _stats
+
+
+# --- Test Block ---
+if __name__ == "__main__":
+    # Ini akan dijalankan hanya jika Anda menjalankan query_stats.py langsung
+    import random
+
+    print("Testing QueryStats...")
+    stats = QueryStats(slow_query_ms=90, window_size=500)
+    for i in range(200):
+        stats.record_checkout("item_dao.get_items_page", random.uniform(0.1, 2))
+        stats.record_query("item_dao.get_items_page", "SELECT * FROM Items WHERE ItemID IN (%s, %s, %s)", random.uniform(5, 95), 20)
+    stats.record_query("claim_dao.update_claim_status", "UPDATE Claims SET StatusID = %s WHERE ClaimID = %s", 12.5, 1)
+
+    print(stats.report())
+    print(f"Slow queries: {len(stats.slow_queries())}")
+    print(f"Statements: {[entry['sql'] for entry in stats.statement_summary()]}")
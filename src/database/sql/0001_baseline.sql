@@ -0,0 +1,99 @@
+-- src/database/sql/0001_baseline.sql
+-- Skema dasar aplikasi: tabel yang dipakai oleh DAO di src/database/ sebelum ada fitur tambahan
+-- (outbox email, deduplikasi gambar, NotificationState, arsip notifikasi; lihat migrasi berikutnya).
+-- Dijalankan lewat: python -m src.database.migrations
+-- Database lama yang tabelnya sudah dibuat manual cukup ditandai: --mark-applied 1
+
+CREATE TABLE IF NOT EXISTS Roles (
+    RoleID INT NOT NULL PRIMARY KEY,
+    RoleName VARCHAR(50) NOT NULL UNIQUE
+);
+
+-- Nilai RoleID yang dipakai di form registrasi (src/gui/register_frame.py)
+INSERT IGNORE INTO Roles (RoleID, RoleName) VALUES (1, 'Mahasiswa'), (2, 'Admin'), (3, 'Staf');
+
+CREATE TABLE IF NOT EXISTS CampusUsers (
+    CampusUserID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    RoleID INT NOT NULL,
+    FullName VARCHAR(100) NOT NULL,
+    NIM_NIP VARCHAR(30) NOT NULL UNIQUE,
+    Email VARCHAR(255) NOT NULL UNIQUE, -- Dicari saat reset password
+    CONSTRAINT fk_campususers_role FOREIGN KEY (RoleID) REFERENCES Roles (RoleID)
+);
+
+CREATE TABLE IF NOT EXISTS Users (
+    UserID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    CampusUserID INT NOT NULL UNIQUE,
+    Username VARCHAR(50) NOT NULL UNIQUE, -- Dicari saat login
+    PasswordHash VARCHAR(255) NOT NULL,
+    IsActive BOOLEAN NOT NULL DEFAULT FALSE, -- TRUE setelah email diverifikasi
+    IsAdmin BOOLEAN NOT NULL DEFAULT FALSE,
+    CreatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_users_campususer FOREIGN KEY (CampusUserID) REFERENCES CampusUsers (CampusUserID)
+);
+
+CREATE TABLE IF NOT EXISTS EmailVerificationToken (
+    TokenID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    UserID INT NOT NULL,
+    Token VARCHAR(64) NOT NULL, -- Kode OTP
+    ExpiryTime DATETIME NOT NULL,
+    IsUsed BOOLEAN NOT NULL DEFAULT FALSE,
+    CreatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_emailtoken_user FOREIGN KEY (UserID) REFERENCES Users (UserID) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS PasswordResetToken (
+    TokenID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    UserID INT NOT NULL,
+    Token VARCHAR(64) NOT NULL, -- 32 byte acak dalam hex
+    ExpiryTime DATETIME NOT NULL,
+    IsUsed BOOLEAN NOT NULL DEFAULT FALSE,
+    CreatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_resettoken_user FOREIGN KEY (UserID) REFERENCES Users (UserID) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Items (
+    ItemID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    FoundBy INT NULL, -- Pelapor; NULL jika akunnya dihapus
+    ItemName VARCHAR(255) NOT NULL,
+    Description TEXT NULL,
+    Location VARCHAR(255) NULL,
+    Status ENUM('Found', 'Claimed', 'Lost') NOT NULL DEFAULT 'Lost', -- Laporan baru (add_item) tampil di daftar 'Lost'
+    IsActive BOOLEAN NOT NULL DEFAULT TRUE,
+    CreatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_items_foundby FOREIGN KEY (FoundBy) REFERENCES Users (UserID) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS ItemImages (
+    ImageID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    ItemID INT NOT NULL,
+    ImageURL VARCHAR(512) NOT NULL,
+    CONSTRAINT fk_itemimages_item FOREIGN KEY (ItemID) REFERENCES Items (ItemID) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Claims (
+    ClaimID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    ItemID INT NOT NULL,
+    ClaimedBy INT NOT NULL,
+    ClaimDate DATE NOT NULL,
+    ClaimDetails TEXT NULL,
+    VerificationStatus ENUM('Pending', 'Approved', 'Rejected') NOT NULL DEFAULT 'Pending',
+    CONSTRAINT fk_claims_item FOREIGN KEY (ItemID) REFERENCES Items (ItemID) ON DELETE CASCADE,
+    CONSTRAINT fk_claims_user FOREIGN KEY (ClaimedBy) REFERENCES Users (UserID) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS ClaimImages (
+    ClaimImageID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    ClaimID INT NOT NULL,
+    ImageURL VARCHAR(512) NOT NULL,
+    CONSTRAINT fk_claimimages_claim FOREIGN KEY (ClaimID) REFERENCES Claims (ClaimID) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Notification (
+    NotificationID INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    ReceiverID INT NOT NULL,
+    Message TEXT NOT NULL,
+    SentAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    IsRead BOOLEAN NOT NULL DEFAULT FALSE,
+    CONSTRAINT fk_notification_receiver FOREIGN KEY (ReceiverID) REFERENCES Users (UserID) ON DELETE CASCADE
+);
@@ -0,0 +1,11 @@
+-- src/database/sql/0002_image_uploads.sql
+-- Indeks hash konten -> URL ImageKit.io untuk deduplikasi unggahan gambar
+-- (dipakai oleh src/database/image_upload_dao.py).
+
+CREATE TABLE IF NOT EXISTS ImageUploads (
+    ContentHash CHAR(64) NOT NULL PRIMARY KEY, -- SHA-256 (hex) dari byte yang diunggah
+    ImageURL VARCHAR(512) NOT NULL,
+    FileID VARCHAR(128) NULL, -- fileId dari ImageKit.io
+    FileSize INT NULL, -- Ukuran byte yang diunggah
+    CreatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,20 @@
+-- src/database/sql/0003_email_outbox.sql
+-- Antrean email yang tahan crash (dipakai oleh src/database/email_outbox_dao.py).
+-- Baris ditulis dalam transaksi yang sama dengan token OTP/reset password,
+-- lalu dikirim oleh worker: python -m src.utils.email_worker
+
+CREATE TABLE IF NOT EXISTS EmailOutbox (
+    EmailID BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    Recipient VARCHAR(255) NOT NULL,
+    Subject VARCHAR(255) NOT NULL,
+    Body TEXT NOT NULL,
+    Status ENUM('pending', 'sending', 'sent', 'dead') NOT NULL DEFAULT 'pending',
+    Attempts INT NOT NULL DEFAULT 0, -- Jumlah percobaan kirim
+    NextAttemptAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, -- Baris 'pending' baru diambil setelah waktu ini
+    LockedUntil DATETIME NULL, -- Batas waktu klaim worker untuk baris 'sending'; lewat dari ini dianggap worker mati
+    LastError VARCHAR(512) NULL,
+    CreatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    SentAt DATETIME NULL,
+    INDEX idx_emailoutbox_status_next (Status, NextAttemptAt),
+    INDEX idx_emailoutbox_status_locked (Status, LockedUntil)
+);
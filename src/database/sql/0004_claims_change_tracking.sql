@@ -0,0 +1,8 @@
+-- src/database/sql/0004_claims_change_tracking.sql
+-- Kolom UpdatedAt pada Claims untuk refresh inkremental daftar klaim pending di Panel Admin
+-- (dipakai oleh get_pending_claims_changes di src/database/claim_dao.py).
+-- Diperbarui otomatis oleh MySQL setiap kali baris klaim berubah (INSERT maupun UPDATE).
+
+ALTER TABLE Claims
+    ADD COLUMN UpdatedAt TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_claims_updated_at (UpdatedAt);
@@ -0,0 +1,19 @@
+-- src/database/sql/0005_notification_state.sql
+-- Penghitung notifikasi belum dibaca dan nomor versi per pengguna
+-- (dipelihara oleh src/database/notification_dao.py setiap kali notifikasi ditambahkan atau dibaca).
+-- Badge Notifikasi di halaman utama cukup membaca satu baris ini lewat primary key,
+-- tanpa COUNT(*) pada tabel Notification.
+
+CREATE TABLE IF NOT EXISTS NotificationState (
+    UserID INT NOT NULL PRIMARY KEY,
+    UnreadCount INT NOT NULL DEFAULT 0, -- Jumlah notifikasi dengan IsRead = FALSE
+    Version BIGINT NOT NULL DEFAULT 0, -- Naik setiap kali notifikasi pengguna ini berubah
+    UpdatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Isi awal dari data notifikasi yang sudah ada (aman dijalankan ulang)
+INSERT INTO NotificationState (UserID, UnreadCount, Version)
+SELECT ReceiverID, SUM(IsRead = FALSE), 1
+FROM Notification
+GROUP BY ReceiverID
+ON DUPLICATE KEY UPDATE UnreadCount = VALUES(UnreadCount), Version = Version + 1;
@@ -0,0 +1,6 @@
+-- src/database/sql/0006_notification_indexes.sql
+-- Indeks untuk riwayat notifikasi per pengguna dengan keyset pagination pada (SentAt, NotificationID)
+-- (dipakai oleh get_notifications_page di src/database/notification_dao.py).
+-- Setiap halaman dibaca langsung dari indeks, terurut, tanpa filesort atas seluruh notifikasi pengguna.
+
+CREATE INDEX idx_notification_receiver_sent ON Notification (ReceiverID, SentAt, NotificationID);
@@ -0,0 +1,15 @@
+-- src/database/sql/0007_notification_archive.sql
+-- Arsip notifikasi lama yang sudah dibaca
+-- (diisi oleh archive_read_notifications di src/database/notification_dao.py, dijalankan lewat
+--  python -m src.utils.notification_maintenance). Tabel Notification hanya berisi notifikasi aktif,
+-- sehingga query badge dan riwayat tidak ikut membesar seiring waktu.
+
+CREATE TABLE IF NOT EXISTS NotificationArchive (
+    NotificationID INT NOT NULL PRIMARY KEY, -- Sama dengan NotificationID aslinya
+    ReceiverID INT NOT NULL,
+    Message TEXT NOT NULL,
+    SentAt TIMESTAMP NOT NULL,
+    IsRead BOOLEAN NOT NULL DEFAULT TRUE,
+    ArchivedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_notification_archive_receiver_sent (ReceiverID, SentAt, NotificationID)
+);
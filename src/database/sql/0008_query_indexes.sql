@@ -0,0 +1,32 @@
+-- src/database/sql/0008_query_indexes.sql
+-- Indeks komposit untuk query DAO yang sering dijalankan. Urutan kolom mengikuti query-nya:
+-- kolom filter kesamaan dulu, lalu kolom ORDER BY, sehingga baris dibaca langsung dari indeks
+-- dalam urutan yang benar (tanpa full table scan atau filesort).
+-- Diperiksa dengan: python -m src.database.migrations --check-plans
+
+-- item_dao.get_found_items_page: Status = 'Lost' AND IsActive = TRUE ORDER BY CreatedAt DESC, ItemID DESC
+CREATE INDEX idx_items_status_active_created ON Items (Status, IsActive, CreatedAt, ItemID);
+
+-- item_dao._fetch_images_for_items: SELECT ItemID, ImageURL ... WHERE ItemID IN (...) (covering, tanpa baca baris tabel)
+CREATE INDEX idx_itemimages_item_url ON ItemImages (ItemID, ImageURL);
+
+-- claim_dao.get_claim_images_by_claim_id: SELECT ImageURL ... WHERE ClaimID = %s (covering)
+CREATE INDEX idx_claimimages_claim_url ON ClaimImages (ClaimID, ImageURL);
+
+ALTER TABLE Claims
+    -- claim_dao.get_pending_claims(_changes): VerificationStatus = 'Pending' ORDER BY ClaimDate, ClaimID
+    ADD INDEX idx_claims_status_date (VerificationStatus, ClaimDate, ClaimID),
+    -- claim_dao.get_claims_by_user_id: ClaimedBy = %s ORDER BY ClaimDate DESC
+    ADD INDEX idx_claims_claimedby_date (ClaimedBy, ClaimDate, ClaimID),
+    -- claim_dao.update_claims_status_bulk: klaim 'Pending' lain untuk item yang disetujui
+    ADD INDEX idx_claims_item_status (ItemID, VerificationStatus);
+
+-- notification_dao: notifikasi belum dibaca per pengguna (get_notifications_by_user/page dengan
+-- include_read=False, mark_notifications_read, mark_all_read), terurut SentAt
+CREATE INDEX idx_notification_receiver_read_sent ON Notification (ReceiverID, IsRead, SentAt, NotificationID);
+
+-- auth_dao.verify_email_token: UserID = %s AND Token = %s
+CREATE INDEX idx_emailtoken_user_token ON EmailVerificationToken (UserID, Token);
+
+-- auth_dao.reset_password_with_token: Token = %s (token acak, jadi sekaligus dijaga unik)
+CREATE UNIQUE INDEX idx_resettoken_token ON PasswordResetToken (Token);
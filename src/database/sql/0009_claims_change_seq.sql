@@ -0,0 +1,18 @@
+-- src/database/sql/0009_claims_change_seq.sql
+-- Nomor urut perubahan klaim untuk refresh inkremental Panel Admin (get_pending_claims_changes
+-- di src/database/claim_dao.py), menggantikan Claims.UpdatedAt (0004) sebagai penanda perubahan.
+-- UpdatedAt diisi saat statement dijalankan, bukan saat commit, sehingga transaksi yang lama
+-- menunggu kunci bisa commit dengan UpdatedAt yang sudah terlewat oleh refresh admin lain.
+-- ClaimChangeSeq dinaikkan di awal setiap transaksi yang mengubah Claims dan kunci barisnya
+-- ditahan sampai commit, jadi urutan ChangeSeq mengikuti urutan commit.
+
+CREATE TABLE IF NOT EXISTS ClaimChangeSeq (
+    ID TINYINT NOT NULL PRIMARY KEY, -- Selalu satu baris (ID = 1)
+    Seq BIGINT NOT NULL DEFAULT 0 -- ChangeSeq terbesar yang sudah di-commit
+);
+
+INSERT IGNORE INTO ClaimChangeSeq (ID, Seq) VALUES (1, 0);
+
+ALTER TABLE Claims
+    ADD COLUMN ChangeSeq BIGINT NOT NULL DEFAULT 0, -- Nilai ClaimChangeSeq dari transaksi yang terakhir mengubah klaim ini
+    ADD INDEX idx_claims_change_seq (ChangeSeq);
@@ -2,6 +2,9 @@
 
 import mysql.connector
 from src.database.db_connector import create_db_connection, close_db_connection
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 def get_all_users():
     """
@@ -32,7 +35,7 @@ def get_all_users():
         cursor.execute(sql)
         users = cursor.fetchall()
     except mysql.connector.Error as err:
-        print(f"Database error in get_all_users: {err}")
+        logger.error("Database error in get_all_users: %s", err)
     finally:
         cursor.close()
         close_db_connection(conn)
@@ -57,7 +60,7 @@ def update_admin_status(user_id, is_admin):
         success = True
     except mysql.connector.Error as err:
         conn.rollback()
-        print(f"Database error in update_admin_status: {err}")
+        logger.error("Database error in update_admin_status: %s", err)
     finally:
         cursor.close()
         close_db_connection(conn)
@@ -100,14 +103,14 @@ def delete_user(user_id):
         else:
              # User not found, consider it a success in terms of not failing the operation
              # but perhaps log a warning or return False depending on desired behavior
-             print(f"Warning: User with ID {user_id} not found for deletion.")
+             logger.warning("User with ID %s not found for deletion.", user_id)
              success = True # Or False if not finding is an error condition
 
     except mysql.connector.Error as err:
         # Rollback the transaction on any error
         if conn: # Ensure conn exists before rolling back
             conn.rollback()
-        print(f"Database error in delete_user: {err}")
+        logger.error("Database error in delete_user: %s", err)
         success = False # Ensure success is False on error
     finally:
         # Always close cursor and connection
@@ -164,7 +167,7 @@ def update_user_profile(user_id, full_name=None, nim_nip=None, email=None):
                 success = True
     except mysql.connector.Error as err:
         conn.rollback()
-        print(f"Database error in update_user_profile: {err}")
+        logger.error("Database error in update_user_profile: %s", err)
     finally:
         cursor.close()
         close_db_connection(conn)
@@ -199,7 +202,7 @@ def get_user_profile(user_id):
         cursor.execute(sql, (user_id,))
         user = cursor.fetchone()
     except mysql.connector.Error as err:
-        print(f"Database error in get_user_profile: {err}")
+        logger.error("Database error in get_user_profile: %s", err)
     finally:
         cursor.close()
         close_db_connection(conn)
@@ -235,7 +238,7 @@ def get_user_by_id(user_id):
         cursor.execute(sql, (user_id,))
         user = cursor.fetchone()
     except mysql.connector.Error as err:
-        print(f"Database error in get_user_by_id: {err}")
+        logger.error("Database error in get_user_by_id: %s", err)
     finally:
         cursor.close()
         close_db_connection(conn)
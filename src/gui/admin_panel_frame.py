@@ -5,17 +5,16 @@ from tkinter import ttk # Menggunakan ttk untuk widget seperti Treeview
 from tkinter import messagebox
 from .base_frame import BaseFrame # Mengimpor BaseFrame
 # Mengimpor fungsi DAO untuk mengambil klaim pending, update status klaim, dan mengambil gambar klaim
-from src.database.claim_dao import get_pending_claims, update_claim_status, get_claim_images_by_claim_id # Impor fungsi baru
-# Mengimpor fungsi DAO untuk update status item (diperlukan saat klaim disetujui) DAN mengambil detail item
-from src.database.item_dao import update_item_status, get_item_by_id # Import fungsi update_item_status dan get_item_by_id
-# Mengimpor fungsi DAO untuk menambahkan notifikasi
-from src.database.notification_dao import add_notification # Import fungsi add_notification
+from src.database.claim_dao import get_pending_claims_changes, update_claims_status_bulk, get_claim_images_by_claim_id, CLAIM_STATUS_VERBS # Impor fungsi baru
 import datetime # Untuk memformat tanggal
 # Mengimpor modul untuk menampilkan gambar dari URL
-from PIL import ImageTk, Image # Perlu instal Pillow: pip install Pillow
+from PIL import ImageTk # Perlu instal Pillow: pip install Pillow
 import requests # Perlu instal requests: pip install requests
-from io import BytesIO
-import threading # Untuk mengunduh gambar di thread terpisah
+# Pemuat gambar bersama (thread pool terbatas) untuk mengunduh gambar di luar thread GUI
+from src.image_storage.image_loader import get_image_loader, PRIORITY_VISIBLE
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 class AdminPanelFrame(BaseFrame):
     """
@@ -32,7 +31,8 @@ class AdminPanelFrame(BaseFrame):
             main_app: Referensi ke instance kelas MainApp.
         """
         super().__init__(parent, main_app)
-        self.pending_claims = [] # Untuk menyimpan data klaim pending
+        self.pending_claims = {} # ClaimID -> data klaim pending (urutan sama dengan Treeview)
+        self._claims_since = None # ChangeSeq refresh terakhir (dari get_pending_claims_changes), None = muat penuh
         self.current_claim_details = None # Untuk menyimpan detail klaim yang sedang ditampilkan
         self.claim_image_refs = [] # List untuk menyimpan referensi gambar klaim yang ditampilkan
 
@@ -48,7 +48,8 @@ class AdminPanelFrame(BaseFrame):
         tree_frame.pack(pady=10, padx=10, fill='both', expand=True)
 
         # Menggunakan Treeview untuk tampilan tabel yang rapi
-        self.claims_tree = ttk.Treeview(tree_frame, columns=("ClaimID", "Item", "Pengklaim", "Tanggal Klaim", "Detail Klaim", "ItemID"), show="headings")
+        # selectmode="extended": Ctrl/Shift+klik untuk memilih banyak klaim sekaligus
+        self.claims_tree = ttk.Treeview(tree_frame, columns=("ClaimID", "Item", "Pengklaim", "Tanggal Klaim", "Detail Klaim", "ItemID"), show="headings", selectmode="extended")
         self.claims_tree.pack(side="left", fill="both", expand=True)
 
         # Konfigurasi kolom Treeview
@@ -124,55 +125,109 @@ class AdminPanelFrame(BaseFrame):
 
     def load_pending_claims(self):
         """
-        Mengambil data klaim pending dari DAO.
+        Mengambil perubahan klaim pending dari DAO di latar belakang.
+        Pemanggilan pertama memuat semua klaim pending; berikutnya hanya klaim yang berubah
+        sejak refresh terakhir, lalu Treeview diperbarui per baris (apply_claim_changes).
         """
-        print("AdminPanelFrame: Attempting to load pending claims.") # Debugging print
+        logger.debug("AdminPanelFrame: Attempting to load pending claims (since %s).", self._claims_since)
         # Pastikan pengguna yang login adalah admin sebelum memuat data
         is_admin = self.main_app.user_data.get('IsAdmin', False) if self.main_app.user_data else False
 
         if not is_admin:
-            print("User is not admin, cannot load pending claims.") # Debugging print
-            self.pending_claims = [] # Kosongkan list jika bukan admin
+            logger.warning("User is not admin, cannot load pending claims.")
+            self.reset_claims() # Kosongkan data jika bukan admin
             messagebox.showwarning("Akses Ditolak", "Anda tidak memiliki izin untuk mengakses halaman ini.")
             self.main_app.show_main_app_frame(self.main_app.user_data) # Kembali ke halaman utama
             return
 
-        self.pending_claims = get_pending_claims()
-        print(f"AdminPanelFrame: Loaded {len(self.pending_claims)} pending claims.") # Debugging print
-        # DEBUG: Print loaded claims data
-        # print("Loaded claims data structure:")
-        # for i, claim in enumerate(self.pending_claims):
-        #    print(f"  Claim {i}: {claim}")
+        self.run_in_background(
+            get_pending_claims_changes, self._claims_since,
+            on_success=self._on_pending_claims_loaded,
+            key="load_pending_claims",
+            loading_text="Memuat klaim..."
+        )
+
+
+    def _on_pending_claims_loaded(self, changes):
+        """Callback load_pending_claims (thread utama): menerapkan perubahan klaim ke Treeview."""
+        if changes is None:
+            return # Error database sudah dicatat di log oleh DAO; tampilan lama dipertahankan
+
+        removed_ids = []
+        if changes['full']:
+            # Muat penuh: klaim yang ada di tampilan tapi tidak ada di hasil sudah tidak pending
+            loaded_ids = {claim['ClaimID'] for claim in changes['claims']}
+            removed_ids = [claim_id for claim_id in self.pending_claims if claim_id not in loaded_ids]
+        self.apply_claim_changes(changes['claims'], removed_ids)
+        self._claims_since = changes['next_since']
+        logger.debug("AdminPanelFrame: Applied %s claim changes, %s pending claims.", len(changes['claims']), len(self.pending_claims))
+
+
+    def _claim_row_values(self, claim):
+        """Nilai baris Treeview untuk satu klaim: (ClaimID, Item, Pengklaim, Tanggal Klaim, Detail Klaim, ItemID)."""
+        item_name = claim.get('ItemName', 'Nama Barang Tidak Tersedia')
+        claimed_by_name = claim.get('ClaimedByFullName', claim.get('ClaimedByUsername', 'Pengguna Tidak Diketahui')) # Prioritaskan nama lengkap
+        claim_date = claim.get('ClaimDate')
+        # Format tanggal jika itu objek datetime.date atau datetime.datetime
+        claim_date_str = claim_date.strftime('%Y-%m-%d') if isinstance(claim_date, (datetime.date, datetime.datetime)) else str(claim_date)
+        claim_details = claim.get('ClaimDetails', 'Tidak ada detail klaim.')
+        # Sertakan ClaimID dan ItemID sebagai nilai tersembunyi.
+        return (claim.get('ClaimID'), item_name, claimed_by_name, claim_date_str, claim_details, claim.get('ItemID'))
+
+
+    def apply_claim_changes(self, changed_claims, removed_ids=()):
+        """
+        Memperbarui Treeview hanya untuk baris yang berubah: klaim baru disisipkan, klaim yang
+        sudah tidak 'Pending' dihapus, dan klaim yang datanya berubah diperbarui di tempat.
+        Baris lain tidak disentuh sehingga pilihan dan posisi scroll tetap. Idempoten: perubahan
+        yang sama boleh diterapkan lebih dari sekali.
+
+        Args:
+            changed_claims (list): Klaim dari get_pending_claims_changes.
+            removed_ids (iterable, optional): ClaimID yang harus dihapus dari tampilan.
+        """
+        removed_ids = set(removed_ids)
+        for claim in changed_claims:
+            if claim.get('VerificationStatus') != 'Pending':
+                removed_ids.add(claim['ClaimID'])
+                continue
+
+            claim_id = claim['ClaimID']
+            row_id = str(claim_id) # iid baris Treeview = ClaimID
+            values = self._claim_row_values(claim)
+            self.pending_claims[claim_id] = claim
+            if not self.claims_tree.exists(row_id):
+                self.claims_tree.insert("", tk.END, iid=row_id, values=values)
+            elif [str(value) for value in self.claims_tree.item(row_id, 'values')] != [str(value) for value in values]:
+                self.claims_tree.item(row_id, values=values)
+
+        if removed_ids:
+            self.remove_claims_from_view(removed_ids)
 
 
     def display_claims(self):
         """
-        Menampilkan data klaim pending di Treeview.
+        Menampilkan ulang semua data klaim pending di Treeview (tanpa diff).
         """
-        # Hapus data lama dari Treeview
-        for item in self.claims_tree.get_children():
-            self.claims_tree.delete(item)
+        # Hapus data lama dari Treeview (satu panggilan untuk semua baris)
+        rows = self.claims_tree.get_children()
+        if rows:
+            self.claims_tree.delete(*rows)
 
         if not self.pending_claims:
-            print("AdminPanelFrame: No pending claims to display.") # Debugging print
-            # Anda bisa tambahkan label "Tidak ada klaim pending" di sini jika perlu
-            pass
+            logger.debug("AdminPanelFrame: No pending claims to display.")
         else:
             # Masukkan data klaim ke Treeview
-            for claim in self.pending_claims:
-                claim_id = claim.get('ClaimID')
-                item_id = claim.get('ItemID') # Ambil ItemID
-                item_name = claim.get('ItemName', 'Nama Barang Tidak Tersedia')
-                claimed_by_name = claim.get('ClaimedByFullName', claim.get('ClaimedByUsername', 'Pengguna Tidak Diketahui')) # Prioritaskan nama lengkap
-                claim_date = claim.get('ClaimDate')
-                # Format tanggal jika itu objek datetime.date atau datetime.datetime
-                claim_date_str = claim_date.strftime('%Y-%m-%d') if isinstance(claim_date, (datetime.date, datetime.datetime)) else str(claim_date)
-                claim_details = claim.get('ClaimDetails', 'Tidak ada detail klaim.')
-                verification_status = claim.get('VerificationStatus', 'Status Tidak Diketahui') # Seharusnya selalu 'Pending' di sini
-
-                # Masukkan data ke Treeview. Sertakan ClaimID dan ItemID sebagai nilai tersembunyi.
-                self.claims_tree.insert("", tk.END, values=(claim_id, item_name, claimed_by_name, claim_date_str, claim_details, item_id))
-            print("AdminPanelFrame: Pending claims displayed in Treeview.") # Debugging print
+            for claim_id, claim in self.pending_claims.items():
+                self.claims_tree.insert("", tk.END, iid=str(claim_id), values=self._claim_row_values(claim))
+            logger.debug("AdminPanelFrame: Pending claims displayed in Treeview.")
+
+
+    def reset_claims(self):
+        """Mengosongkan data dan Treeview klaim; refresh berikutnya memuat penuh."""
+        self.pending_claims = {}
+        self._claims_since = None
+        self.display_claims()
 
 
     def on_claim_select(self, event):
@@ -180,9 +235,9 @@ class AdminPanelFrame(BaseFrame):
         Menangani event saat baris klaim di Treeview dipilih.
         Memuat dan menampilkan detail klaim terpilih, termasuk gambar bukti.
         """
-        print("\nAdminPanelFrame: on_claim_select triggered.") # DEBUG PRINT
+        logger.debug("AdminPanelFrame: on_claim_select triggered.")
         selected_item = self.claims_tree.selection() # Ambil item yang dipilih di Treeview
-        print(f"AdminPanelFrame: Selected item(s): {selected_item}") # DEBUG PRINT
+        logger.debug("AdminPanelFrame: Selected item(s): %s", selected_item)
 
         # Bersihkan area detail sebelum menampilkan yang baru
         self.clear_detail_area()
@@ -190,38 +245,34 @@ class AdminPanelFrame(BaseFrame):
         if not selected_item:
             # Tidak ada item yang dipilih atau pilihan dibatalkan
             self.current_claim_details = None
-            print("AdminPanelFrame: No claim selected.") # Debugging print
+            logger.debug("AdminPanelFrame: No claim selected.")
             return
 
         # Ambil nilai dari item yang dipilih (asumsi hanya satu item dipilih)
         item_values = self.claims_tree.item(selected_item[0], 'values')
-        print(f"AdminPanelFrame: Selected item values: {item_values}") # DEBUG PRINT
+        logger.debug("AdminPanelFrame: Selected item values: %s", item_values)
 
         # Urutan nilai: (ClaimID, Item, Pengklaim, Tanggal Klaim, Detail Klaim, ItemID)
         # Pastikan indeksnya benar sesuai kolom Treeview
         try:
             selected_claim_id = item_values[0]
             # selected_item_id = item_values[5] # ItemID ada di indeks 5
-            print(f"AdminPanelFrame: Extracted ClaimID: {selected_claim_id}") # DEBUG PRINT
+            logger.debug("AdminPanelFrame: Extracted ClaimID: %s", selected_claim_id)
         except IndexError as e:
-            print(f"AdminPanelFrame: Error extracting values from selected item: {e}") # DEBUG PRINT
-            print("AdminPanelFrame: Check Treeview column definition and item values.")
+            logger.error("AdminPanelFrame: Error extracting values from selected item: %s", e)
+            logger.error("AdminPanelFrame: Check Treeview column definition and item values.")
             return
 
 
         # Cari detail klaim lengkap dari self.pending_claims berdasarkan ClaimID
-        # self.pending_claims berisi semua detail yang diambil oleh get_pending_claims
-        # Gunakan perbandingan string karena nilai dari Treeview adalah string
-        self.current_claim_details = next(
-            (claim for claim in self.pending_claims if str(claim.get('ClaimID')) == str(selected_claim_id)),
-            None # Default None jika tidak ditemukan (seharusnya tidak terjadi jika data dari Treeview)
-        )
+        # self.pending_claims berisi semua detail yang diambil oleh get_pending_claims_changes
+        self.current_claim_details = self.pending_claims.get(int(selected_claim_id))
 
-        print(f"AdminPanelFrame: Found claim details: {self.current_claim_details is not None}") # DEBUG PRINT
+        logger.debug("AdminPanelFrame: Found claim details: %s", self.current_claim_details is not None)
 
 
         if self.current_claim_details:
-            print(f"AdminPanelFrame: Displaying details for ClaimID: {selected_claim_id}") # Debugging print
+            logger.debug("AdminPanelFrame: Displaying details for ClaimID: %s", selected_claim_id)
             # Tampilkan detail teks klaim
             self.label_detail_item.config(text=f"Barang: {self.current_claim_details.get('ItemName', '-')}")
             self.label_detail_claimer.config(text=f"Pengklaim: {self.current_claim_details.get('ClaimedByFullName', self.current_claim_details.get('ClaimedByUsername', '-'))}")
@@ -236,7 +287,7 @@ class AdminPanelFrame(BaseFrame):
 
         else:
             # Jika detail klaim tidak ditemukan (kasus error)
-            print(f"AdminPanelFrame: Error: Could not find claim details for ClaimID {selected_claim_id} in loaded data.") # Debugging print
+            logger.error("AdminPanelFrame: Could not find claim details for ClaimID %s in loaded data.", selected_claim_id)
             self.label_detail_item.config(text="Barang: Detail tidak tersedia")
             self.label_detail_claimer.config(text="Pengklaim: Detail tidak tersedia")
             self.label_detail_date.config(text="Tanggal Klaim: Detail tidak tersedia")
@@ -247,13 +298,15 @@ class AdminPanelFrame(BaseFrame):
         """
         Membersihkan area detail klaim terpilih dan gambar-gambar bukti.
         """
-        print("AdminPanelFrame: Clearing detail area.") # Debugging print
+        logger.debug("AdminPanelFrame: Clearing detail area.")
         # Reset label teks detail
         self.label_detail_item.config(text="Barang: -")
         self.label_detail_claimer.config(text="Pengklaim: -")
         self.label_detail_date.config(text="Tanggal Klaim: -")
         self.label_detail_details.config(text="Detail: -")
 
+        # Batalkan unduhan gambar klaim sebelumnya yang belum selesai
+        get_image_loader().cancel_group(self)
         # Hapus semua widget gambar dari images_scrollable_frame
         for widget in self.images_scrollable_frame.winfo_children():
             widget.destroy()
@@ -265,80 +318,77 @@ class AdminPanelFrame(BaseFrame):
 
     def load_and_display_claim_images(self, claim_id):
         """
-        Mengambil URL gambar bukti dari DAO dan menampilkannya.
-        Menggunakan threading untuk mengunduh gambar.
+        Mengambil URL gambar bukti dari DAO di latar belakang, lalu menampilkannya
+        (_on_claim_images_loaded). Menggunakan ImageLoader bersama untuk mengunduh gambar.
         """
-        print(f"AdminPanelFrame: Loading images for ClaimID: {claim_id}") # Debugging print
-        # Panggil fungsi DAO baru untuk mengambil semua URL gambar klaim
-        # Pastikan claim_id adalah integer jika fungsi DAO membutuhkannya
-        image_urls = get_claim_images_by_claim_id(int(claim_id)) # Pastikan passing integer
+        logger.debug("AdminPanelFrame: Loading images for ClaimID: %s", claim_id)
+        claim_id = int(claim_id) # Pastikan passing integer
+        tk.Label(self.images_scrollable_frame, text="Memuat bukti gambar...").pack(side="left", padx=5)
+        # Key yang sama: hasil untuk klaim yang dipilih sebelumnya dianggap basi dan dibuang
+        self.run_in_background(
+            get_claim_images_by_claim_id, claim_id,
+            on_success=lambda image_urls: self._on_claim_images_loaded(claim_id, image_urls),
+            key="load_claim_images",
+            loading_text=None
+        )
+
+
+    def _on_claim_images_loaded(self, claim_id, image_urls):
+        """Callback load_and_display_claim_images (thread utama): menampilkan gambar bukti klaim."""
+        if not self.current_claim_details or self.current_claim_details.get('ClaimID') != claim_id:
+            return # Pilihan sudah berubah atau area detail sudah dibersihkan
+        for widget in self.images_scrollable_frame.winfo_children():
+            widget.destroy() # Hapus label "Memuat bukti gambar..."
 
         if not image_urls:
             tk.Label(self.images_scrollable_frame, text="[Tidak Ada Bukti Gambar]").pack(side="left", padx=5)
-            print("AdminPanelFrame: No claim images found for this claim.") # Debugging print
+            logger.debug("AdminPanelFrame: No claim images found for this claim.")
             # Update scrollregion meskipun kosong
             self.images_scrollable_frame.update_idletasks()
             self.images_canvas.config(scrollregion=self.images_canvas.bbox("all"))
             return
 
-        print(f"AdminPanelFrame: Found {len(image_urls)} claim images. Attempting to display...") # Debugging print
-        # Gunakan threading untuk mengunduh dan menampilkan gambar
+        logger.debug("AdminPanelFrame: Found %s claim images. Attempting to display...", len(image_urls))
+        # Unduhan diantrikan di ImageLoader bersama (thread pool terbatas), bukan satu thread per gambar
+        image_loader = get_image_loader()
         for url in image_urls:
             # Tampilkan label "Memuat..." sementara
             img_label = tk.Label(self.images_scrollable_frame, text="Memuat gambar...")
             img_label.pack(side="left", padx=5)
-            thread = threading.Thread(target=self.download_and_display_image, args=(url, img_label))
-            thread.daemon = True # Set thread as daemon so it exits when the main app exits
-            thread.start()
+            image_loader.submit(
+                url,
+                lambda image, error, u=url, l=img_label: self.download_and_display_image(image, error, u, l),
+                size=(150, 150), # Ukuran thumbnail yang lebih besar untuk bukti klaim
+                priority=PRIORITY_VISIBLE,
+                group=self
+            )
 
 
-    def download_and_display_image(self, image_url, img_label):
+    def download_and_display_image(self, image, error, image_url, img_label):
         """
-        Mengunduh gambar dari URL dan menampilkannya di label yang diberikan.
-        Dijalankan di thread terpisah.
+        Callback ImageLoader, dijalankan di thread worker setelah gambar diunduh dan diperkecil.
+        Memindahkan pembaruan label ke thread utama menggunakan after().
         """
+        if error is None:
+            self.after(0, lambda: self.update_image_label(img_label, image))
+        elif isinstance(error, requests.exceptions.RequestException):
+            logger.warning("AdminPanelFrame: Failed to download image from URL %s: %s", image_url, error)
+            self.after(0, lambda: self._show_image_error(img_label, "[Gambar Gagal Dimuat (Unduh Error)]"))
+        else:
+            logger.warning("AdminPanelFrame: Failed to display image from URL %s: %s", image_url, error)
+            self.after(0, lambda: self._show_image_error(img_label, "[Gambar Gagal Dimuat]"))
+
+
+    def _show_image_error(self, img_label, text):
+        """Menampilkan pesan error di label gambar (dijalankan di thread utama)."""
         try:
-            print(f"AdminPanelFrame: Downloading image from URL: {image_url}") # Debugging print
-            response = requests.get(image_url)
-            response.raise_for_status() # Cek jika ada error HTTP
-            img_data = response.content
-            img = Image.open(BytesIO(img_data))
-
-            # Resize gambar agar tidak terlalu besar di GUI
-            # Ubah ukuran thumbnail menjadi 150x150
-            img.thumbnail((150, 150)) # Ukuran thumbnail yang lebih besar
-
-            photo_img = ImageTk.PhotoImage(img)
-
-            # --- Add check if img_label is still valid ---
-            try:
-                if img_label.winfo_exists(): # Check if the widget still exists
-                    # Update label di thread utama menggunakan after()
-                    self.after(0, lambda: self.update_image_label(img_label, photo_img))
-                else:
-                    print("AdminPanelFrame: GUI label for image no longer exists, skipping update.")
-            except Exception as e:
-                 print(f"AdminPanelFrame: Error checking winfo_exists() for image label: {e}")
-
-            print(f"AdminPanelFrame: Image successfully downloaded from URL: {image_url}") # Debugging print
-
-        except requests.exceptions.RequestException as e:
-            print(f"AdminPanelFrame: Failed to download image from URL {image_url}: {e}")
-            try:
-                if img_label.winfo_exists():
-                    self.after(0, lambda: img_label.config(text="[Gambar Gagal Dimuat (Unduh Error)]", fg="red", image='')) # Update label di thread utama
-            except Exception as e_check:
-                 print(f"AdminPanelFrame: Error checking winfo_exists() in image error handler: {e_check}")
-        except Exception as e:
-            print(f"AdminPanelFrame: Failed to display image from URL {image_url}: {e}")
-            try:
-                if img_label.winfo_exists():
-                    self.after(0, lambda: img_label.config(text="[Gambar Gagal Dimuat]", fg="red", image='')) # Update label di thread utama
-            except Exception as e_check:
-                 print(f"AdminPanelFrame: Error checking winfo_exists() in image generic error handler: {e_check}")
+            if img_label.winfo_exists():
+                img_label.config(text=text, fg="red", image='')
+        except Exception as e_check:
+            logger.error("AdminPanelFrame: Error checking winfo_exists() in image error handler: %s", e_check)
 
 
-    def update_image_label(self, img_label, photo_img):
+    def update_image_label(self, img_label, image):
         """
         Memperbarui widget Label gambar dengan gambar yang dimuat.
         Dijalankan di thread utama menggunakan after().
@@ -346,6 +396,7 @@ class AdminPanelFrame(BaseFrame):
         # --- Add check if img_label is still valid ---
         try:
             if img_label.winfo_exists(): # Check if the widget still exists
+                photo_img = ImageTk.PhotoImage(image) # PhotoImage dibuat di thread utama
                 img_label.config(image=photo_img, text='') # Hapus teks "Memuat gambar..."
                 self.claim_image_refs.append(photo_img) # Simpan referensi gambar
                 # Update scrollregion canvas setelah gambar ditambahkan
@@ -353,102 +404,82 @@ class AdminPanelFrame(BaseFrame):
                 self.images_canvas.config(scrollregion=self.images_canvas.bbox("all"))
 
             else:
-                print("AdminPanelFrame: GUI label for image no longer exists during update, skipping.")
+                logger.warning("AdminPanelFrame: GUI label for image no longer exists during update, skipping.")
         except Exception as e:
-             print(f"AdminPanelFrame: Error checking winfo_exists() in update_image_label: {e}")
+             logger.error("AdminPanelFrame: Error checking winfo_exists() in update_image_label: %s", e)
 
 
     def handle_claim_action(self, status):
         """
-        Menangani aksi admin (Setujui/Tolak) pada klaim terpilih.
-        Menambahkan notifikasi setelah aksi berhasil.
+        Menangani aksi admin (Setujui/Tolak) pada satu atau banyak klaim terpilih.
+        Status item, notifikasi, dan penolakan otomatis klaim pesaing dilakukan oleh
+        update_claims_status_bulk dalam satu transaksi.
 
         Args:
             status (str): Status baru klaim ('Approved' atau 'Rejected').
         """
         selected_items = self.claims_tree.selection() # Ambil item yang dipilih di Treeview
-        admin_user_id = self.main_app.user_data.get('UserID') # Ambil UserID admin yang sedang login
 
         if not selected_items:
             messagebox.showwarning("Peringatan", "Pilih klaim yang ingin diverifikasi terlebih dahulu.")
             return
 
-        # Ambil nilai dari item yang dipilih (asumsi hanya satu item dipilih)
-        item_values = self.claims_tree.item(selected_items[0], 'values')
         # Urutan nilai: (ClaimID, Item, Pengklaim, Tanggal Klaim, Detail Klaim, ItemID)
-        selected_claim_id = item_values[0]
-        selected_item_id = item_values[5] # ItemID ada di indeks 5
-        selected_item_name = item_values[1] # Item Name ada di indeks 1
+        selected_values = [self.claims_tree.item(tree_item, 'values') for tree_item in selected_items]
+        selected_claim_ids = [values[0] for values in selected_values]
 
-        print(f"AdminPanelFrame: Attempting to set ClaimID {selected_claim_id} status to '{status}'.") # Debugging print
+        logger.debug("AdminPanelFrame: Attempting to set %s claims to '%s'.", len(selected_claim_ids), status)
 
         # Konfirmasi aksi dari admin
         action_verb = "MENYETUJui" if status == 'Approved' else "MENOLAK"
-        confirm = messagebox.askyesno("Konfirmasi Verifikasi", f"Anda yakin ingin {action_verb} klaim (ID: {selected_claim_id}) untuk barang '{selected_item_name}'?")
-        if not confirm:
+        if len(selected_values) == 1:
+            confirm_text = f"Anda yakin ingin {action_verb} klaim (ID: {selected_claim_ids[0]}) untuk barang '{selected_values[0][1]}'?"
+        else:
+            confirm_text = f"Anda yakin ingin {action_verb} {len(selected_values)} klaim terpilih?"
+            if status == 'Approved':
+                confirm_text += "\n\nKlaim lain yang masih pending untuk barang yang sama akan ditolak otomatis."
+        if not messagebox.askyesno("Konfirmasi Verifikasi", confirm_text):
             return # Admin membatalkan
 
-        # Panggil fungsi DAO untuk update status klaim di database
-        # update_claim_status sekarang menerima admin_user_id
-        claim_update_success = update_claim_status(selected_claim_id, status) # update_claim_status tidak butuh admin_user_id di implementasi DAO saat ini
-
-        if claim_update_success:
-            messagebox.showinfo("Sukses", f"Klaim (ID: {selected_claim_id}) berhasil di{status.lower()}.")
-
-            # --- Logika Notifikasi ---
-            # Cari data klaim lengkap dari self.pending_claims berdasarkan selected_claim_id
-            claim_data = None
-            for claim in self.pending_claims:
-                 if str(claim.get('ClaimID')) == str(selected_claim_id): # Bandingkan sebagai string
-                      claim_data = claim
-                      break
-
-            if claim_data:
-                 claimed_by_user_id = claim_data.get('ClaimedBy')
-                 claimed_item_id = claim_data.get('ItemID') # ItemID barang yang diklaim
-                 item_name_for_notif = claim_data.get('ItemName', 'Barang Tidak Diketahui') # Nama barang untuk notifikasi
-
-                 if claimed_by_user_id:
-                      # Notifikasi untuk Pengklaim
-                      notification_message_claimer = f"Status klaim Anda untuk barang '{item_name_for_notif}' telah di{status.lower()} oleh admin."
-                      print(f"AdminPanelFrame: Sending notification to claimant (UserID: {claimed_by_user_id}): {notification_message_claimer}") # Debugging print
-                      add_notification(claimed_by_user_id, notification_message_claimer)
-
-                 # Jika klaim disetujui, kirim notifikasi juga ke Penemu Barang (jika ada dan berbeda dari pengklaim)
-                 if status == 'Approved':
-                      # Ambil data item untuk mendapatkan FoundBy (UserID penemu)
-                      item_detail = get_item_by_id(claimed_item_id)
-                      found_by_user_id = item_detail.get('FoundBy') if item_detail else None
-                      item_name_for_finder_notif = item_detail.get('ItemName', 'Barang Tidak Diketahui') if item_detail else 'Barang Tidak Diketahui'
-
-
-                      if found_by_user_id and found_by_user_id != claimed_by_user_id:
-                           # Update status item menjadi 'Claimed' di sini
-                           item_update_success = update_item_status(selected_item_id, 'Claimed')
-                           if item_update_success:
-                                print(f"AdminPanelFrame: Item status updated to 'Claimed' for ItemID {selected_item_id}.") # Debugging print
-                                notification_message_finder = f"Barang '{item_name_for_finder_notif}' yang Anda temukan telah berhasil diklaim oleh pengguna lain."
-                                print(f"AdminPanelFrame: Sending notification to finder (UserID: {found_by_user_id}): {notification_message_finder}") # Debugging print
-                                add_notification(found_by_user_id, notification_message_finder)
-                           else:
-                                print(f"AdminPanelFrame: FAILED to update item status to 'Claimed' for ItemID {selected_item_id}.") # Debugging print
-                                # Opsional: Kirim notifikasi ke admin tentang kegagalan update status item
-                                # add_notification(admin_user_id, f"Gagal update status item {selected_item_id} menjadi 'Claimed' setelah klaim disetujui.")
-
-
-            else:
-                 print(f"AdminPanelFrame: Could not find claim data in self.pending_claims for ClaimID {selected_claim_id}, skipping notification.") # Debugging print
+        # Dijalankan di latar belakang agar GUI tidak freeze
+        self.run_in_background(
+            update_claims_status_bulk, selected_claim_ids, status,
+            on_success=lambda result: self._on_claim_action_done(result, status),
+            key="claim_action",
+            loading_text="Memproses klaim..."
+        )
 
 
-            # Refresh daftar klaim pending setelah aksi berhasil
-            self.load_pending_claims()
-            self.display_claims()
-            self.clear_detail_area() # Bersihkan detail area setelah klaim diproses
+    def _on_claim_action_done(self, result, status):
+        """Callback handle_claim_action (thread utama): menampilkan ringkasan dan menghapus klaim yang sudah diproses."""
+        if result is None:
+            messagebox.showwarning("Gagal", "Gagal mengupdate status klaim. Tidak ada perubahan yang disimpan. Mohon coba lagi atau periksa log database.")
+            return
 
-        else:
-            # Gagal update status klaim
-            # update_claim_status sudah menampilkan error database di konsol
-            messagebox.showwarning("Gagal", f"Gagal mengupdate status klaim (ID: {selected_claim_id}). Mohon coba lagi atau periksa log database.")
+        # Klaim yang sudah tidak pending dihapus dari tampilan tanpa memuat ulang seluruh daftar
+        # ('skipped' hanya berisi klaim yang sudah diproses sebelumnya, misal oleh admin lain)
+        processed_ids = set(result['updated']) | set(result['auto_rejected']) | set(result['skipped'])
+        self.remove_claims_from_view(processed_ids)
+        self.clear_detail_area() # Bersihkan detail area setelah klaim diproses
+        self.load_pending_claims() # Ambil perubahan lain (misal dari admin lain) secara inkremental
+
+        summary = f"{len(result['updated'])} klaim berhasil {CLAIM_STATUS_VERBS[status]}."
+        if result['auto_rejected']:
+            summary += f"\n{len(result['auto_rejected'])} klaim pesaing ditolak otomatis."
+        if result['skipped']:
+            summary += f"\n{len(result['skipped'])} klaim dilewati karena sudah diproses sebelumnya."
+        messagebox.showinfo("Sukses", summary)
+
+
+    def remove_claims_from_view(self, claim_ids):
+        """Menghapus klaim dengan ClaimID tertentu dari self.pending_claims dan Treeview."""
+        for claim_id in claim_ids:
+            self.pending_claims.pop(int(claim_id), None)
+            if self.claims_tree.exists(str(claim_id)):
+                self.claims_tree.delete(str(claim_id))
+        if self.current_claim_details and self.current_claim_details.get('ClaimID') not in self.pending_claims:
+            self.clear_detail_area() # Klaim yang sedang ditampilkan sudah diproses
+            self.current_claim_details = None
 
 
     # handle_approve_claim dan handle_reject_claim digabung menjadi handle_claim_action
@@ -463,7 +494,7 @@ class AdminPanelFrame(BaseFrame):
         """
         Menampilkan frame ini dan me-refresh daftar klaim pending.
         """
-        print("AdminPanelFrame: show called.") # Debugging print
+        logger.debug("AdminPanelFrame: show called.")
         # Pastikan pengguna adalah admin sebelum menampilkan frame
         is_admin = self.main_app.user_data.get('IsAdmin', False) if self.main_app.user_data else False
         if not is_admin:
@@ -472,20 +503,17 @@ class AdminPanelFrame(BaseFrame):
              return
 
         super().show() # Panggil metode show dari BaseFrame (pack frame)
-        # Muat data klaim pending dan tampilkan setiap kali frame ini ditunjukkan
-        self.load_pending_claims()
-        self.display_claims()
+        # Ambil perubahan klaim pending setiap kali frame ini ditunjukkan (inkremental setelah muat pertama)
         self.clear_detail_area() # Bersihkan detail area saat frame ditampilkan
+        self.load_pending_claims()
 
 
     def hide(self):
         """
          Menyembunyikan frame ini.
         """
-        print("AdminPanelFrame: hide called.") # Debugging print
+        logger.debug("AdminPanelFrame: hide called.")
         super().hide()
-        # Bersihkan data dan tampilan saat frame disembunyikan
-        self.pending_claims = []
-        self.display_claims() # Membersihkan Treeview
+        # Data dan Treeview klaim dipertahankan agar show() berikutnya cukup mengambil perubahan
         self.clear_detail_area() # Membersihkan area detail
         self.current_claim_details = None # Reset detail klaim yang ditampilkan
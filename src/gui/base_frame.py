@@ -1,11 +1,16 @@
 # src/gui/base_frame.py
 
 import tkinter as tk
+from tkinter import messagebox
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 class BaseFrame(tk.Frame):
     """
     Kelas dasar untuk frame-frame GUI.
-    Menyediakan referensi ke main_app dan metode untuk membersihkan frame.
+    Menyediakan referensi ke main_app, metode untuk membersihkan frame,
+    dan helper untuk menjalankan pekerjaan yang memblokir (query DAO) di latar belakang.
     """
     def __init__(self, parent, main_app):
         """
@@ -18,21 +23,97 @@ class BaseFrame(tk.Frame):
         super().__init__(parent)
         self.main_app = main_app
         self.parent = parent
+        self._background_tasks = {} # key -> BackgroundTask yang sedang berjalan untuk frame ini
+        self._loading_keys = set() # Key tugas yang menampilkan indikator loading
+        self._loading_label = None
 
     def show(self):
         """Menampilkan frame ini."""
         self.pack(expand=True, fill='both')
 
     def hide(self):
-        """Menyembunyikan frame ini."""
+        """Menyembunyikan frame ini dan membuang hasil pekerjaan latar belakang yang masih berjalan."""
+        self.cancel_background_tasks()
         self.pack_forget()
 
     def clear_widgets(self):
         """Menghapus semua widget dari frame ini."""
         for widget in self.winfo_children():
             widget.destroy()
+        self._loading_label = None
 
     # Metode placeholder untuk inisialisasi UI spesifik frame turunan
     def create_widgets(self):
         """Metode placeholder untuk membuat widget spesifik frame turunan."""
         pass
+
+    # --- Pekerjaan Latar Belakang ---
+
+    def run_in_background(self, func, *args, on_success=None, on_error=None, on_done=None, key=None, loading_text="Memuat...", **kwargs):
+        """
+        Menjalankan func(*args, **kwargs) di thread worker melalui main_app.task_runner
+        agar GUI tidak freeze selama query database berlangsung.
+
+        Args:
+            func (callable): Pekerjaan yang memblokir (misal: fungsi DAO). Tidak boleh menyentuh widget.
+            on_success (callable, optional): Dipanggil dengan hasil func di thread utama.
+            on_error (callable, optional): Dipanggil dengan exception di thread utama.
+                Default: menampilkan messagebox error.
+            on_done (callable, optional): Dipanggil di thread utama setelah tugas selesai atau dibatalkan.
+            key (str, optional): Nama tugas di frame ini. Tugas sebelumnya dengan key yang sama
+                dianggap basi dan hasilnya dibuang. Default: nama fungsi.
+            loading_text (str, optional): Teks indikator loading. None = tanpa indikator.
+
+        Returns:
+            BackgroundTask: Tugas yang dijadwalkan.
+        """
+        key = key or getattr(func, '__name__', 'task')
+        if loading_text:
+            self._loading_keys.add(key)
+            self._show_loading_indicator(loading_text)
+
+        def finished():
+            if self._background_tasks.get(key) is task:
+                del self._background_tasks[key]
+                self._loading_keys.discard(key)
+                if not self._loading_keys:
+                    self._hide_loading_indicator()
+            if on_done:
+                on_done()
+
+        task = self.main_app.task_runner.submit(
+            func, *args,
+            on_success=on_success,
+            on_error=on_error or self._on_background_error,
+            on_done=finished,
+            key=(id(self), key), # Key unik per frame
+            **kwargs
+        )
+        self._background_tasks[key] = task
+        return task
+
+    def cancel_background_tasks(self):
+        """Membatalkan semua pekerjaan latar belakang milik frame ini (hasilnya dibuang)."""
+        for task in self._background_tasks.values():
+            task.cancel()
+        self._background_tasks = {}
+        self._loading_keys.clear()
+        self._hide_loading_indicator()
+
+    def _on_background_error(self, error):
+        logger.warning("%s: Background task failed: %s", type(self).__name__, error)
+        messagebox.showerror("Kesalahan", f"Terjadi kesalahan saat memuat data:\n{error}")
+
+    def _show_loading_indicator(self, text):
+        # Label diletakkan dengan place() agar tidak mengganggu layout pack/grid frame turunan
+        if self._loading_label is None or not self._loading_label.winfo_exists():
+            self._loading_label = tk.Label(self, fg="gray")
+        self._loading_label.config(text=text)
+        self._loading_label.place(relx=1.0, rely=0.0, anchor='ne', x=-10, y=5)
+        self._loading_label.lift()
+        self.config(cursor="watch")
+
+    def _hide_loading_indicator(self):
+        if self._loading_label is not None and self._loading_label.winfo_exists():
+            self._loading_label.place_forget()
+        self.config(cursor="")
@@ -9,14 +9,18 @@ from .base_frame import BaseFrame # Mengimpor BaseFrame
 from src.database.item_dao import get_item_by_id, get_item_images_by_item_id # Impor fungsi untuk ambil detail dan gambar item
 from src.database.claim_dao import add_claim # Impor fungsi untuk menambahkan klaim
 # Mengimpor modul untuk mengunggah gambar
-from src.image_storage.imagekit_service import upload_image # Mengimpor fungsi upload_image
+from src.image_storage.upload_manager import get_upload_manager, UploadBatch, UploadJob # Unggah paralel di latar belakang
+from .upload_progress_frame import UploadProgressFrame
 import os # Diperlukan untuk mendapatkan nama file dari jalur
 import datetime # Diperlukan untuk timestamp jika membuat nama file unik
 # Mengimpor modul untuk menampilkan gambar dari URL
-from PIL import ImageTk, Image # Perlu instal Pillow: pip install Pillow
+from PIL import ImageTk # Perlu instal Pillow: pip install Pillow
 import requests # Perlu instal requests: pip install requests
-from io import BytesIO
-import threading # Untuk mengunduh gambar di thread terpisah
+# Pemuat gambar bersama (thread pool terbatas) untuk mengunduh gambar di luar thread GUI
+from src.image_storage.image_loader import get_image_loader, PRIORITY_VISIBLE
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 class ClaimItemFrame(BaseFrame):
     """
@@ -31,12 +35,15 @@ class ClaimItemFrame(BaseFrame):
             parent: Widget parent.
             main_app: Referensi ke instance kelas MainApp.
         """
-        print("ClaimItemFrame: __init__ called.") # Debugging print
+        logger.debug("ClaimItemFrame: __init__ called.")
         super().__init__(parent, main_app)
         self.item_id = None # Untuk menyimpan ItemID barang yang diklaim
         self.item_data = None # Untuk menyimpan detail data item
         self.proof_image_paths = [] # List untuk menyimpan jalur file gambar bukti klaim yang dipilih
         self.item_image_refs = [] # List untuk menyimpan referensi gambar item yang ditampilkan
+        self.image_paths = [] # Jalur file gambar bukti klaim yang dipilih (diisi select_claim_images)
+        self.upload_batch = None # UploadBatch untuk image_paths saat ini (disimpan agar unggah ulang hanya untuk yang gagal)
+        self.button_submit_claim = None
 
         # Struktur dasar frame ini akan dibuat di create_widgets()
         # yang dipanggil dari show() setelah item_id diatur.
@@ -48,7 +55,7 @@ class ClaimItemFrame(BaseFrame):
         Mengatur ItemID barang yang akan diklaim di frame ini.
         Dipanggil oleh MainApp sebelum frame ini ditampilkan.
         """
-        print(f"ClaimItemFrame: set_item_id called with ItemID: {item_id}") # Debugging print
+        logger.debug("ClaimItemFrame: set_item_id called with ItemID: %s", item_id)
         self.item_id = item_id
         # Tidak perlu memuat data atau membuat widget di sini.
         # Itu akan dilakukan saat metode show() dipanggil.
@@ -58,15 +65,15 @@ class ClaimItemFrame(BaseFrame):
         """
         Mengambil detail data item dari DAO berdasarkan self.item_id.
         """
-        print(f"ClaimItemFrame: load_item_data called for ItemID: {self.item_id}") # Debugging print
+        logger.debug("ClaimItemFrame: load_item_data called for ItemID: %s", self.item_id)
         if self.item_id is None:
-            print("ClaimItemFrame: ItemID is None in load_item_data, cannot load item data.") # Debugging print
+            logger.warning("ClaimItemFrame: ItemID is None in load_item_data, cannot load item data.")
             self.item_data = None
             return
 
         # Panggil fungsi DAO untuk mengambil detail item
         self.item_data = get_item_by_id(self.item_id)
-        print(f"ClaimItemFrame: Item data loaded: {self.item_data is not None}") # Debugging print
+        logger.debug("ClaimItemFrame: Item data loaded: %s", self.item_data is not None)
 
 
     def create_widgets(self):
@@ -74,8 +81,12 @@ class ClaimItemFrame(BaseFrame):
         Membuat widget (label, entry, tombol) untuk form klaim.
         Widget dibuat berdasarkan self.item_data.
         """
-        print(f"ClaimItemFrame: create_widgets called. self.item_id: {self.item_id}, self.item_data is None: {self.item_data is None}") # Debugging print
+        logger.debug("ClaimItemFrame: create_widgets called. self.item_id: %s, self.item_data is None: %s", self.item_id, self.item_data is None)
         self.clear_widgets() # Bersihkan widget lama
+        # Form dibuat ulang, jadi pilihan gambar bukti sebelumnya ikut direset
+        self.image_paths = []
+        self.upload_batch = None
+        self.button_submit_claim = None
 
         tk.Label(self, text="Ajukan Klaim Barang", font=('Arial', 18, 'bold')).pack(pady=(20, 10))
 
@@ -137,10 +148,14 @@ class ClaimItemFrame(BaseFrame):
             # Label untuk menampilkan jumlah gambar bukti klaim yang dipilih
             self.label_claim_image_count = tk.Label(claim_form_frame, text="0 file dipilih")
             self.label_claim_image_count.pack(pady=2)
+            # Status unggah per gambar bukti
+            self.upload_progress = UploadProgressFrame(claim_form_frame)
+            self.upload_progress.pack(pady=2)
 
 
             # Tombol Ajukan Klaim
-            tk.Button(self, text="Ajukan Klaim", command=self.handle_submit_claim, width=30).pack(pady=20)
+            self.button_submit_claim = tk.Button(self, text="Ajukan Klaim", command=self.handle_submit_claim, width=30)
+            self.button_submit_claim.pack(pady=20)
 
         else:
             # Jika item_data adalah None (item tidak ditemukan atau error)
@@ -155,10 +170,10 @@ class ClaimItemFrame(BaseFrame):
     def load_and_display_item_images(self, item_id, images_container_frame, item_images_canvas):
         """
         Mengambil URL semua gambar untuk item tertentu dari DAO dan menampilkannya.
-        Menggunakan threading untuk mengunduh gambar.
+        Menggunakan ImageLoader bersama untuk mengunduh gambar.
         Menerima objek Canvas untuk memperbarui scrollregion.
         """
-        print(f"ClaimItemFrame: Loading all images for ItemID: {item_id}") # Debugging print
+        logger.debug("ClaimItemFrame: Loading all images for ItemID: %s", item_id)
         # Panggil fungsi DAO untuk mengambil semua URL gambar item
         image_urls = get_item_images_by_item_id(item_id)
 
@@ -167,72 +182,53 @@ class ClaimItemFrame(BaseFrame):
 
         if not image_urls:
             tk.Label(images_container_frame, text="[Tidak Ada Gambar]").pack(side="left", padx=5)
-            print(f"ClaimItemFrame: No images found for ItemID {item_id}.") # Debugging print
+            logger.debug("ClaimItemFrame: No images found for ItemID %s.", item_id)
             # Perbarui scrollregion meskipun tidak ada gambar agar scrollbar tidak muncul kosong
             item_images_canvas.update_idletasks()
             item_images_canvas.config(scrollregion=item_images_canvas.bbox("all"))
             return
 
-        print(f"ClaimItemFrame: Found {len(image_urls)} images for ItemID {item_id}. Attempting to display...") # Debugging print
-        # Gunakan threading untuk mengunduh dan menampilkan gambar
+        logger.debug("ClaimItemFrame: Found %s images for ItemID %s. Attempting to display...", len(image_urls), item_id)
+        # Unduhan diantrikan di ImageLoader bersama (thread pool terbatas), bukan satu thread per gambar
+        image_loader = get_image_loader()
         for url in image_urls:
             # Tampilkan label "Memuat..." sementara
             img_label = tk.Label(images_container_frame, text="Memuat...")
             img_label.pack(side="left", padx=5)
-            # Teruskan objek Canvas ke thread target
-            thread = threading.Thread(target=self.download_and_display_image, args=(url, img_label, item_images_canvas)) # <-- Teruskan Canvas
-            thread.daemon = True # Set thread as daemon
-            thread.start()
-
-    def download_and_display_image(self, image_url, img_label, item_images_canvas):
+            # Teruskan objek Canvas ke callback
+            image_loader.submit(
+                url,
+                lambda image, error, u=url, l=img_label: self.download_and_display_image(image, error, u, l, item_images_canvas),
+                size=(120, 120), # Ukuran thumbnail untuk gambar item
+                priority=PRIORITY_VISIBLE, # Semua gambar item langsung terlihat di frame ini
+                group=self
+            )
+
+    def download_and_display_image(self, image, error, image_url, img_label, item_images_canvas):
         """
-        Mengunduh gambar dari URL dan menampilkannya di label yang diberikan.
-        Dijalankan di thread terpisah.
+        Callback ImageLoader, dijalankan di thread worker setelah gambar diunduh dan diperkecil.
+        Memindahkan pembaruan label ke thread utama menggunakan after().
         Menerima objek Canvas untuk diteruskan ke update_image_label.
         """
-        try:
-            # print(f"ClaimItemFrame: Downloading image from URL: {image_url}") # Debugging print
-            response = requests.get(image_url)
-            response.raise_for_status() # Cek jika ada error HTTP
-            img_data = response.content
-            img = Image.open(BytesIO(img_data))
-
-            # Resize gambar agar tidak terlalu besar di GUI
-            # Gunakan ukuran yang konsisten, misalnya 120x120
-            img.thumbnail((120, 120)) # Ukuran thumbnail untuk gambar item
-
-            photo_img = ImageTk.PhotoImage(img)
-
-            # --- Add check if img_label is still valid ---
-            try:
-                if img_label.winfo_exists(): # Check if the widget still exists
-                    # Update label di thread utama menggunakan after()
-                    # TERUSKAN objek Canvas ke update_image_label
-                    self.after(0, lambda: self.update_image_label(img_label, photo_img, item_images_canvas)) # <-- Teruskan Canvas
-                else:
-                    print("ClaimItemFrame: GUI label for image no longer exists, skipping update.")
-            except Exception as e:
-                 print(f"ClaimItemFrame: Error checking winfo_exists() for image label: {e}")
-
+        if error is None:
+            # TERUSKAN objek Canvas ke update_image_label
+            self.after(0, lambda: self.update_image_label(img_label, image, item_images_canvas)) # <-- Teruskan Canvas
+        elif isinstance(error, requests.exceptions.RequestException):
+            logger.warning("ClaimItemFrame: Failed to download image from URL %s: %s", image_url, error)
+            self.after(0, lambda: self._show_image_error(img_label, "[Gambar Gagal Dimuat (Unduh Error)]"))
+        else:
+            logger.warning("ClaimItemFrame: Failed to display image from URL %s: %s", image_url, error)
+            self.after(0, lambda: self._show_image_error(img_label, "[Gambar Gagal Dimuat]"))
 
-            # print(f"ClaimItemFrame: Image successfully downloaded from URL: {image_url}") # Debugging print
+    def _show_image_error(self, img_label, text):
+        """Menampilkan pesan error di label gambar (dijalankan di thread utama)."""
+        try:
+            if img_label.winfo_exists():
+                img_label.config(text=text, fg="red", image='')
+        except Exception as e_check:
+            logger.error("ClaimItemFrame: Error checking winfo_exists() in image error handler: %s", e_check)
 
-        except requests.exceptions.RequestException as e:
-            print(f"ClaimItemFrame: Failed to download image from URL {image_url}: {e}")
-            try:
-                if img_label.winfo_exists():
-                    self.after(0, lambda: img_label.config(text="[Gambar Gagal Dimuat (Unduh Error)]", fg="red", image='')) # Update label di thread utama
-            except Exception as e_check:
-                 print(f"ClaimItemFrame: Error checking winfo_exists() in image error handler: {e_check}")
-        except Exception as e:
-            print(f"ClaimItemFrame: Failed to display image from URL {image_url}: {e}")
-            try:
-                if img_label.winfo_exists():
-                    self.after(0, lambda: img_label.config(text="[Gambar Gagal Dimuat]", fg="red", image='')) # Update label di thread utama
-            except Exception as e_check:
-                 print(f"ClaimItemFrame: Error checking winfo_exists() in image generic error handler: {e_check}")
-
-    def update_image_label(self, img_label, photo_img, item_images_canvas):
+    def update_image_label(self, img_label, image, item_images_canvas):
         """
         Memperbarui widget Label gambar dengan gambar yang dimuat.
         Dijalankan di thread utama menggunakan after().
@@ -241,6 +237,7 @@ class ClaimItemFrame(BaseFrame):
         # --- Add check if img_label is still valid ---
         try:
             if img_label.winfo_exists(): # Check if the widget still exists
+                photo_img = ImageTk.PhotoImage(image) # PhotoImage dibuat di thread utama
                 img_label.config(image=photo_img, text='') # Hapus teks "Memuat gambar..."
                 self.item_image_refs.append(photo_img) # Simpan referensi gambar item
                 # Update scrollregion canvas gambar horizontal setelah gambar ditambahkan
@@ -250,12 +247,12 @@ class ClaimItemFrame(BaseFrame):
                     item_images_canvas.config(scrollregion=item_images_canvas.bbox("all"))
                     # print("ClaimItemFrame: Canvas scrollregion updated.") # Debugging print
                 else:
-                    print("ClaimItemFrame: Received invalid object instead of Canvas in update_image_label.") # Should not happen if passed correctly
+                    logger.warning("ClaimItemFrame: Received invalid object instead of Canvas in update_image_label.") # Should not happen if passed correctly
 
             else:
-                print("ClaimItemFrame: GUI label for image no longer exists during update, skipping.")
+                logger.warning("ClaimItemFrame: GUI label for image no longer exists during update, skipping.")
         except Exception as e:
-             print(f"ClaimItemFrame: Error checking winfo_exists() or updating scrollregion in update_image_label: {e}")
+             logger.error("ClaimItemFrame: Error checking winfo_exists() or updating scrollregion in update_image_label: %s", e)
 
 
     def select_claim_images(self):
@@ -266,13 +263,18 @@ class ClaimItemFrame(BaseFrame):
         )
         if file_paths:
             self.image_paths = list(file_paths) # Simpan jalur file bukti klaim
+            self.upload_batch = None # Pilihan baru, unggah dari awal
+            self.upload_progress.clear()
             self.label_claim_image_count.config(text=f"{len(self.image_paths)} file dipilih")
-            print(f"Selected claim image files: {self.image_paths}") # Debugging print
+            logger.debug("Selected claim image files: %s", self.image_paths)
 
 
     def handle_submit_claim(self):
-        """Menangani aksi saat tombol Ajukan Klaim diklik."""
-        print(f"ClaimItemFrame: handle_submit_claim called. self.item_id: {self.item_id}, self.item_data is None: {self.item_data is None}") # DEBUG PRINT
+        """
+        Menangani aksi saat tombol Ajukan Klaim diklik.
+        Gambar bukti diunggah paralel di latar belakang (UploadManager); klaim disimpan setelah unggah selesai.
+        """
+        logger.debug("ClaimItemFrame: handle_submit_claim called. self.item_id: %s, self.item_data is None: %s", self.item_id, self.item_data is None)
         claim_details = self.text_claim_details.get("1.0", tk.END).strip()
 
         if not claim_details:
@@ -294,55 +296,100 @@ class ClaimItemFrame(BaseFrame):
             self.main_app.show_login_frame() # Kembali ke login
             return
 
+        claim_data = {
+            'item_id': self.item_id,
+            'claimed_by_user_id': claimed_by_user_id,
+            'claim_details': claim_details
+        }
+
+        self.button_submit_claim.config(state=tk.DISABLED) # Cegah klaim ganda selama proses berjalan
+
+        if not self.image_paths:
+            self._submit_claim(claim_data, [])
+            return
+
         # --- Implementasi Unggah Gambar Bukti Klaim ---
-        claim_image_urls = []
-        upload_errors = False
-
-        if self.image_paths:
-             print(f"Attempting to upload {len(self.image_paths)} claim images...")
-             # Anda mungkin perlu menjalankan proses upload di thread terpisah
-             # jika unggah memakan waktu lama agar GUI tidak freeze.
-             # Untuk saat ini, kita lakukan secara sinkron.
-
-             for i, path in enumerate(self.image_paths):
-                 try:
-                     # Buat nama file unik di storage, misal: claims/userid_itemid_timestamp_index.ext
-                     username = self.main_app.user_data.get('Username', 'unknown_user')
-                     file_ext = os.path.splitext(path)[1] # Ambil ekstensi file
-                     timestamp = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
-                     # Menggunakan username + item_id + timestamp + index untuk keunikan
-                     uploaded_file_name = f"claims/{username}_{self.item_id}_{timestamp}_{i}{file_ext}"
-
-                     print(f"Uploading claim file {i+1}/{len(self.image_paths)}: {os.path.basename(path)} as '{uploaded_file_name}'...")
-                     # Anda bisa menambahkan opsi folder di sini jika perlu, misal options={"folder": "/claims/"}
-                     upload_response = upload_image(path, uploaded_file_name)
-
-                     if upload_response and hasattr(upload_response, 'url'):
-                         claim_image_urls.append(upload_response.url)
-                         print(f"Upload successful. URL: {upload_response.url}")
-                     else:
-                         print(f"Failed to upload claim image '{os.path.basename(path)}'. Response: {upload_response}")
-                         upload_errors = True # Tandai ada error unggah
-                         # Lanjutkan ke gambar berikutnya meskipun ada satu yang gagal
-                 except Exception as e:
-                     print(f"An error occurred during claim image upload of '{os.path.basename(path)}': {e}")
-                     upload_errors = True
-                     # Lanjutkan ke gambar berikutnya
-
-             if upload_errors:
-                 messagebox.showwarning("Unggah Gambar Bukti Gagal", "Beberapa gambar bukti klaim gagal diunggah. Klaim akan diajukan tanpa gambar tersebut.")
+        # Batch dibuat sekali per pilihan gambar. Jika klaim dikirim ulang setelah sebagian
+        # gambar gagal, hanya gambar yang gagal yang diunggah lagi.
+        if self.upload_batch is None:
+            # Buat nama file unik di storage, misal: claims/userid_itemid_timestamp_index.ext
+            username = self.main_app.user_data.get('Username', 'unknown_user')
+            timestamp = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
+            jobs = []
+            for i, path in enumerate(self.image_paths):
+                file_ext = os.path.splitext(path)[1] # Ambil ekstensi file
+                # Menggunakan username + item_id + timestamp + index untuk keunikan
+                uploaded_file_name = f"claims/{username}_{self.item_id}_{timestamp}_{i}{file_ext}"
+                jobs.append(UploadJob(path, uploaded_file_name))
+            self.upload_batch = UploadBatch(jobs)
+            self.upload_progress.set_batch(self.upload_batch)
+
+        self._start_upload(claim_data)
+
+    def _start_upload(self, claim_data):
+        """Mengunggah gambar bukti yang belum berhasil diunggah di batch saat ini."""
+        batch = self.upload_batch
+        logger.debug("Attempting to upload %s claim images...", len(batch.jobs) - len(batch.urls))
+        get_upload_manager().upload(
+            batch,
+            on_progress=lambda job: self.after(0, self.upload_progress.update_job, job), # Update label di thread utama
+            on_complete=lambda b: self.after(0, self._on_uploads_finished, b, claim_data)
+        )
+
+    def _on_uploads_finished(self, batch, claim_data):
+        """Dipanggil di thread utama setelah semua unggahan dalam satu putaran selesai."""
+        if batch is not self.upload_batch:
+            # Form sudah dibuat ulang atau pilihan gambar diganti selama unggah berlangsung. Tombol
+            # diaktifkan lagi, kecuali unggahan untuk pilihan baru sudah berjalan.
+            if self.upload_batch is None:
+                self._on_submit_done()
+            return
+
+        failed_jobs = batch.failed_jobs
+        if failed_jobs:
+            answer = messagebox.askyesnocancel(
+                "Unggah Gambar Bukti Gagal",
+                f"{len(failed_jobs)} dari {len(batch.jobs)} gambar bukti klaim gagal diunggah.\n\n"
+                "Ya: coba unggah ulang gambar yang gagal saja\n"
+                "Tidak: ajukan klaim tanpa gambar tersebut\n"
+                "Batal: kembali ke form"
+            )
+            if answer is None:
+                self.button_submit_claim.config(state=tk.NORMAL) # Gambar yang sudah berhasil tetap disimpan di batch
+                return
+            if answer:
+                self._start_upload(claim_data)
+                return
         # --- Akhir Implementasi Unggah Gambar Bukti Klaim ---
 
+        self._submit_claim(claim_data, batch.urls)
 
+    def _submit_claim(self, claim_data, claim_image_urls):
+        """Menyimpan klaim ke database di latar belakang."""
         # Panggil fungsi DAO untuk menambahkan klaim ke database
         # Teruskan list claim_image_urls yang sudah diisi (mungkin kosong jika tidak ada gambar atau unggah gagal)
-        new_claim_id = add_claim(self.item_id, claimed_by_user_id, claim_details, claim_image_urls)
+        self.run_in_background(
+            add_claim,
+            claim_data['item_id'], claim_data['claimed_by_user_id'], claim_data['claim_details'], claim_image_urls,
+            on_success=self._on_claim_added,
+            on_done=self._on_submit_done,
+            key="add_claim",
+            loading_text="Mengajukan klaim..."
+        )
+
+    def _on_submit_done(self):
+        if self.button_submit_claim is not None and self.button_submit_claim.winfo_exists():
+            self.button_submit_claim.config(state=tk.NORMAL)
 
+    def _on_claim_added(self, new_claim_id):
+        """Callback _submit_claim (thread utama)."""
         if new_claim_id:
             messagebox.showinfo("Sukses", "Klaim berhasil diajukan! Mohon tunggu verifikasi oleh admin.")
             # Bersihkan form setelah sukses
             self.text_claim_details.delete("1.0", tk.END)
             self.image_paths = [] # Bersihkan list jalur file lokal bukti klaim
+            self.upload_batch = None
+            self.upload_progress.clear()
             self.label_claim_image_count.config(text="0 file dipilih") # Update label jumlah file
             self.item_id = None # Reset item_id setelah klaim diajukan
             self.item_data = None # Reset item_data
@@ -353,20 +400,20 @@ class ClaimItemFrame(BaseFrame):
             # add_claim sudah menampilkan error database di konsol
             # Tampilkan pesan umum di GUI jika add_claim mengembalikan None
             messagebox.showwarning("Gagal", "Gagal mengajukan klaim. Mohon coba lagi.")
-            # Tetap di halaman klaim agar user bisa coba lagi
+            # Tetap di halaman klaim agar user bisa coba lagi (gambar yang sudah terunggah tidak diunggah ulang)
 
     def show(self):
         """
         Menampilkan frame ini, memuat data item, dan membuat widget.
         """
-        print("ClaimItemFrame: show called.") # Debugging print
+        logger.debug("ClaimItemFrame: show called.")
         # Pastikan item_id sudah diatur oleh MainApp sebelum memuat data dan membuat widget
         if self.item_id is not None:
             self.load_item_data() # Muat data item berdasarkan self.item_id
             self.create_widgets() # Buat ulang widget berdasarkan item_data yang dimuat
         else:
             # Jika show dipanggil tanpa item_id diatur (kasus error navigasi)
-            print("ClaimItemFrame: show called but self.item_id is None. Displaying error message.") # Debugging print
+            logger.error("ClaimItemFrame: show called but self.item_id is None. Displaying error message.")
             self.item_data = None # Pastikan item_data None
             self.create_widgets() # Buat widget (akan menampilkan pesan error)
 
@@ -376,8 +423,10 @@ class ClaimItemFrame(BaseFrame):
         """
         Menyembunyikan frame ini.
         """
-        print("ClaimItemFrame: hide called.") # DEBUGGING PRINT: Confirm hide is called
+        logger.debug("ClaimItemFrame: hide called.")
         super().hide()
+        # Batalkan unduhan gambar item yang belum selesai
+        get_image_loader().cancel_group(self)
         # Opsional: Bersihkan data dan tampilan saat frame disembunyikan
         # self.item_id = None # Reset item_id saat disembunyikan
         # self.item_data = None
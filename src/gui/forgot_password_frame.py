@@ -5,8 +5,8 @@ from tkinter import messagebox
 from .base_frame import BaseFrame # Mengimpor BaseFrame
 # Mengimpor fungsi dari DAO untuk request reset password
 from src.database.auth_dao import request_password_reset
-# Mengimpor fungsi untuk mengirim email
-from src.utils.email_utils import send_email, get_reset_password_email_body # Mengimpor template body email reset password
+# Membangunkan worker email setelah email reset dimasukkan ke EmailOutbox
+from src.utils.email_worker import wake_email_worker
 
 class ForgotPasswordFrame(BaseFrame):
     """
@@ -41,7 +41,8 @@ class ForgotPasswordFrame(BaseFrame):
         self.entry_username_email.grid(row=0, column=1, pady=5, padx=5)
 
         # Tombol Kirim Permintaan Reset
-        tk.Button(self, text="Kirim Permintaan Reset", command=self.handle_request_reset, width=30).pack(pady=10)
+        self.button_request = tk.Button(self, text="Kirim Permintaan Reset", command=self.handle_request_reset, width=30)
+        self.button_request.pack(pady=10)
 
         # Link kembali ke login
         tk.Button(self, text="Kembali ke Login", command=self.main_app.show_login_frame, relief=tk.FLAT, fg="blue", cursor="hand2").pack(pady=(10, 0))
@@ -55,33 +56,39 @@ class ForgotPasswordFrame(BaseFrame):
             return
 
         # Panggil fungsi DAO untuk memproses permintaan reset password
-        # Fungsi ini akan mencari user, membuat token, dan menyimpannya di DB.
-        user_id, reset_token, user_email = request_password_reset(username_or_email)
+        # Fungsi ini akan mencari user, membuat token, dan menyimpannya di DB bersama
+        # email instruksi reset di EmailOutbox (dikirim oleh worker email di latar belakang).
+        # Query database berjalan di latar belakang agar GUI tidak freeze
+        self.button_request.config(state=tk.DISABLED) # Cegah klik ganda selama permintaan diproses
+        self.run_in_background(
+            request_password_reset, username_or_email,
+            on_success=self._on_request_reset_result,
+            on_done=self._on_request_reset_done,
+            key="handle_request_reset",
+            loading_text="Memproses permintaan..."
+        )
+
+    def _on_request_reset_done(self):
+        """Mengaktifkan kembali tombol Kirim Permintaan Reset setelah proses selesai."""
+        if self.button_request.winfo_exists():
+            self.button_request.config(state=tk.NORMAL)
+
+    def _on_request_reset_result(self, result):
+        """
+        Callback handle_request_reset (thread utama): menampilkan hasil permintaan reset.
+
+        Args:
+            result (tuple): (user_id, reset_token, user_email) dari request_password_reset.
+        """
+        user_id, reset_token, user_email = result
 
         if user_id and reset_token and user_email:
             # Permintaan reset berhasil diproses di DB
-            # Sekarang kirim email ke pengguna
-
-            subject = "Instruksi Reset Password Akun CLFS Anda"
-            # Gunakan template body email reset password yang baru
-            # Pastikan get_reset_password_email_body menerima user_email atau user_full_name
-            # Untuk demo, kita pakai email sebagai nama di template
-            body = get_reset_password_email_body(user_email, reset_token, 30)
-
-
-            # Kirim email (ini mungkin memakan waktu, pertimbangkan threading di aplikasi nyata)
-            email_sent_success = send_email(user_email, subject, body)
-
-            if email_sent_success:
-                messagebox.showinfo("Permintaan Terkirim", f"Jika Username atau Email Anda terdaftar, instruksi reset password telah dikirim ke alamat email yang terkait dengan akun Anda ({user_email}). Silakan cek email Anda dan masukkan kode token di halaman Reset Password.")
-                # Arahkan langsung ke halaman Reset Password dan isi tokennya
-                self.main_app.show_reset_password_frame(reset_token) # Teruskan token ke MainApp
-            else:
-                # Email gagal dikirim - perlu penanganan lebih lanjut
-                # Token sudah terbuat di DB, tapi email tidak sampai.
-                messagebox.showwarning("Permintaan Diproses (Email Gagal)", f"Permintaan reset password Anda telah diproses, tetapi gagal mengirim instruksi ke email {user_email}. Mohon hubungi admin atau coba lagi nanti.")
-                # Tetap di halaman lupa password atau kembali ke login
-                # self.main_app.show_login_frame() # Kembali ke login
+            wake_email_worker() # Kirim secepatnya tanpa menunggu interval polling worker
+
+            messagebox.showinfo("Permintaan Terkirim", f"Jika Username atau Email Anda terdaftar, instruksi reset password sedang dikirim ke alamat email yang terkait dengan akun Anda ({user_email}). Silakan cek email Anda dan masukkan kode token di halaman Reset Password.")
+            # Arahkan langsung ke halaman Reset Password dan isi tokennya
+            self.main_app.show_reset_password_frame(reset_token) # Teruskan token ke MainApp
 
         else:
             # Pengguna tidak ditemukan atau error database saat request_password_reset
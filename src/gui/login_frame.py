@@ -46,7 +46,8 @@ class LoginFrame(BaseFrame):
         self.entry_password.grid(row=1, column=1, pady=5, padx=5)
 
         # Tombol Login
-        tk.Button(self, text="Login", command=self.handle_login, width=30).pack(pady=10)
+        self.button_login = tk.Button(self, text="Login", command=self.handle_login, width=30)
+        self.button_login.pack(pady=10)
 
         # Link ke halaman registrasi
         tk.Label(self, text="Belum punya akun?").pack(pady=(10, 0))
@@ -60,7 +61,7 @@ class LoginFrame(BaseFrame):
     def handle_login(self):
         """
         Menangani aksi saat tombol 'Login' diklik.
-        Mengambil input, melakukan validasi, memanggil DAO untuk autentikasi.
+        Mengambil input, melakukan validasi, memanggil DAO untuk autentikasi di latar belakang.
         """
         username = self.entry_username.get().strip() # Ambil teks dari entry, hapus spasi di awal/akhir
         password = self.entry_password.get() # Ambil password ASLI
@@ -73,8 +74,29 @@ class LoginFrame(BaseFrame):
         # Panggil fungsi autentikasi dari Data Access Object (DAO)
         # authenticate_user akan berinteraksi dengan tabel Users di database
         # KIRIM PASSWORD ASLI ke authenticate_user
-        user_data = authenticate_user(username, password)
+        # Query database dan verifikasi bcrypt berjalan di thread worker agar GUI tidak freeze
+        self.button_login.config(state=tk.DISABLED) # Cegah klik ganda selama proses login
+        self.run_in_background(
+            authenticate_user, username, password,
+            on_success=lambda user_data: self._on_login_result(username, user_data),
+            on_done=self._on_login_done,
+            key="handle_login",
+            loading_text="Memproses login..."
+        )
+
+    def _on_login_done(self):
+        """Mengaktifkan kembali tombol Login setelah proses login selesai."""
+        if self.button_login.winfo_exists():
+            self.button_login.config(state=tk.NORMAL)
+
+    def _on_login_result(self, username, user_data):
+        """
+        Callback handle_login (thread utama): menampilkan hasil autentikasi dan berpindah frame.
 
+        Args:
+            username (str): Username yang dimasukkan.
+            user_data (dict): Hasil authenticate_user, atau None jika gagal.
+        """
         if user_data:
             # Jika autentikasi berhasil (user_data tidak None)
             if user_data.get('IsActive'): # Pastikan akun pengguna aktif (email sudah diverifikasi)
@@ -4,8 +4,12 @@ import tkinter as tk
 from tkinter import ttk # Menggunakan ttk untuk widget seperti Frame atau Button
 from tkinter import messagebox
 from .base_frame import BaseFrame # Mengimpor BaseFrame
-# Mengimpor fungsi DAO untuk mengambil jumlah notifikasi belum dibaca
-from src.database.notification_dao import get_unread_notifications_count # Import fungsi baru
+# Mengimpor fungsi DAO untuk mengambil jumlah notifikasi belum dibaca dan versinya
+from src.database.notification_dao import get_notification_state
+from src.config import NOTIFICATION_POLL_CONFIG
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 class MainAppFrame(BaseFrame):
     """
@@ -31,6 +35,9 @@ class MainAppFrame(BaseFrame):
         # Variabel untuk menyimpan jumlah notifikasi belum dibaca
         self.unread_notifications_count = 0
         # Label atau teks tombol notifikasi akan diupdate secara berkala
+        self._notification_version = None # Versi NotificationState terakhir yang ditampilkan
+        self._poll_after_id = None # ID after() untuk pengecekan berikutnya
+        self._polling = False
 
         # create_widgets TIDAK dipanggil di sini lagi
         # self.create_widgets() # <--- HAPUS BARIS INI
@@ -106,7 +113,7 @@ class MainAppFrame(BaseFrame):
         Mengatur data pengguna yang login dan memperbarui tampilan.
         Dipanggil oleh MainApp setelah login berhasil.
         """
-        print(f"MainAppFrame: set_user_data called with user_data: {user_data}") # DEBUG PRINT
+        logger.debug("MainAppFrame: set_user_data called with user_data: %s", user_data)
         self.user_data = user_data
         if self.user_data:
             # TODO: Ambil FullName, RoleName, NIM_NIP dari user_data jika sudah ditambahkan di MainApp
@@ -160,61 +167,95 @@ class MainAppFrame(BaseFrame):
         Menangani aksi saat tombol 'Logout' diklik.
         Mereset data pengguna dan kembali ke halaman login.
         """
-        print("User logged out.") # Debugging print
+        logger.debug("User logged out.")
         self.user_data = None # Bersihkan data pengguna yang login
         messagebox.showinfo("Logout Sukses", "Anda telah berhasil logout.")
         self.main_app.show_login_frame() # Kembali ke halaman login
 
     def update_notification_count(self):
         """
-        Mengambil jumlah notifikasi belum dibaca dan memperbarui teks tombol Notifikasi.
+        Mengecek NotificationState pengguna (di latar belakang) dan memperbarui teks tombol Notifikasi
+        jika versinya berubah. Selama frame tampil, pengecekan dijadwalkan ulang setiap
+        NOTIFICATION_POLL_CONFIG['interval_ms']; setiap pengecekan hanya membaca satu baris lewat primary key.
         """
+        self._poll_after_id = None
         logged_in_user_id = self.user_data.get('UserID') if self.user_data else None
 
         if logged_in_user_id is not None:
-            # Panggil fungsi DAO untuk mendapatkan jumlah notifikasi belum dibaca
-            count = get_unread_notifications_count(logged_in_user_id)
-            self.unread_notifications_count = count # Simpan jumlahnya
+            self.run_in_background(
+                get_notification_state, logged_in_user_id,
+                on_success=self._on_notification_state_loaded,
+                on_error=lambda e: logger.warning("Failed to update notification count: %s", e), # Tidak perlu mengganggu pengguna
+                on_done=self._schedule_notification_poll,
+                key="update_notification_count",
+                loading_text=None # Tombol tetap bisa dipakai selama jumlah notifikasi dimuat
+            )
+
+        else:
+            # Jika user_data tidak ada (seharusnya tidak terjadi di frame ini setelah login)
+            self.button_notifications.config(text="Notifikasi", font=('Arial', 10, 'normal'))
+            self.unread_notifications_count = 0
+            logger.warning("User data not available, cannot update notification count.")
+
 
-            # Perbarui teks tombol notifikasi
-            if count > 0:
-                self.button_notifications.config(text=f"Notifikasi ({count})", font=('Arial', 10, 'bold')) # Teks tebal jika ada notifikasi
-            else:
-                self.button_notifications.config(text="Notifikasi", font=('Arial', 10, 'normal')) # Teks normal jika tidak ada
+    def _schedule_notification_poll(self):
+        """Menjadwalkan pengecekan berikutnya setelah pengecekan sebelumnya selesai (tidak pernah tumpang tindih)."""
+        if self._polling and self._poll_after_id is None:
+            self._poll_after_id = self.after(NOTIFICATION_POLL_CONFIG['interval_ms'], self.update_notification_count)
 
-            print(f"Notification count updated: {count} unread.") # Debugging print
 
-            # Opsional: Jadwalkan pembaruan berikutnya (misal setiap 60 detik)
-            # self._after_id = self.after(60000, self.update_notification_count) # Update setiap 60000 ms (60 detik)
-            # Simpan ID agar bisa dibatalkan di hide()
+    def _stop_notification_poll(self):
+        self._polling = False
+        if self._poll_after_id is not None:
+            self.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
 
 
+    def _on_notification_state_loaded(self, state):
+        """Callback update_notification_count (thread utama): memperbarui tombol Notifikasi jika versinya berubah."""
+        if state is None or state['Version'] == self._notification_version:
+            return # Error (sudah dicatat DAO) atau tidak ada perubahan
+        self._notification_version = state['Version']
+        self._on_notification_count_loaded(state['UnreadCount'])
+
+
+    def _on_notification_count_loaded(self, count):
+        """Memperbarui teks tombol Notifikasi."""
+        count = count or 0
+        self.unread_notifications_count = count # Simpan jumlahnya
+        if not self.button_notifications.winfo_exists():
+            return
+
+        # Perbarui teks tombol notifikasi
+        if count > 0:
+            self.button_notifications.config(text=f"Notifikasi ({count})", font=('Arial', 10, 'bold')) # Teks tebal jika ada notifikasi
         else:
-            # Jika user_data tidak ada (seharusnya tidak terjadi di frame ini setelah login)
-            self.button_notifications.config(text="Notifikasi", font=('Arial', 10, 'normal'))
-            self.unread_notifications_count = 0
-            print("User data not available, cannot update notification count.") # Debugging print
+            self.button_notifications.config(text="Notifikasi", font=('Arial', 10, 'normal')) # Teks normal jika tidak ada
+
+        logger.debug("Notification count updated: %s unread.", count)
 
 
     def show(self):
         """Menampilkan frame ini."""
-        print("MainAppFrame: show called.") # Debugging print
+        logger.debug("MainAppFrame: show called.")
         super().show() # Panggil metode show dari BaseFrame (pack frame)
         # Panggil create_widgets di sini untuk memastikan UI dibuat/diperbarui saat frame ditampilkan
         self.create_widgets()
         # Panggil set_user_data *setelah* create_widgets selesai
         # self.main_app.user_data sudah diset di show_main_app_frame sebelum show() dipanggil
         self.set_user_data(self.main_app.user_data) # PANGGIL DI SINI
-        # Perbarui jumlah notifikasi setiap kali frame ini ditampilkan
+        # Perbarui jumlah notifikasi setiap kali frame ini ditampilkan, lalu cek perubahan secara berkala
+        # (tombol dibuat ulang oleh create_widgets, jadi versi terakhir direset agar teksnya selalu diisi)
+        self._stop_notification_poll()
+        self._notification_version = None
+        self._polling = True
         self.update_notification_count()
 
 
     def hide(self):
         """Menyembunyikan frame ini."""
-        print("MainAppFrame: hide called.") # Debugging print
+        logger.debug("MainAppFrame: hide called.")
         super().hide()
-        # Batalkan penjadwalan update notifikasi jika ada
-        # if hasattr(self, '_after_id') and self._after_id is not None:
-        #     self.after_cancel(self._after_id)
-        #     self._after_id = None # Reset ID setelah dibatalkan
+        # Batalkan penjadwalan update notifikasi
+        self._stop_notification_poll()
 
@@ -7,6 +7,9 @@ from .base_frame import BaseFrame # Mengimpor BaseFrame
 # Mengimpor fungsi DAO untuk mengambil klaim pengguna
 from src.database.claim_dao import get_claims_by_user_id
 import datetime # Untuk memformat tanggal
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 class MyClaimsFrame(BaseFrame):
     """
@@ -67,9 +70,9 @@ class MyClaimsFrame(BaseFrame):
             self.main_app.show_login_frame() # Kembali ke login
             return
 
-        print(f"Attempting to load claims for UserID: {logged_in_user_id}") # Debugging print
+        logger.debug("Attempting to load claims for UserID: %s", logged_in_user_id)
         self.user_claims = get_claims_by_user_id(logged_in_user_id)
-        print(f"Loaded {len(self.user_claims)} claims for UserID: {logged_in_user_id}") # Debugging print
+        logger.debug("Loaded %s claims for UserID: %s", len(self.user_claims), logged_in_user_id)
 
 
     def display_claims(self):
@@ -84,7 +87,7 @@ class MyClaimsFrame(BaseFrame):
             # Tampilkan pesan jika tidak ada klaim
             # Bisa tambahkan label di bawah Treeview atau di dalam Treeview jika kosong
             # Treeview sudah menampilkan area kosong jika tidak ada data
-            print("No claims to display.") # Debugging print
+            logger.debug("No claims to display.")
             pass # Tidak perlu menampilkan pesan "Tidak ada klaim" di Treeview itu sendiri
 
         else:
@@ -97,14 +100,14 @@ class MyClaimsFrame(BaseFrame):
                 verification_status = claim.get('VerificationStatus', 'Status Tidak Diketahui')
 
                 self.claims_tree.insert("", tk.END, values=(item_name, claim_date_str, verification_status))
-            print("Claims displayed in Treeview.") # Debugging print
+            logger.debug("Claims displayed in Treeview.")
 
 
     def show(self):
         """
         Menampilkan frame ini dan me-refresh daftar klaim.
         """
-        print("MyClaimsFrame: show called.") # Debugging print
+        logger.debug("MyClaimsFrame: show called.")
         super().show() # Panggil metode show dari BaseFrame (pack frame)
         # Muat data klaim dan tampilkan setiap kali frame ini ditunjukkan
         self.load_claims_data()
@@ -114,7 +117,7 @@ class MyClaimsFrame(BaseFrame):
         """
         Menyembunyikan frame ini.
         """
-        print("MyClaimsFrame: hide called.") # Debugging print
+        logger.debug("MyClaimsFrame: hide called.")
         super().hide()
         # Opsional: Bersihkan data klaim saat frame disembunyikan untuk menghemat memori
         self.user_claims = []
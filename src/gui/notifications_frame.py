@@ -5,13 +5,22 @@ from tkinter import ttk # Menggunakan ttk untuk widget seperti Treeview
 from tkinter import messagebox
 from .base_frame import BaseFrame # Mengimpor BaseFrame
 # Mengimpor fungsi DAO untuk mengambil notifikasi dan menandainya sebagai sudah dibaca
-from src.database.notification_dao import get_notifications_by_user, mark_notification_as_read
+from src.database.notification_dao import get_notifications_page, mark_notifications_read, mark_all_read
 import datetime # Untuk memformat tanggal
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 class NotificationsFrame(BaseFrame):
     """
     Frame untuk menampilkan daftar notifikasi untuk pengguna yang sedang login.
+    Notifikasi dimuat per halaman (keyset pagination); halaman berikutnya dimuat saat
+    daftar di-scroll mendekati bawah atau lewat tombol "Muat lebih banyak".
     """
+    PAGE_SIZE = 50 # Jumlah notifikasi per halaman
+    LOAD_MORE_THRESHOLD = 0.9 # Muat halaman berikutnya jika bagian bawah tampilan melewati 90% daftar
+    READ_RECEIPT_FLUSH_MS = 3000 # Tanda "sudah dibaca" dikumpulkan lalu ditulis dengan satu UPDATE setiap 3 detik
+
     def __init__(self, parent, main_app):
         """
         Inisialisasi NotificationsFrame.
@@ -21,7 +30,14 @@ class NotificationsFrame(BaseFrame):
             main_app: Referensi ke instance kelas MainApp.
         """
         super().__init__(parent, main_app)
-        self.notifications_list = [] # Untuk menyimpan data notifikasi pengguna
+        self.notifications_list = [] # Untuk menyimpan data notifikasi pengguna (halaman yang sudah dimuat)
+        self.notifications_by_id = {} # NotificationID -> data notifikasi
+        self.next_cursor = None # Cursor (SentAt, NotificationID) untuk halaman berikutnya, None jika sudah habis
+        self.loading_more = False
+        # Buffer tanda-baca: NotificationID yang sudah ditandai dibaca di layar tapi belum ditulis ke database
+        self._pending_reads = set()
+        self._pending_reads_user_id = None
+        self._flush_after_id = None
 
         # Frame untuk menampung konten utama
         self.content_frame = tk.Frame(self)
@@ -56,12 +72,23 @@ class NotificationsFrame(BaseFrame):
 
         # Tambahkan Scrollbar untuk Treeview
         self.scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=self.notifications_tree.yview)
-        self.notifications_tree.configure(yscrollcommand=self.scrollbar.set)
+        self.notifications_tree.configure(yscrollcommand=self._on_tree_yview)
         self.scrollbar.pack(side="right", fill="y")
 
         # Bind event saat baris di Treeview dipilih
         self.notifications_tree.bind("<<TreeviewSelect>>", self.on_notification_select)
 
+        # Konfigurasi tag untuk styling
+        self.notifications_tree.tag_configure('unread', font=('Arial', 10, 'bold')) # Teks tebal untuk belum dibaca
+        self.notifications_tree.tag_configure('read', font=('Arial', 10, 'normal')) # Teks normal untuk sudah dibaca
+
+        # Tombol untuk memuat halaman notifikasi berikutnya (juga dimuat otomatis saat scroll ke bawah)
+        self.button_load_more = tk.Button(self.content_frame, text="Muat lebih banyak", command=self.load_next_page, state=tk.DISABLED)
+        self.button_load_more.pack(pady=(10, 0))
+
+        # Tombol untuk menandai semua notifikasi (sampai yang terbaru di layar) sebagai sudah dibaca
+        tk.Button(self.content_frame, text="Tandai semua sudah dibaca", command=self.handle_mark_all_read).pack(pady=(10, 0))
+
         # Link kembali ke halaman utama
         # Menggunakan lambda untuk meneruskan user_data saat tombol diklik
         tk.Button(self.content_frame, text="Kembali ke Halaman Utama", command=lambda: self.main_app.show_main_app_frame(self.main_app.user_data), relief=tk.FLAT, fg="blue", cursor="hand2").pack(pady=(10, 10))
@@ -69,65 +96,137 @@ class NotificationsFrame(BaseFrame):
 
     def load_notifications_data(self):
         """
-        Mengambil data notifikasi dari DAO untuk pengguna yang sedang login.
+        Mengambil halaman pertama notifikasi dari DAO untuk pengguna yang sedang login, di latar belakang.
+        Treeview diisi ulang (display_notifications) setelah data tiba.
         """
         logged_in_user_id = self.main_app.user_data.get('UserID') if self.main_app.user_data else None
 
         if logged_in_user_id is None:
             messagebox.showwarning("Error", "Data pengguna tidak tersedia. Silakan login kembali.")
             self.notifications_list = [] # Kosongkan data notifikasi
+            self.notifications_by_id = {}
+            self.next_cursor = None
             self.main_app.show_login_frame() # Kembali ke login
             return
 
-        print(f"Attempting to load notifications for UserID: {logged_in_user_id}") # Debugging print
-        # Ambil semua notifikasi (termasuk yang sudah dibaca)
-        self.notifications_list = get_notifications_by_user(logged_in_user_id, include_read=True)
-        print(f"Loaded {len(self.notifications_list)} notifications for UserID: {logged_in_user_id}") # Debugging print
+        logger.debug("Attempting to load notifications for UserID: %s", logged_in_user_id)
+        # Ambil halaman pertama (termasuk yang sudah dibaca dan yang sudah diarsipkan)
+        self.run_in_background(
+            get_notifications_page, logged_in_user_id, self.PAGE_SIZE, include_archived=True,
+            on_success=self._on_notifications_loaded,
+            key="load_notifications_data",
+            loading_text="Memuat notifikasi..."
+        )
+
+
+    def _on_notifications_loaded(self, page):
+        """Callback load_notifications_data (thread utama): menyimpan dan menampilkan halaman pertama."""
+        notifications, self.next_cursor = page
+        self.notifications_list = notifications or []
+        self.notifications_by_id = {notification['NotificationID']: notification for notification in self.notifications_list}
+        logger.debug("Loaded %s notifications, has more: %s", len(self.notifications_list), self.next_cursor is not None)
+        self.display_notifications()
 
 
-    def display_notifications(self):
+    def load_next_page(self):
         """
-        Menampilkan data notifikasi di Treeview.
+        Memuat halaman notifikasi berikutnya di latar belakang dan menambahkannya di bawah daftar.
+        Tidak melakukan apa-apa jika halaman sedang dimuat, sudah habis, atau frame tidak tampil.
         """
-        # Hapus data lama dari Treeview
-        for item in self.notifications_tree.get_children():
-            self.notifications_tree.delete(item)
+        logged_in_user_id = self.main_app.user_data.get('UserID') if self.main_app.user_data else None
+        if self.loading_more or self.next_cursor is None or logged_in_user_id is None or not self.winfo_ismapped():
+            return
+
+        self.loading_more = True
+        self.button_load_more.config(text="Memuat...", state=tk.DISABLED)
+        self.run_in_background(
+            get_notifications_page, logged_in_user_id, self.PAGE_SIZE, self.next_cursor, include_archived=True,
+            on_success=self._on_next_page_loaded,
+            on_done=self._on_next_page_done,
+            key="load_next_page",
+            loading_text=None # Tombol "Muat lebih banyak" sudah menjadi indikator loading
+        )
+
+
+    def _on_next_page_loaded(self, page):
+        """Callback load_next_page (thread utama): menambahkan notifikasi halaman berikutnya."""
+        new_notifications, self.next_cursor = page
+        logger.debug("Loaded next page: %s notifications, has more: %s", len(new_notifications), self.next_cursor is not None)
+        for notification in new_notifications:
+            if notification['NotificationID'] in self.notifications_by_id:
+                continue # Sudah tampil (misal halaman pertama dimuat ulang di antaranya)
+            self.notifications_list.append(notification)
+            self.notifications_by_id[notification['NotificationID']] = notification
+            self._insert_notification_row(notification)
 
-        if not self.notifications_list:
-            # Tampilkan pesan jika tidak ada notifikasi
-            print("No notifications to display.") # Debugging print
-            # Anda bisa tambahkan label di bawah Treeview atau di dalam Treeview jika kosong
-            # Treeview sudah menampilkan area kosong jika tidak ada data
-            pass
 
+    def _on_next_page_done(self):
+        """Dipanggil setelah load_next_page selesai, berhasil atau tidak."""
+        self.loading_more = False
+        self._update_load_more_button()
+
+
+    def _on_tree_yview(self, first, last):
+        """
+        Dipanggil setiap kali area tampilan Treeview berubah (scroll, resize, baris bertambah).
+        Meneruskan posisi ke scrollbar dan memuat halaman berikutnya jika sudah mendekati bawah.
+        """
+        self.scrollbar.set(first, last)
+        if float(last) >= self.LOAD_MORE_THRESHOLD and self.next_cursor is not None and not self.loading_more:
+            self.after_idle(self.load_next_page)
+
+
+    def _update_load_more_button(self):
+        if not self.button_load_more.winfo_exists():
+            return
+        if self.next_cursor is not None:
+            self.button_load_more.config(text="Muat lebih banyak", state=tk.NORMAL)
         else:
-            # Masukkan data notifikasi ke Treeview
-            for notification in self.notifications_list:
-                # Simpan NotificationID di item Treeview (bisa disembunyikan)
-                notification_id = notification.get('NotificationID')
-                message = notification.get('Message', 'Pesan Kosong')
-                sent_at = notification.get('SentAt')
-                # Format tanggal dan waktu
-                sent_at_str = sent_at.strftime('%Y-%m-%d %H:%M:%S') if isinstance(sent_at, datetime.datetime) else str(sent_at)
-                is_read = notification.get('IsRead', False)
+            self.button_load_more.config(text="Semua notifikasi sudah ditampilkan", state=tk.DISABLED)
+
+
+    def _notification_row(self, notification):
+        """Nilai dan tag baris Treeview untuk satu notifikasi: ((Message, SentAt, Status, NotificationID), tags)."""
+        message = notification.get('Message', 'Pesan Kosong')
+        sent_at = notification.get('SentAt')
+        # Format tanggal dan waktu
+        sent_at_str = sent_at.strftime('%Y-%m-%d %H:%M:%S') if isinstance(sent_at, datetime.datetime) else str(sent_at)
+        is_read = notification.get('IsRead', False)
 
-                # Tampilkan status 'Sudah Dibaca' atau 'Belum Dibaca'
-                status_text = "Sudah Dibaca" if is_read else "Belum Dibaca"
+        # Tampilkan status 'Sudah Dibaca' atau 'Belum Dibaca'
+        status_text = "Sudah Dibaca" if is_read else "Belum Dibaca"
+        # Tag untuk styling visual (teks tebal untuk belum dibaca)
+        tags = ('unread',) if not is_read else ('read',)
+        # Urutan harus sesuai dengan definisi kolom di __init__
+        return (message, sent_at_str, status_text, notification.get('NotificationID')), tags
 
-                # Anda bisa menambahkan tag ke item Treeview berdasarkan status read
-                # untuk styling visual (misal: teks tebal untuk belum dibaca)
-                tags = ('unread',) if not is_read else ('read',)
 
-                # --- PERBAIKAN: Masukkan NotificationID ke dalam tuple values ---
-                # Urutan harus sesuai dengan definisi kolom di __init__
-                self.notifications_tree.insert("", tk.END, values=(message, sent_at_str, status_text, notification_id), tags=tags)
+    def _insert_notification_row(self, notification):
+        values, tags = self._notification_row(notification)
+        # iid baris Treeview = NotificationID, agar baris bisa diperbarui langsung
+        self.notifications_tree.insert("", tk.END, iid=str(notification.get('NotificationID')), values=values, tags=tags)
 
 
-            # Konfigurasi tag untuk styling (opsional)
-            self.notifications_tree.tag_configure('unread', font=('Arial', 10, 'bold')) # Teks tebal untuk belum dibaca
-            self.notifications_tree.tag_configure('read', font=('Arial', 10, 'normal')) # Teks normal untuk sudah dibaca
+    def display_notifications(self):
+        """
+        Menampilkan data notifikasi yang sudah dimuat di Treeview.
+        """
+        # Hapus data lama dari Treeview (satu panggilan untuk semua baris)
+        rows = self.notifications_tree.get_children()
+        if rows:
+            self.notifications_tree.delete(*rows)
+
+        if not self.notifications_list:
+            # Treeview sudah menampilkan area kosong jika tidak ada data
+            logger.debug("No notifications to display.")
+        else:
+            # Masukkan data notifikasi ke Treeview
+            for notification in self.notifications_list:
+                self._insert_notification_row(notification)
+            logger.debug("Notifications displayed in Treeview.")
 
-            print("Notifications displayed in Treeview.") # Debugging print
+        self.notifications_tree.yview_moveto(0)
+        self._update_load_more_button()
 
 
     def on_notification_select(self, event):
@@ -149,57 +248,137 @@ class NotificationsFrame(BaseFrame):
         try:
             # Indeks NotificationID adalah yang terakhir (indeks 3)
             selected_notification_id = item_values[3]
-            print(f"Notification selected: ID={selected_notification_id}, Message='{item_values[0][:50]}...'") # Debugging print
+            logger.debug("Notification selected: ID=%s, Message='%s...'", selected_notification_id, item_values[0][:50])
         except IndexError:
             # Ini seharusnya tidak terjadi lagi jika kolom NotificationID sudah ditambahkan
-            print("Error: Could not get NotificationID from selected Treeview item. Check Treeview columns definition.")
+            logger.error("Could not get NotificationID from selected Treeview item. Check Treeview columns definition.")
             return # Gagal mendapatkan ID
 
         # Cek apakah notifikasi ini belum dibaca
-        # Kita bisa cek teks status di kolom Treeview, atau cari di self.notifications_list
-        # Mencari di self.notifications_list lebih akurat karena menggunakan data asli
-        # Menggunakan str() untuk perbandingan karena nilai dari Treeview mungkin string
-        notification_data = next((notif for notif in self.notifications_list if str(notif.get('NotificationID')) == str(selected_notification_id)), None)
+        # Dicari di data asli (self.notifications_by_id) karena lebih akurat daripada teks status di Treeview
+        notification_data = self.notifications_by_id.get(int(selected_notification_id))
 
         if notification_data and not notification_data.get('IsRead'):
-            # Jika notifikasi ditemukan di list data asli dan statusnya Belum Dibaca
-            print(f"Notification ID {selected_notification_id} is unread. Marking as read...") # Debugging print
-            # Panggil fungsi DAO untuk menandai notifikasi sebagai sudah dibaca
-            mark_success = mark_notification_as_read(selected_notification_id)
-
-            if mark_success:
-                print(f"Notification ID {selected_notification_id} marked as read successfully.") # Debugging print
-                # Refresh tampilan notifikasi setelah berhasil menandai dibaca
-                self.load_notifications_data()
-                self.display_notifications()
-                # Opsional: Tampilkan pesan info
-                # messagebox.showinfo("Info", "Notifikasi ditandai sebagai sudah dibaca.")
-            else:
-                print(f"Failed to mark Notification ID {selected_notification_id} as read.") # Debugging print
-                # messagebox.showwarning("Gagal", "Gagal menandai notifikasi sebagai sudah dibaca.")
+            # Ditandai dibaca di layar sekarang; penulisan ke database dikumpulkan (lihat _flush_read_receipts)
+            logger.debug("Notification ID %s is unread. Queuing read receipt...", selected_notification_id)
+            self._set_rows_read([notification_data['NotificationID']])
+            self._pending_reads.add(notification_data['NotificationID'])
+            self._pending_reads_user_id = notification_data.get('ReceiverID')
+            if self._flush_after_id is None:
+                self._flush_after_id = self.after(self.READ_RECEIPT_FLUSH_MS, self._flush_read_receipts)
         else:
-            print(f"Notification ID {selected_notification_id} is already read or not found in data.") # Debugging print
+            logger.debug("Notification ID %s is already read or not found in data.", selected_notification_id)
             # Notifikasi sudah dibaca atau tidak ditemukan di list data, tidak perlu aksi
 
-        # Setelah menangani seleksi, batalkan seleksi di Treeview
-        # self.notifications_tree.selection_remove(selected_item) # Opsional: Hapus seleksi setelah diproses
+
+    def _set_rows_read(self, notification_ids):
+        """Menandai notifikasi sebagai sudah dibaca di data lokal dan memperbarui barisnya di Treeview."""
+        for notification_id in notification_ids:
+            notification = self.notifications_by_id.get(notification_id)
+            if notification is None or notification.get('IsRead'):
+                continue
+            notification['IsRead'] = True
+            if self.notifications_tree.exists(str(notification_id)):
+                values, tags = self._notification_row(notification)
+                self.notifications_tree.item(str(notification_id), values=values, tags=tags)
+
+
+    def _flush_read_receipts(self):
+        """
+        Menulis semua tanda-baca yang terkumpul dengan satu UPDATE (mark_notifications_read).
+        Dipanggil oleh timer dan saat frame disembunyikan. Dikirim langsung ke task_runner (bukan
+        run_in_background) agar tidak ikut dibatalkan oleh hide().
+        """
+        if self._flush_after_id is not None:
+            self.after_cancel(self._flush_after_id)
+            self._flush_after_id = None
+        if not self._pending_reads:
+            return
+
+        notification_ids = sorted(self._pending_reads)
+        user_id = self._pending_reads_user_id
+        self._pending_reads = set()
+        logger.debug("Flushing %s read receipts for UserID %s.", len(notification_ids), user_id)
+        self.main_app.task_runner.submit(
+            mark_notifications_read, user_id, notification_ids,
+            on_success=lambda marked: self._on_read_receipts_flushed(user_id, notification_ids, marked),
+            on_error=lambda e: self._on_read_receipts_flushed(user_id, notification_ids, None)
+        )
+
+
+    def _on_read_receipts_flushed(self, user_id, notification_ids, marked):
+        """Callback _flush_read_receipts (thread utama). Jika gagal, tanda-baca dicoba lagi di flush berikutnya."""
+        if marked is not None:
+            logger.debug("%s notifications marked as read.", marked)
+            return
+        logger.warning("Failed to write %s read receipts, will retry.", len(notification_ids))
+        if self._pending_reads_user_id not in (None, user_id):
+            return # Pengguna sudah berganti; tanda-baca lama dibuang
+        self._pending_reads.update(notification_ids)
+        self._pending_reads_user_id = user_id
+        if self._flush_after_id is None and self.winfo_ismapped():
+            self._flush_after_id = self.after(self.READ_RECEIPT_FLUSH_MS, self._flush_read_receipts)
+
+
+    def flush_read_receipts_now(self):
+        """
+        Menulis tanda-baca yang masih di buffer secara langsung di thread ini (memblokir).
+        Dipakai saat aplikasi ditutup, ketika task_runner tidak lagi sempat memproses hasil.
+        """
+        if self._flush_after_id is not None:
+            self.after_cancel(self._flush_after_id)
+            self._flush_after_id = None
+        if not self._pending_reads:
+            return
+        notification_ids = sorted(self._pending_reads)
+        self._pending_reads = set()
+        if mark_notifications_read(self._pending_reads_user_id, notification_ids) is None:
+            logger.warning("Failed to write %s read receipts on exit.", len(notification_ids))
+
+
+    def handle_mark_all_read(self):
+        """Menandai semua notifikasi sampai yang terbaru di layar sebagai sudah dibaca dengan satu UPDATE."""
+        logged_in_user_id = self.main_app.user_data.get('UserID') if self.main_app.user_data else None
+        if logged_in_user_id is None or not self.notifications_by_id:
+            return
+
+        # Notifikasi yang masuk setelah daftar dimuat (ID lebih besar) tetap belum dibaca
+        up_to_id = max(self.notifications_by_id)
+        self.run_in_background(
+            mark_all_read, logged_in_user_id, up_to_id,
+            on_success=lambda marked: self._on_mark_all_read_done(up_to_id, marked),
+            key="mark_all_read",
+            loading_text="Menandai notifikasi..."
+        )
+
+
+    def _on_mark_all_read_done(self, up_to_id, marked):
+        """Callback handle_mark_all_read (thread utama)."""
+        if marked is None:
+            messagebox.showwarning("Gagal", "Gagal menandai notifikasi sebagai sudah dibaca. Mohon coba lagi.")
+            return
+        logger.debug("Marked %s notifications as read (up to ID %s).", marked, up_to_id)
+        # Tanda-baca yang masih di buffer sudah tercakup oleh mark_all_read. Baru dibuang setelah
+        # berhasil, agar tidak hilang jika mark_all_read gagal.
+        self._pending_reads = {notification_id for notification_id in self._pending_reads if notification_id > up_to_id}
+        self._set_rows_read([notification_id for notification_id in self.notifications_by_id if notification_id <= up_to_id])
 
 
     def show(self):
         """
         Menampilkan frame ini dan me-refresh daftar notifikasi.
         """
-        print("NotificationsFrame: show called.") # Debugging print
+        logger.debug("NotificationsFrame: show called.")
         super().show() # Panggil metode show dari BaseFrame (pack frame)
-        # Muat data notifikasi dan tampilkan setiap kali frame ini ditunjukkan
+        # Muat data notifikasi dan tampilkan setiap kali frame ini ditunjukkan (setelah data tiba)
         self.load_notifications_data()
-        self.display_notifications()
 
     def hide(self):
         """
         Menyembunyikan frame ini.
         """
-        print("NotificationsFrame: hide called.") # Debugging print
+        logger.debug("NotificationsFrame: hide called.")
+        self._flush_read_receipts() # Tulis tanda-baca yang masih di buffer sebelum frame ditutup
         super().hide()
         # Opsional: Bersihkan data notifikasi saat frame disembunyikan untuk menghemat memori
         # self.notifications_list = []
@@ -6,6 +6,9 @@ from tkinter import messagebox
 from .base_frame import BaseFrame
 # Mengimpor fungsi verifikasi token dan fungsi hapus user dari DAO
 from src.database.auth_dao import verify_email_token, delete_user_and_campus_user_by_id # Import fungsi delete
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 class OTPFrame(BaseFrame):
     """
@@ -114,7 +117,7 @@ class OTPFrame(BaseFrame):
         Menangani aksi saat tombol 'Kembali ke Login' diklik.
         Menghapus akun pengguna yang belum aktif dan mengarahkan ke halaman login.
         """
-        print(f"Attempting to cancel verification for UserID: {self.user_id_to_verify}") # Debugging print
+        logger.debug("Attempting to cancel verification for UserID: %s", self.user_id_to_verify)
         if self.user_id_to_verify is not None:
             # Konfirmasi ke pengguna sebelum menghapus akun
             confirm = messagebox.askyesno(
@@ -141,7 +144,7 @@ class OTPFrame(BaseFrame):
         else:
             # Jika user_id_to_verify tidak diset (misal, pengguna langsung ke halaman ini tanpa registrasi/login tidak aktif)
             # Langsung arahkan ke login tanpa mencoba menghapus
-            print("No user_id_to_verify set, redirecting directly to login.") # Debugging print
+            logger.debug("No user_id_to_verify set, redirecting directly to login.")
             self.main_app.show_login_frame()
 
 
@@ -6,10 +6,11 @@ from tkinter import messagebox
 from .base_frame import BaseFrame
 # Mengimpor fungsi dari DAO untuk menyimpan user dan token
 from src.database.auth_dao import create_new_user_with_token
-# Mengimpor fungsi hashing password
-from src.utils.auth_utils import hash_password
+# Mengimpor layanan hashing password (bcrypt di process pool)
+from src.utils.password_service import get_password_service
 # Mengimpor fungsi untuk mengirim email dan template body email
-from src.utils.email_utils import send_email, get_otp_email_body
+from src.utils.email_utils import get_otp_email_body
+from src.utils.email_worker import wake_email_worker
 import random # Untuk menghasilkan OTP
 import datetime # Untuk mengelola waktu kedaluwarsa OTP
 
@@ -70,7 +71,8 @@ class RegisterFrame(BaseFrame):
         self.entry_password.grid(row=5, column=1, pady=5, padx=5)
 
         # Tombol Daftar
-        tk.Button(self, text="Daftar", command=self.handle_register, width=30).pack(pady=10)
+        self.button_register = tk.Button(self, text="Daftar", command=self.handle_register, width=30)
+        self.button_register.pack(pady=10)
 
         # Link kembali ke login
         tk.Label(self, text="Sudah punya akun?").pack(pady=(10, 0))
@@ -105,38 +107,63 @@ class RegisterFrame(BaseFrame):
             messagebox.showwarning("Input Error", "Role ID harus berupa angka.")
             return
 
-        # Hash password menggunakan fungsi dari auth_utils
-        password_hash = hash_password(password)
-
         # Hasilkan OTP (6 digit angka acak) dan hitung waktu kedaluwarsa
         otp_code = str(random.randint(100000, 999999))
         # Mengambil durasi kedaluwarsa dari instance MainApp
         otp_expiry = datetime.datetime.now() + datetime.timedelta(minutes=self.main_app.otp_expiry_minutes)
 
+        # Siapkan subjek dan isi email menggunakan template
+        subject = "Kode Aktivasi Akun CLFS Kamu nih! ✨"
+        body = get_otp_email_body(full_name, otp_code, self.main_app.otp_expiry_minutes)
+
+        # Hashing bcrypt dan query database berjalan di latar belakang agar GUI tidak freeze
+        self.button_register.config(state=tk.DISABLED) # Cegah klik ganda selama proses registrasi
+        self.run_in_background(
+            self._register_user, full_name, nim_nip, email, role_id, username, password, otp_code, otp_expiry, subject, body,
+            on_success=lambda user_id: self._on_user_registered(email, user_id),
+            on_done=self._on_register_done,
+            key="handle_register",
+            loading_text="Mendaftarkan akun..."
+        )
+
+    @staticmethod
+    def _register_user(full_name, nim_nip, email, role_id, username, password, otp_code, otp_expiry, subject, body):
+        """
+        Dijalankan di thread worker: hash password lalu simpan pengguna baru.
+
+        Returns:
+            int: UserID pengguna baru, atau None jika gagal.
+        """
+        # Hash password di process pool PasswordService
+        password_hash = get_password_service().hash(password)
+
         # Panggil fungsi DAO untuk menyimpan data pengguna baru dan token verifikasi
-        # Fungsi ini akan melakukan INSERT ke tabel CampusUsers, Users, dan EmailVerificationToken
-        user_id = create_new_user_with_token(full_name, nim_nip, email, role_id, username, password_hash, otp_code, otp_expiry)
+        # Fungsi ini akan melakukan INSERT ke tabel CampusUsers, Users, EmailVerificationToken,
+        # dan EmailOutbox dalam satu transaksi; email dikirim oleh worker email di latar belakang.
+        user_id, _ = create_new_user_with_token(full_name, nim_nip, email, role_id, username, password_hash, otp_code, otp_expiry,
+                                                email_subject=subject, email_body=body)
+        return user_id
+
+    def _on_register_done(self):
+        """Mengaktifkan kembali tombol Daftar setelah proses registrasi selesai."""
+        if self.button_register.winfo_exists():
+            self.button_register.config(state=tk.NORMAL)
+
+    def _on_user_registered(self, email, user_id):
+        """
+        Callback handle_register (thread utama): menampilkan hasil registrasi.
 
+        Args:
+            email (str): Email pengguna baru.
+            user_id (int): UserID pengguna baru, atau None jika gagal.
+        """
         if user_id:
-            # Jika data user dan token berhasil disimpan di database (user_id tidak None)
-
-            # Siapkan subjek dan isi email menggunakan template
-            subject = "Kode Aktivasi Akun CLFS Kamu nih! ✨"
-            body = get_otp_email_body(full_name, otp_code, self.main_app.otp_expiry_minutes)
-
-            # Kirim email (ini mungkin memakan waktu, pertimbangkan threading di aplikasi nyata)
-            email_sent_success = send_email(email, subject, body)
-
-            if email_sent_success:
-                messagebox.showinfo("Registrasi Berhasil", f"Akun berhasil dibuat! Kode verifikasi telah dikirim ke email {email}. Silakan cek email Anda dan masukkan kode di halaman berikutnya.")
-                # Arahkan pengguna ke halaman verifikasi OTP, teruskan UserID yang baru dibuat
-                self.main_app.show_otp_verification_frame(user_id)
-            else:
-                # Email gagal dikirim - perlu penanganan lebih lanjut
-                # Misalnya, beri tahu pengguna untuk menghubungi admin atau coba lagi
-                messagebox.showwarning("Registrasi Berhasil (Email Gagal)", f"Akun berhasil dibuat, tetapi gagal mengirim kode verifikasi ke email {email}. Mohon periksa folder spam Anda atau hubungi admin jika masalah berlanjut.")
-                # Tetap arahkan ke halaman OTP jika user bisa memasukkan kode secara manual (misal dari log admin)
-                self.main_app.show_otp_verification_frame(user_id) # Tetap coba arahkan ke OTP
-
-        # Jika create_new_user_with_token mengembalikan None, error sudah ditangani di DAO
-        # (misal: username/email/nim_nip duplikat) dan pesan error sudah ditampilkan oleh DAO.
+            # Jika data user, token, dan email berhasil disimpan di database (user_id tidak None)
+            wake_email_worker() # Kirim secepatnya tanpa menunggu interval polling worker
+
+            messagebox.showinfo("Registrasi Berhasil", f"Akun berhasil dibuat! Kode verifikasi sedang dikirim ke email {email}. Silakan cek email Anda dan masukkan kode di halaman berikutnya.")
+            # Arahkan pengguna ke halaman verifikasi OTP, teruskan UserID yang baru dibuat
+            self.main_app.show_otp_verification_frame(user_id)
+        else:
+            # Detail error (misal: username/email/nim_nip duplikat) sudah dicetak oleh DAO
+            messagebox.showerror("Registrasi Gagal", "Gagal membuat akun. Username, email, atau NIM/NIP mungkin sudah terdaftar.")
@@ -7,11 +7,14 @@ from .base_frame import BaseFrame # Mengimpor BaseFrame
 # Mengimpor fungsi DAO untuk menambahkan item
 from src.database.item_dao import add_item
 # Mengimpor modul untuk mengunggah gambar dari direktori image_storage
-from src.image_storage.imagekit_service import upload_image # Mengimpor fungsi upload_image dari lokasi BARU
+# Unggah gambar paralel di latar belakang (membungkus imagekit_service.upload_image)
+from src.image_storage.upload_manager import get_upload_manager, UploadBatch, UploadJob
+from .upload_progress_frame import UploadProgressFrame
 import os # Diperlukan untuk mendapatkan nama file dari jalur
 import datetime # Diperlukan untuk timestamp jika membuat nama file unik
-# Anda mungkin perlu mengimpor modul threading jika unggah gambar memakan waktu lama dan memblokir GUI
-# import threading
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 class ReportItemFrame(BaseFrame):
     """
@@ -28,6 +31,7 @@ class ReportItemFrame(BaseFrame):
         """
         super().__init__(parent, main_app)
         self.image_paths = [] # List untuk menyimpan jalur file gambar yang dipilih
+        self.upload_batch = None # UploadBatch untuk image_paths saat ini (disimpan agar unggah ulang hanya untuk yang gagal)
         self.create_widgets() # Panggil metode untuk membuat widget
 
     def create_widgets(self):
@@ -66,8 +70,13 @@ class ReportItemFrame(BaseFrame):
         self.label_image_count.grid(row=4, column=1, sticky='w', padx=5)
 
 
+        # Status unggah per gambar
+        self.upload_progress = UploadProgressFrame(self)
+        self.upload_progress.pack(pady=5)
+
         # Tombol Laporkan
-        tk.Button(self, text="Laporkan Barang", command=self.handle_report_item, width=30).pack(pady=10)
+        self.button_report = tk.Button(self, text="Laporkan Barang", command=self.handle_report_item, width=30)
+        self.button_report.pack(pady=10)
 
         # Link kembali ke halaman utama
         # Menggunakan lambda untuk meneruskan user_data saat tombol diklik
@@ -83,11 +92,16 @@ class ReportItemFrame(BaseFrame):
         )
         if file_paths:
             self.image_paths = list(file_paths)
+            self.upload_batch = None # Pilihan baru, unggah dari awal
+            self.upload_progress.clear()
             self.label_image_count.config(text=f"{len(self.image_paths)} file dipilih")
-            print(f"Selected image files: {self.image_paths}") # Debugging print
+            logger.debug("Selected image files: %s", self.image_paths)
 
     def handle_report_item(self):
-        """Menangani aksi saat tombol Laporkan Barang diklik."""
+        """
+        Menangani aksi saat tombol Laporkan Barang diklik.
+        Gambar diunggah paralel di latar belakang (UploadManager); barang disimpan setelah unggah selesai.
+        """
         item_name = self.entry_item_name.get().strip()
         description = self.text_description.get("1.0", tk.END).strip() # Ambil teks dari Text widget
         location = self.entry_location.get().strip()
@@ -96,49 +110,6 @@ class ReportItemFrame(BaseFrame):
             messagebox.showwarning("Input Error", "Nama Barang, Deskripsi, dan Lokasi harus diisi.")
             return
 
-        # --- Implementasi Unggah Gambar ---
-        image_urls = []
-        upload_errors = False
-
-        if self.image_paths:
-             print(f"Attempting to upload {len(self.image_paths)} images...")
-             # Anda mungkin perlu menjalankan proses upload di thread terpisah
-             # jika unggah memakan waktu lama agar GUI tidak freeze.
-             # Untuk saat ini, kita lakukan secara sinkron.
-
-             for i, path in enumerate(self.image_paths):
-                 try:
-                     # Buat nama file unik di storage, misal: items/username_itemname_timestamp_index.ext
-                     # Mengambil username dari data user yang login
-                     username = self.main_app.user_data.get('Username', 'unknown_user')
-                     file_ext = os.path.splitext(path)[1] # Ambil ekstensi file
-                     timestamp = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
-                     # Menggunakan nama file asli + timestamp + index untuk keunikan
-                     uploaded_file_name = f"items/{username}_{os.path.basename(path)}_{timestamp}_{i}{file_ext}"
-
-                     # Panggil fungsi upload_image dari imagekit_service
-                     print(f"Uploading file {i+1}/{len(self.image_paths)}: {os.path.basename(path)} as '{uploaded_file_name}'...")
-                     # Anda bisa menambahkan opsi folder di sini jika perlu, misal options={"folder": "/items/"}
-                     upload_response = upload_image(path, uploaded_file_name)
-
-                     if upload_response and hasattr(upload_response, 'url'):
-                         image_urls.append(upload_response.url)
-                         print(f"Upload successful. URL: {upload_response.url}")
-                     else:
-                         print(f"Failed to upload image '{os.path.basename(path)}'. Response: {upload_response}")
-                         upload_errors = True # Tandai ada error unggah
-                         # Lanjutkan ke gambar berikutnya meskipun ada satu yang gagal
-                 except Exception as e:
-                     print(f"An error occurred during upload of '{os.path.basename(path)}': {e}")
-                     upload_errors = True
-                     # Lanjutkan ke gambar berikutnya
-
-             if upload_errors:
-                 # Beri tahu pengguna jika ada gambar yang gagal diunggah
-                 messagebox.showwarning("Unggah Gambar Gagal", "Beberapa gambar gagal diunggah. Barang akan dilaporkan tanpa gambar tersebut.")
-        # --- Akhir Implementasi Unggah Gambar ---
-
-
         # Pastikan pengguna sedang login untuk mendapatkan UserID penemu
         # UserID disimpan di self.main_app.user_data setelah login berhasil
         found_by_user_id = self.main_app.user_data.get('UserID') if self.main_app.user_data else None
@@ -148,10 +119,92 @@ class ReportItemFrame(BaseFrame):
             self.main_app.show_login_frame() # Kembali ke login
             return
 
+        report_data = {
+            'found_by_user_id': found_by_user_id,
+            'item_name': item_name,
+            'description': description,
+            'location': location
+        }
+
+        self.button_report.config(state=tk.DISABLED) # Cegah laporan ganda selama proses berjalan
+
+        if not self.image_paths:
+            self._submit_report(report_data, [])
+            return
+
+        # --- Implementasi Unggah Gambar ---
+        # Batch dibuat sekali per pilihan gambar. Jika laporan dikirim ulang setelah sebagian
+        # gambar gagal, hanya gambar yang gagal yang diunggah lagi.
+        if self.upload_batch is None:
+            # Buat nama file unik di storage, misal: items/username_itemname_timestamp_index.ext
+            # Mengambil username dari data user yang login
+            username = self.main_app.user_data.get('Username', 'unknown_user')
+            timestamp = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
+            jobs = []
+            for i, path in enumerate(self.image_paths):
+                file_ext = os.path.splitext(path)[1] # Ambil ekstensi file
+                # Menggunakan nama file asli + timestamp + index untuk keunikan
+                uploaded_file_name = f"items/{username}_{os.path.basename(path)}_{timestamp}_{i}{file_ext}"
+                jobs.append(UploadJob(path, uploaded_file_name))
+            self.upload_batch = UploadBatch(jobs)
+            self.upload_progress.set_batch(self.upload_batch)
+
+        self._start_upload(report_data)
+
+    def _start_upload(self, report_data):
+        """Mengunggah gambar yang belum berhasil diunggah di batch saat ini."""
+        batch = self.upload_batch
+        logger.debug("Attempting to upload %s images...", len(batch.jobs) - len(batch.urls))
+        get_upload_manager().upload(
+            batch,
+            on_progress=lambda job: self.after(0, self.upload_progress.update_job, job), # Update label di thread utama
+            on_complete=lambda b: self.after(0, self._on_uploads_finished, b, report_data)
+        )
+
+    def _on_uploads_finished(self, batch, report_data):
+        """Dipanggil di thread utama setelah semua unggahan dalam satu putaran selesai."""
+        if batch is not self.upload_batch:
+            # Pilihan gambar sudah diganti selama unggah berlangsung. Tombol diaktifkan lagi agar
+            # pilihan baru bisa dilaporkan, kecuali unggahan untuk pilihan baru sudah berjalan.
+            if self.upload_batch is None:
+                self.button_report.config(state=tk.NORMAL)
+            return
+
+        failed_jobs = batch.failed_jobs
+        if failed_jobs:
+            # Beri tahu pengguna jika ada gambar yang gagal diunggah
+            answer = messagebox.askyesnocancel(
+                "Unggah Gambar Gagal",
+                f"{len(failed_jobs)} dari {len(batch.jobs)} gambar gagal diunggah.\n\n"
+                "Ya: coba unggah ulang gambar yang gagal saja\n"
+                "Tidak: laporkan barang tanpa gambar tersebut\n"
+                "Batal: kembali ke form"
+            )
+            if answer is None:
+                self.button_report.config(state=tk.NORMAL) # Gambar yang sudah berhasil tetap disimpan di batch
+                return
+            if answer:
+                self._start_upload(report_data)
+                return
+        # --- Akhir Implementasi Unggah Gambar ---
+
+        self._submit_report(report_data, batch.urls)
+
+    def _submit_report(self, report_data, image_urls):
+        """Menyimpan laporan barang ke database di latar belakang."""
         # Panggil fungsi DAO untuk menambahkan item ke database
         # Teruskan list image_urls yang sudah diisi (mungkin kosong jika tidak ada gambar atau unggah gagal)
-        new_item_id = add_item(found_by_user_id, item_name, description, location, image_urls)
+        self.run_in_background(
+            add_item,
+            report_data['found_by_user_id'], report_data['item_name'], report_data['description'], report_data['location'], image_urls,
+            on_success=self._on_item_added,
+            on_done=lambda: self.button_report.config(state=tk.NORMAL),
+            key="add_item",
+            loading_text="Menyimpan laporan..."
+        )
 
+    def _on_item_added(self, new_item_id):
+        """Callback _submit_report (thread utama)."""
         if new_item_id:
             messagebox.showinfo("Sukses", "Barang berhasil dilaporkan!")
             # Bersihkan form setelah sukses
@@ -159,6 +212,8 @@ class ReportItemFrame(BaseFrame):
             self.text_description.delete("1.0", tk.END)
             self.entry_location.delete(0, tk.END)
             self.image_paths = [] # Bersihkan list jalur file lokal
+            self.upload_batch = None
+            self.upload_progress.clear()
             self.label_image_count.config(text="0 file dipilih") # Update label jumlah file
             # Opsional: Kembali ke halaman utama atau halaman daftar item
             self.main_app.show_main_app_frame(self.main_app.user_data) # Kembali ke halaman utama, teruskan data user
@@ -166,6 +221,6 @@ class ReportItemFrame(BaseFrame):
             # add_item sudah menampilkan error database di konsol
             # Tampilkan pesan umum di GUI jika add_item mengembalikan None
             messagebox.showwarning("Gagal", "Gagal melaporkan barang. Mohon coba lagi.")
-            # Tetap di halaman laporan agar user bisa coba lagi
+            # Tetap di halaman laporan agar user bisa coba lagi (gambar yang sudah terunggah tidak diunggah ulang)
 
     # Metode hide diwarisi dari BaseFrame
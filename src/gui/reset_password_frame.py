@@ -5,6 +5,10 @@ from tkinter import messagebox
 from .base_frame import BaseFrame # Mengimpor BaseFrame
 # Mengimpor fungsi dari DAO untuk memproses reset password sebenarnya
 from src.database.auth_dao import reset_password_with_token
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
 # Mengimpor fungsi hashing password (diperlukan untuk menghash password baru sebelum dikirim ke DAO)
 # from src.utils.auth_utils import hash_password # Hashing dilakukan di DAO sekarang
 
@@ -21,7 +25,7 @@ class ResetPasswordFrame(BaseFrame):
             parent: Widget parent.
             main_app: Referensi ke instance kelas MainApp.
         """
-        print("ResetPasswordFrame: __init__ called.") # Debugging print
+        logger.debug("ResetPasswordFrame: __init__ called.")
         super().__init__(parent, main_app)
         # Variabel untuk menyimpan data token jika frame ini dibuka via link email (opsional)
         # self.token_data = None # Tidak lagi digunakan dalam alur aman
@@ -29,7 +33,7 @@ class ResetPasswordFrame(BaseFrame):
 
     def create_widgets(self):
         """Membuat widget untuk form reset password."""
-        print("ResetPasswordFrame: create_widgets called.") # Debugging print
+        logger.debug("ResetPasswordFrame: create_widgets called.")
         self.clear_widgets() # Bersihkan widget lama jika ada
 
         tk.Label(self, text="Reset Password", font=('Arial', 18, 'bold')).pack(pady=(20, 10))
@@ -58,7 +62,8 @@ class ResetPasswordFrame(BaseFrame):
         self.entry_confirm_password.grid(row=2, column=1, pady=5, padx=5)
 
         # Tombol Reset Password
-        tk.Button(self, text="Reset Password", command=self.handle_reset_password, width=30).pack(pady=10)
+        self.button_reset = tk.Button(self, text="Reset Password", command=self.handle_reset_password, width=30)
+        self.button_reset.pack(pady=10)
 
         # Link kembali ke login
         tk.Button(self, text="Kembali ke Login", command=self.main_app.show_login_frame, relief=tk.FLAT, fg="blue", cursor="hand2").pack(pady=(10, 0))
@@ -79,19 +84,19 @@ class ResetPasswordFrame(BaseFrame):
 
     def handle_reset_password(self):
         """Menangani aksi saat tombol Reset Password diklik."""
-        print("ResetPasswordFrame: handle_reset_password called.") # Debugging print
+        logger.debug("ResetPasswordFrame: handle_reset_password called.")
         reset_token = self.entry_reset_token.get().strip()
         new_password = self.entry_new_password.get() # Ambil password baru (plain text)
         confirm_password = self.entry_confirm_password.get()
 
         if not all([reset_token, new_password, confirm_password]):
             messagebox.showwarning("Input Error", "Semua field harus diisi.")
-            print("ResetPasswordFrame: Input fields are empty.") # Debugging print
+            logger.debug("ResetPasswordFrame: Input fields are empty.")
             return
 
         if new_password != confirm_password:
             messagebox.showwarning("Input Error", "Password baru dan konfirmasi password tidak cocok.")
-            print("ResetPasswordFrame: Passwords do not match.") # Debugging print
+            logger.debug("ResetPasswordFrame: Passwords do not match.")
             return
 
         # TODO: Tambahkan validasi kekuatan password jika diperlukan (panjang min, karakter, dll.)
@@ -102,12 +107,32 @@ class ResetPasswordFrame(BaseFrame):
         # Panggil fungsi DAO untuk memproses reset password sebenarnya
         # Fungsi ini akan memverifikasi token dan mengupdate password.
         # Kita meneruskan token dan password baru (plain text) ke DAO.
-        print(f"ResetPasswordFrame: Calling reset_password_with_token with token: {reset_token} and new password (masked).") # Debugging print
-        reset_success = reset_password_with_token(reset_token, new_password)
+        logger.debug("ResetPasswordFrame: Calling reset_password_with_token (token and new password masked).")
+        # Hashing bcrypt dan query database berjalan di latar belakang agar GUI tidak freeze
+        self.button_reset.config(state=tk.DISABLED) # Cegah klik ganda selama proses reset
+        self.run_in_background(
+            reset_password_with_token, reset_token, new_password,
+            on_success=self._on_reset_result,
+            on_done=self._on_reset_done,
+            key="handle_reset_password",
+            loading_text="Mereset password..."
+        )
+
+    def _on_reset_done(self):
+        """Mengaktifkan kembali tombol Reset Password setelah proses selesai."""
+        if self.button_reset.winfo_exists():
+            self.button_reset.config(state=tk.NORMAL)
+
+    def _on_reset_result(self, reset_success):
+        """
+        Callback handle_reset_password (thread utama): menampilkan hasil reset password.
 
+        Args:
+            reset_success (bool): Hasil reset_password_with_token.
+        """
         if reset_success:
             messagebox.showinfo("Reset Berhasil", "Password Anda telah berhasil direset. Silakan login dengan password baru Anda.")
-            print("ResetPasswordFrame: Password reset successful.") # Debugging print
+            logger.info("ResetPasswordFrame: Password reset successful.")
             # Arahkan kembali ke halaman login setelah reset berhasil
             self.main_app.show_login_frame()
         else:
@@ -118,14 +143,14 @@ class ResetPasswordFrame(BaseFrame):
             # Untuk saat ini, pesan error sudah muncul via print dari DAO.
             # Tampilkan pesan umum di GUI jika reset_password_with_token mengembalikan False
             messagebox.showwarning("Reset Gagal", "Gagal mereset password. Token tidak valid, sudah kedaluwarsa, atau sudah digunakan.")
-            print("ResetPasswordFrame: Password reset failed.") # Debugging print
+            logger.warning("ResetPasswordFrame: Password reset failed.")
             # Tetap di halaman reset password agar user bisa coba lagi atau periksa token
 
     def show(self):
         """
         Menampilkan frame ini.
         """
-        print("ResetPasswordFrame: show called.") # Debugging print
+        logger.debug("ResetPasswordFrame: show called.")
         super().show() # Panggil metode show dari BaseFrame (pack frame)
         # Fokuskan kembali ke field token saat frame ditampilkan
         self.entry_reset_token.focus_set()
@@ -135,7 +160,7 @@ class ResetPasswordFrame(BaseFrame):
         """
         Menyembunyikan frame ini.
         """
-        print("ResetPasswordFrame: hide called.") # Debugging print
+        logger.debug("ResetPasswordFrame: hide called.")
         super().hide()
         # Opsional: Bersihkan field input saat frame disembunyikan
         # self.entry_reset_token.delete(0, tk.END)
@@ -0,0 +1,51 @@
+# src/gui/upload_progress_frame.py
+
+import tkinter as tk
+from src.image_storage.upload_manager import UPLOAD_PENDING, UPLOAD_IN_PROGRESS, UPLOAD_DONE, UPLOAD_FAILED
+
+# Teks dan warna status untuk setiap file
+STATUS_DISPLAY = {
+    UPLOAD_PENDING: ("Menunggu", "gray"),
+    UPLOAD_IN_PROGRESS: ("Mengunggah...", "blue"),
+    UPLOAD_DONE: ("Selesai", "green"),
+    UPLOAD_FAILED: ("Gagal", "red"),
+}
+
+
+class UploadProgressFrame(tk.Frame):
+    """
+    Widget kecil yang menampilkan status unggah setiap file dalam satu UploadBatch.
+    Dipakai oleh ReportItemFrame dan ClaimItemFrame. Semua metode harus dipanggil di thread utama.
+    """
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.job_labels = {} # id(UploadJob) -> tk.Label
+
+    def set_batch(self, batch):
+        """Membuat ulang daftar label untuk semua file di batch."""
+        for widget in self.winfo_children():
+            widget.destroy()
+        self.job_labels = {}
+        for job in batch.jobs:
+            label = tk.Label(self, anchor='w')
+            label.pack(fill='x')
+            self.job_labels[id(job)] = label
+            self.update_job(job)
+
+    def update_job(self, job):
+        """Memperbarui label satu file sesuai statusnya."""
+        label = self.job_labels.get(id(job))
+        if label is None or not label.winfo_exists():
+            return
+        status_text, color = STATUS_DISPLAY.get(job.status, (job.status, "black"))
+        if job.status == UPLOAD_FAILED and job.error:
+            status_text = f"{status_text} ({job.error})"
+        elif job.status == UPLOAD_DONE and job.reused:
+            status_text = f"{status_text} (sudah pernah diunggah)"
+        label.config(text=f"{job.display_name}: {status_text}", fg=color)
+
+    def clear(self):
+        """Menghapus semua label status."""
+        for widget in self.winfo_children():
+            widget.destroy()
+        self.job_labels = {}
@@ -5,21 +5,24 @@ from tkinter import ttk # Menggunakan ttk untuk widget yang lebih modern (misal:
 from tkinter import messagebox
 from .base_frame import BaseFrame # Mengimpor BaseFrame
 # Mengimpor fungsi DAO untuk mengambil data item
-from src.database.item_dao import get_all_found_items, get_item_images_by_item_id
+from src.database.item_dao import get_found_items_page
 # Mengimpor modul untuk menampilkan gambar dari URL
-from PIL import ImageTk, Image # Perlu instal Pillow: pip install Pillow
+from PIL import ImageTk # Perlu instal Pillow: pip install Pillow
 import requests # Perlu instal requests: pip install requests
-from io import BytesIO
 import datetime # Untuk memformat tanggal
-import threading # Untuk mengunduh gambar di thread terpisah agar GUI tidak freeze
-import logging
+# Pemuat gambar bersama (thread pool terbatas) agar GUI tidak freeze
+from src.image_storage.image_loader import get_image_loader, PRIORITY_VISIBLE, PRIORITY_BACKGROUND
+from src.utils.log_utils import get_logger
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = get_logger(__name__)
 
 class ViewItemsFrame(BaseFrame):
     """
     Frame untuk menampilkan daftar barang yang ditemukan dalam format postingan.
+    Barang dimuat per halaman; halaman berikutnya dimuat saat pengguna men-scroll mendekati bawah.
     """
+    PAGE_SIZE = 20 # Jumlah item per halaman feed
+    LOAD_MORE_THRESHOLD = 0.9 # Muat halaman berikutnya jika posisi scroll bawah melewati 90%
 
     def __init__(self, parent, main_app):
         """
@@ -33,6 +36,11 @@ class ViewItemsFrame(BaseFrame):
         self.items_list = [] # Untuk menyimpan data item yang diambil dari DB
         self.item_images = {} # Dictionary untuk menyimpan referensi gambar agar tidak dihapus garbage collector
         self.scrollable_window_id = None # Untuk menyimpan ID window dari scrollable_frame di canvas
+        self.next_cursor = None # Cursor (CreatedAt, ItemID) untuk halaman berikutnya, None jika sudah habis
+        self.loading_more = False # True saat halaman berikutnya sedang dimuat
+        self.footer_label = None # Label status di bawah feed ("Memuat..." / akhir daftar)
+        self.pending_image_tasks = [] # List (img_label, ImageLoadTask) yang belum selesai diunduh
+        self._promote_scheduled = False
 
         # --- Area Konten Utama yang Dapat Di-scroll Vertikal ---
         # Canvas utama untuk membuat area yang bisa di-scroll
@@ -44,7 +52,8 @@ class ViewItemsFrame(BaseFrame):
         self.main_scrollbar.pack(side="right", fill="y")
 
         # Konfigurasi canvas agar terhubung dengan scrollbar
-        self.main_canvas.configure(yscrollcommand=self.main_scrollbar.set)
+        # _on_main_canvas_yview juga memicu pemuatan halaman berikutnya saat mendekati bawah
+        self.main_canvas.configure(yscrollcommand=self._on_main_canvas_yview)
         
         # Frame di dalam canvas untuk menampung semua postingan item
         self.scrollable_frame = ttk.Frame(self.main_canvas, padding="10")
@@ -92,6 +101,16 @@ class ViewItemsFrame(BaseFrame):
         self.main_canvas.configure(scrollregion=self.main_canvas.bbox("all"))
 
 
+    def _on_main_canvas_yview(self, first, last):
+        """
+        Dipanggil setiap kali area tampilan main_canvas berubah (scroll, resize, konten bertambah).
+        Meneruskan posisi ke scrollbar dan memuat halaman berikutnya jika sudah mendekati bawah.
+        """
+        self.main_scrollbar.set(first, last)
+        self._schedule_promote_visible_images()
+        if float(last) >= self.LOAD_MORE_THRESHOLD and self.next_cursor is not None and not self.loading_more:
+            self.after_idle(self.load_next_page)
+
     def _on_mousewheel(self, event):
         """Handler untuk scroll menggunakan mouse wheel pada main_canvas."""
         # Pastikan scroll hanya terjadi jika kursor mouse ada di atas main_canvas
@@ -153,6 +172,12 @@ class ViewItemsFrame(BaseFrame):
                 # Jika ingin item juga di dalam center_frame (secara visual), maka display_item_post perlu parent center_frame
                 self.display_item_post(self.scrollable_frame, item) # Parent tetap scrollable_frame untuk daftar item
 
+        # Label status di bagian paling bawah feed. Postingan dari halaman berikutnya
+        # disisipkan tepat sebelum label ini (lihat load_next_page).
+        self.footer_label = ttk.Label(self.scrollable_frame, text="", foreground="gray")
+        self.footer_label.pack(pady=10)
+        self._update_footer()
+
         ttk.Button(
             center_frame, # Tombol kembali tetap di center_frame (judul)
             text="Kembali ke Halaman Utama",
@@ -172,18 +197,87 @@ class ViewItemsFrame(BaseFrame):
 
 
     def load_items(self):
-        """Mengambil data barang dari DAO."""
-        self.items_list = get_all_found_items()
-        logging.debug(f"Loaded {len(self.items_list)} items.")
-        # logging.debug(self.items_list) # Bisa sangat panjang
+        """
+        Mengambil halaman pertama barang beserta URL gambarnya dari DAO di latar belakang.
+        Feed dibuat ulang (create_widgets) setelah data tiba.
+        """
+        self.run_in_background(
+            get_found_items_page, self.PAGE_SIZE,
+            on_success=self._on_first_page_loaded,
+            key="load_items",
+            loading_text="Memuat barang..."
+        )
+
+
+    def _on_first_page_loaded(self, page):
+        """Callback load_items (thread utama): menyimpan halaman pertama dan membuat feed."""
+        self.items_list, self.next_cursor = page
+        logger.debug("Loaded first page: %s items, has more: %s", len(self.items_list), self.next_cursor is not None)
+        # logger.debug("%s", self.items_list) # Bisa sangat panjang
+        self.create_widgets()
+
+
+    def load_next_page(self):
+        """
+        Memuat halaman berikutnya di latar belakang dan menambahkan postingannya di bawah postingan yang sudah ada.
+        Tidak melakukan apa-apa jika halaman sedang dimuat, sudah habis, atau frame tidak tampil.
+        """
+        if self.loading_more or self.next_cursor is None or not self.winfo_ismapped():
+            return
+        if self.footer_label is None or not self.footer_label.winfo_exists():
+            return
+
+        self.loading_more = True
+        self.footer_label.config(text="Memuat barang lainnya...")
+        self.run_in_background(
+            get_found_items_page, self.PAGE_SIZE, self.next_cursor,
+            on_success=self._on_next_page_loaded,
+            on_done=self._on_next_page_done,
+            key="load_next_page",
+            loading_text=None # Label footer sudah menjadi indikator loading
+        )
+
+
+    def _on_next_page_loaded(self, page):
+        """Callback load_next_page (thread utama): menambahkan postingan halaman berikutnya."""
+        new_items, self.next_cursor = page
+        logger.debug("Loaded next page: %s items, has more: %s", len(new_items), self.next_cursor is not None)
+        if self.footer_label is None or not self.footer_label.winfo_exists():
+            return
+        self.items_list.extend(new_items)
+        for item in new_items:
+            self.display_item_post(self.scrollable_frame, item, before=self.footer_label)
+
+        self._update_footer()
+        self.scrollable_frame.update_idletasks()
+        self.main_canvas.config(scrollregion=self.main_canvas.bbox("all"))
+
 
+    def _on_next_page_done(self):
+        """Dipanggil setelah load_next_page selesai, berhasil atau tidak."""
+        self.loading_more = False
+        self._update_footer()
 
-    def display_item_post(self, parent_frame, item): # Tambahkan parent_frame
+
+    def _update_footer(self):
+        """Memperbarui teks label status di bawah feed."""
+        if self.footer_label is None or not self.footer_label.winfo_exists():
+            return
+        if self.next_cursor is not None:
+            self.footer_label.config(text="Scroll ke bawah untuk memuat lebih banyak...")
+        elif self.items_list:
+            self.footer_label.config(text="Semua barang sudah ditampilkan.")
+        else:
+            self.footer_label.config(text="")
+
+
+    def display_item_post(self, parent_frame, item, before=None): # Tambahkan parent_frame
         """
         Menampilkan satu item sebagai postingan di dalam parent_frame.
         Args:
             parent_frame: Frame tempat item post akan dibuat.
             item (dict): Dictionary yang berisi data satu item.
+            before (widget, optional): Jika diisi, postingan disisipkan sebelum widget ini.
         """
         # Frame tambahan untuk memusatkan item_frame (container_frame sekarang ada di dalam parent_frame)
         # Jika parent_frame adalah scrollable_frame, maka container_frame akan mengisi lebar scrollable_frame
@@ -193,7 +287,7 @@ class ViewItemsFrame(BaseFrame):
         # Untuk memastikan container_frame tidak lebih lebar dari yang diinginkan (misal lebar item_frame)
         # kita pack item_frame dulu baru container_frame membungkusnya, atau atur lebar container_frame.
         # Pendekatan: Buat item_frame dulu, lalu pack container_frame mengelilinginya. Atau lebih sederhana:
-        container_frame.pack(pady=10, padx=5, fill='x', expand=False)
+        container_frame.pack(pady=10, padx=5, fill='x', expand=False, before=before)
 
 
         item_frame = tk.LabelFrame(
@@ -248,7 +342,7 @@ class ViewItemsFrame(BaseFrame):
         item_images_canvas.create_window((0, 0), window=item_images_scrollable_frame, anchor="nw")
         item_images_scrollable_frame.bind("<Configure>", lambda e, c=item_images_canvas: c.configure(scrollregion=c.bbox("all")))
 
-        self.load_and_display_item_images(item.get('ItemID'), item_images_scrollable_frame, item_images_canvas)
+        self.load_and_display_item_images(item.get('ItemID'), item.get('ImageURLs', []), item_images_scrollable_frame, item_images_canvas)
 
         is_admin = False
         logged_in_user_id = None
@@ -273,53 +367,90 @@ class ViewItemsFrame(BaseFrame):
             ).pack(pady=5, anchor='center')
 
 
-    def load_and_display_item_images(self, item_id, images_container_frame, item_images_canvas):
-        logging.debug(f"ViewItemsFrame: Loading all images for ItemID: {item_id}")
-        image_urls = get_item_images_by_item_id(item_id)
+    def load_and_display_item_images(self, item_id, image_urls, images_container_frame, item_images_canvas):
+        # image_urls sudah dimuat bersama item oleh get_found_items_page
+        logger.debug("ViewItemsFrame: Displaying images for ItemID: %s", item_id)
         self.item_images[item_id] = []
 
         if not image_urls:
             ttk.Label(images_container_frame, text="[Tidak Ada Gambar]").pack(side="left", padx=5)
-            logging.debug(f"ViewItemsFrame: No images found for ItemID {item_id}.")
+            logger.debug("ViewItemsFrame: No images found for ItemID %s.", item_id)
             item_images_canvas.update_idletasks()
             item_images_canvas.config(scrollregion=item_images_canvas.bbox("all"))
             return
 
-        logging.debug(f"ViewItemsFrame: Found {len(image_urls)} images for ItemID {item_id}. Attempting to display...")
+        logger.debug("ViewItemsFrame: Found %s images for ItemID %s. Attempting to display...", len(image_urls), item_id)
+        image_loader = get_image_loader()
         for url in image_urls:
             img_label = ttk.Label(images_container_frame, text="Memuat...")
             img_label.pack(side="left", padx=5)
-            thread = threading.Thread(target=self.download_and_display_image, args=(url, img_label, item_id, item_images_canvas))
-            thread.daemon = True
-            thread.start()
+            # Unduhan diantrikan di ImageLoader bersama (jumlah thread terbatas), bukan satu thread per gambar.
+            # Semua diantrikan sebagai background; _promote_visible_images menaikkan prioritas yang terlihat.
+            task = image_loader.submit(
+                url,
+                lambda image, error, u=url, l=img_label: self.download_and_display_image(image, error, u, l, item_id, item_images_canvas),
+                size=(120, 120),
+                priority=PRIORITY_BACKGROUND,
+                group=self
+            )
+            self.pending_image_tasks.append((img_label, task))
+
+        self._schedule_promote_visible_images()
+
+
+    def _schedule_promote_visible_images(self):
+        """Menjadwalkan _promote_visible_images sekali setelah layout selesai (digabung jika dipanggil berkali-kali)."""
+        if not self._promote_scheduled:
+            self._promote_scheduled = True
+            self.after_idle(self._promote_visible_images)
+
+
+    def _promote_visible_images(self):
+        """Menaikkan prioritas unduhan gambar yang labelnya sedang terlihat di main_canvas."""
+        self._promote_scheduled = False
+        if not self.winfo_ismapped():
+            return
 
+        # Buang tugas yang sudah selesai/batal agar list tidak terus membesar
+        self.pending_image_tasks = [(label, task) for label, task in self.pending_image_tasks if not task.started and not task.cancelled]
 
-    def download_and_display_image(self, image_url, img_label, item_id, item_images_canvas):
-        try:
-            response = requests.get(image_url, timeout=10) # Tambahkan timeout
-            response.raise_for_status()
-            img_data = response.content
-            img = Image.open(BytesIO(img_data))
-            img.thumbnail((120, 120))
-            photo_img = ImageTk.PhotoImage(img)
+        view_top = self.main_canvas.winfo_rooty()
+        view_bottom = view_top + self.main_canvas.winfo_height()
+        image_loader = get_image_loader()
+        for img_label, task in self.pending_image_tasks:
+            if not img_label.winfo_exists():
+                continue
+            label_top = img_label.winfo_rooty()
+            label_bottom = label_top + img_label.winfo_height()
+            if label_bottom >= view_top and label_top <= view_bottom:
+                image_loader.reprioritize(task, PRIORITY_VISIBLE)
 
-            if img_label.winfo_exists():
-                self.after(0, lambda: self.update_image_label(img_label, photo_img, item_id, item_images_canvas))
-            else:
-                logging.warning(f"ViewItemsFrame: GUI label for ItemID {item_id} no longer exists, skipping update.")
-        except requests.exceptions.RequestException as e:
-            logging.error(f"ViewItemsFrame: Failed to download image from URL {image_url}: {e}")
-            if img_label.winfo_exists():
-                self.after(0, lambda: img_label.config(text="[Gagal Unduh]", foreground="red", image=''))
-        except Exception as e:
-            logging.error(f"ViewItemsFrame: Failed to display image from URL {image_url}: {e}")
-            if img_label.winfo_exists():
-                self.after(0, lambda: img_label.config(text="[Gagal Tampil]", foreground="red", image=''))
 
+    def download_and_display_image(self, image, error, image_url, img_label, item_id, item_images_canvas):
+        """
+        Callback ImageLoader (dijalankan di thread worker).
+        Gambar sudah diunduh dan diperkecil oleh ImageLoader; pembaruan widget dipindahkan ke thread utama.
+        """
+        if error is None:
+            self.after(0, lambda: self.update_image_label(img_label, image, item_id, item_images_canvas))
+        elif isinstance(error, requests.exceptions.RequestException):
+            logger.warning("ViewItemsFrame: Failed to download image from URL %s: %s", image_url, error)
+            self.after(0, lambda: self._show_image_error(img_label, "[Gagal Unduh]"))
+        else:
+            logger.warning("ViewItemsFrame: Failed to display image from URL %s: %s", image_url, error)
+            self.after(0, lambda: self._show_image_error(img_label, "[Gagal Tampil]"))
+
+
+    def _show_image_error(self, img_label, text):
+        if img_label.winfo_exists():
+            img_label.config(text=text, foreground="red", image='')
 
-    def update_image_label(self, img_label, photo_img, item_id, item_images_canvas):
+
+    def update_image_label(self, img_label, image, item_id, item_images_canvas):
         try:
             if img_label.winfo_exists():
+                # PhotoImage dibuat di thread utama karena terikat ke interpreter Tk
+                photo_img = ImageTk.PhotoImage(image)
                 img_label.config(image=photo_img, text='')
                 if item_id not in self.item_images: # Seharusnya sudah diinisialisasi
                     self.item_images[item_id] = []
@@ -329,21 +460,20 @@ class ViewItemsFrame(BaseFrame):
                     item_images_canvas.update_idletasks()
                     item_images_canvas.config(scrollregion=item_images_canvas.bbox("all"))
             else:
-                logging.warning("ViewItemsFrame: GUI label for image no longer exists during update, skipping.")
+                logger.warning("ViewItemsFrame: GUI label for image no longer exists during update, skipping.")
         except Exception as e:
-            logging.error(f"ViewItemsFrame: Error updating image label or scrollregion: {e}")
+            logger.error("ViewItemsFrame: Error updating image label or scrollregion: %s", e)
 
 
     def handle_claim_item(self, item_id):
-        logging.debug(f"\nViewItemsFrame: handle_claim_item triggered for ItemID: {item_id}.")
+        logger.debug("ViewItemsFrame: handle_claim_item triggered for ItemID: %s.", item_id)
         self.main_app.show_claim_item_frame(item_id)
 
 
     def show(self):
-        logging.debug("ViewItemsFrame: show called.")
+        logger.debug("ViewItemsFrame: show called.")
         super().show()
-        self.load_items()
-        self.create_widgets()
+        self.load_items() # Feed dibuat setelah halaman pertama selesai dimuat
         # # Memastikan _on_main_canvas_resize dipanggil setelah widget dibuat dan frame ditampilkan
         # # Ini mungkin diperlukan jika <Configure> tidak langsung terpicu dengan benar
         # self.main_canvas.update_idletasks()
@@ -356,8 +486,15 @@ class ViewItemsFrame(BaseFrame):
 
 
     def hide(self):
-        logging.debug("ViewItemsFrame: hide called.")
+        logger.debug("ViewItemsFrame: hide called.")
         super().hide()
+        # Batalkan unduhan gambar yang belum selesai karena labelnya akan dihapus
+        get_image_loader().cancel_group(self)
+        self.pending_image_tasks = []
         self.item_images = {}
+        self.items_list = []
+        self.next_cursor = None # Hentikan pemuatan halaman berikutnya saat frame tidak tampil
+        self.loading_more = False
+        self.footer_label = None
         for widget in self.scrollable_frame.winfo_children():
             widget.destroy()
\ No newline at end of file
@@ -0,0 +1,250 @@
+# src/image_storage/image_cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from src.config import IMAGE_CACHE_CONFIG
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class MemoryImageCache:
+    """
+    Cache LRU di memori untuk gambar PIL yang sudah di-decode dan diperkecil.
+
+    Kunci cache adalah (url, size) sehingga thumbnail dengan ukuran berbeda
+    untuk URL yang sama disimpan terpisah. Ukuran cache dibatasi berdasarkan
+    perkiraan jumlah byte piksel, bukan jumlah entri.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict() # (url, size) -> (image, nbytes)
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _estimate_bytes(image):
+        width, height = image.size
+        return width * height * max(1, len(image.getbands()))
+
+    def get(self, url, size):
+        """Mengembalikan gambar dari cache, atau None jika tidak ada."""
+        key = (url, size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key) # Tandai sebagai yang terakhir dipakai
+            return entry[0]
+
+    def put(self, url, size, image):
+        """Menyimpan gambar ke cache dan membuang entri yang paling lama tidak dipakai jika melebihi batas."""
+        nbytes = self._estimate_bytes(image)
+        if nbytes > self.max_bytes:
+            return # Gambar terlalu besar untuk disimpan di memori
+        key = (url, size)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._current_bytes -= old[1]
+            self._entries[key] = (image, nbytes)
+            self._current_bytes += nbytes
+            while self._current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+
+class DiskImageCache:
+    """
+    Cache isi file gambar (byte asli dari server) di disk, dengan kunci SHA-256 dari URL.
+
+    Setiap entri terdiri dari file data (<kunci>.img) dan file metadata (<kunci>.json)
+    yang menyimpan ETag, Last-Modified, dan waktu terakhir divalidasi. Jika total ukuran
+    melebihi max_bytes, file yang paling lama tidak diakses dihapus lebih dulu.
+    Total ukuran disimpan di memori (dihitung sekali dari isi direktori saat dibuat), jadi
+    direktori hanya di-scan ulang saat total melebihi max_bytes. Eviction memangkas sampai
+    EVICT_TARGET_RATIO * max_bytes agar cache yang penuh tidak di-scan ulang di setiap put.
+    """
+    EVICT_TARGET_RATIO = 0.9
+
+    def __init__(self, directory, max_bytes, fresh_seconds):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fresh_seconds = fresh_seconds
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            logger.warning("DiskImageCache: Failed to create cache directory %s: %s", self.directory, e)
+        self._current_bytes = sum(size for _, size, _ in self._scan_entries())
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.img', base + '.json'
+
+    def get(self, url):
+        """
+        Membaca entri cache untuk URL.
+
+        Returns:
+            tuple: (data_bytes, metadata_dict) jika ada, atau (None, None) jika tidak ada/rusak.
+        """
+        data_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            with open(data_path, 'rb') as f:
+                data = f.read()
+            os.utime(data_path) # Perbarui waktu akses untuk urutan eviction
+            return data, metadata
+        except (OSError, ValueError):
+            return None, None
+
+    def is_fresh(self, metadata):
+        """Entri dianggap segar (boleh dipakai tanpa revalidasi) selama fresh_seconds sejak validasi terakhir."""
+        return time.time() - metadata.get('validated_at', 0) < self.fresh_seconds
+
+    def validators(self, metadata):
+        """Mengembalikan header HTTP kondisional (If-None-Match / If-Modified-Since) untuk revalidasi."""
+        headers = {}
+        if metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+        return headers
+
+    def put(self, url, data, etag=None, last_modified=None):
+        """Menyimpan byte gambar beserta validatornya, lalu memangkas cache jika perlu."""
+        data_path, meta_path = self._paths(url)
+        metadata = {'url': url, 'etag': etag, 'last_modified': last_modified, 'validated_at': time.time()}
+        try:
+            old_size = os.path.getsize(data_path) # Entri yang ditimpa (URL sama)
+        except OSError:
+            old_size = 0
+        try:
+            # Tulis ke file sementara lalu rename agar pembaca lain tidak melihat file setengah jadi
+            tmp_data_path = f"{data_path}.{threading.get_ident()}.tmp"
+            with open(tmp_data_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_data_path, data_path)
+            self._write_metadata(meta_path, metadata)
+        except OSError as e:
+            logger.warning("DiskImageCache: Failed to write cache entry for %s: %s", url, e)
+            return
+        with self._lock:
+            self._current_bytes += len(data) - old_size
+            over_limit = self._current_bytes > self.max_bytes
+        if over_limit:
+            self._evict_if_needed()
+
+    def touch(self, url, metadata):
+        """Menandai entri sebagai baru divalidasi (setelah server membalas 304 Not Modified)."""
+        _, meta_path = self._paths(url)
+        metadata = dict(metadata, validated_at=time.time())
+        try:
+            self._write_metadata(meta_path, metadata)
+        except OSError as e:
+            logger.warning("DiskImageCache: Failed to update cache metadata for %s: %s", url, e)
+
+    def _write_metadata(self, meta_path, metadata):
+        tmp_meta_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_meta_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        os.replace(tmp_meta_path, meta_path)
+
+    def _scan_entries(self):
+        """Mengembalikan [(waktu_akses, ukuran, path_data), ...] untuk semua file data di direktori cache."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for dir_entry in it:
+                    if dir_entry.name.endswith('.img'):
+                        stat = dir_entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+        except OSError as e:
+            logger.warning("DiskImageCache: Failed to scan cache directory %s: %s", self.directory, e)
+        return entries
+
+    def _evict_if_needed(self):
+        with self._lock:
+            # Scan ulang sekaligus menyelaraskan total di memori dengan isi direktori
+            entries = self._scan_entries()
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                self._current_bytes = total
+                return
+            target = self.max_bytes * self.EVICT_TARGET_RATIO
+            entries.sort() # Yang paling lama diakses lebih dulu
+            for _, size, data_path in entries:
+                if total <= target:
+                    break
+                for path in (data_path, data_path[:-len('.img')] + '.json'):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+            self._current_bytes = total
+
+_memory_cache = None
+_disk_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_memory_cache():
+    """Mengembalikan cache memori bersama, dibuat saat pertama kali dibutuhkan."""
+    global _memory_cache
+    if _memory_cache is None:
+        with _cache_lock:
+            if _memory_cache is None:
+                _memory_cache = MemoryImageCache(IMAGE_CACHE_CONFIG['memory_max_bytes'])
+    return _memory_cache
+
+
+def get_disk_cache():
+    """Mengembalikan cache disk bersama, dibuat saat pertama kali dibutuhkan."""
+    global _disk_cache
+    if _disk_cache is None:
+        with _cache_lock:
+            if _disk_cache is None:
+                _disk_cache = DiskImageCache(
+                    IMAGE_CACHE_CONFIG['disk_dir'],
+                    IMAGE_CACHE_CONFIG['disk_max_bytes'],
+                    IMAGE_CACHE_CONFIG['fresh_seconds']
+                )
+    return _disk_cache
+
+
+# --- Test Block ---
+if __name__ == "__main__":
+    # Ini akan dijalankan hanya jika Anda menjalankan image_cache.py langsung
+    import tempfile
+    from PIL import Image
+
+    print("Testing MemoryImageCache...")
+    memory_cache = MemoryImageCache(max_bytes=2 * 100 * 100 * 3) # Muat tepat dua gambar RGB 100x100
+    for i in range(3):
+        memory_cache.put(f"https://example.com/{i}.jpg", (100, 100), Image.new('RGB', (100, 100)))
+    print(f"  Entry 0 evicted: {memory_cache.get('https://example.com/0.jpg', (100, 100)) is None}")
+    print(f"  Entry 2 cached: {memory_cache.get('https://example.com/2.jpg', (100, 100)) is not None}")
+
+    print("Testing DiskImageCache...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        disk_cache = DiskImageCache(tmp_dir, max_bytes=1500, fresh_seconds=60)
+        for i in range(3):
+            disk_cache.put(f"https://example.com/{i}.jpg", b"x" * 600, etag=f'"etag-{i}"')
+            time.sleep(0.01)
+        data, metadata = disk_cache.get("https://example.com/2.jpg")
+        print(f"  Entry 2: {len(data) if data else None} bytes, fresh={disk_cache.is_fresh(metadata)}, validators={disk_cache.validators(metadata)}")
+        print(f"  Entry 0 evicted: {disk_cache.get('https://example.com/0.jpg') == (None, None)}")
@@ -0,0 +1,251 @@
+# src/image_storage/image_loader.py
+
+import itertools
+import queue
+import threading
+from io import BytesIO
+
+import requests # Perlu instal requests: pip install requests
+from requests.adapters import HTTPAdapter
+from PIL import Image # Perlu instal Pillow: pip install Pillow
+
+from src.config import IMAGE_LOADER_CONFIG
+from src.image_storage.image_cache import get_memory_cache, get_disk_cache
+from src.image_storage.imagekit_service import get_thumbnail_url
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Prioritas tugas: angka lebih kecil diproses lebih dulu
+PRIORITY_VISIBLE = 0 # Gambar yang sedang terlihat di layar
+PRIORITY_BACKGROUND = 1 # Gambar di luar layar (dimuat jika worker sedang luang)
+
+
+class ImageLoadTask:
+    """
+    Satu permintaan unduh gambar yang diantrikan di ImageLoader.
+    Dikembalikan oleh ImageLoader.submit() agar pemanggil bisa membatalkan atau menaikkan prioritasnya.
+    """
+    def __init__(self, url, callback, size, priority, group):
+        self.url = url
+        self.callback = callback
+        self.size = size
+        self.priority = priority
+        self.group = group
+        self.cancelled = False
+        self.started = False
+        self._version = 0 # Naik setiap kali prioritas diubah; entri antrean lama diabaikan
+
+    def cancel(self):
+        """Membatalkan tugas. Callback tidak akan dipanggil jika tugas belum mulai diproses."""
+        self.cancelled = True
+
+
+class ImageLoader:
+    """
+    Pengunduh gambar bersama dengan jumlah worker terbatas.
+
+    Semua frame GUI memakai satu instance (lihat get_image_loader()) sehingga jumlah thread
+    dan koneksi ke ImageKit tetap terbatas berapa pun banyaknya gambar di layar.
+    Tugas diproses berdasarkan prioritas (gambar yang terlihat lebih dulu), lalu urutan masuk.
+    Satu requests.Session keep-alive dipakai bersama oleh semua worker.
+
+    Hasil unduhan disimpan di cache dua tingkat (lihat image_cache.py): thumbnail yang sudah
+    di-decode di memori, dan byte asli di disk dengan revalidasi ETag/Last-Modified.
+
+    Callback dipanggil di thread worker dengan argumen (image, error):
+    image adalah PIL.Image yang sudah di-decode (dan diperkecil jika size diberikan),
+    error adalah exception jika gagal. Jika gambar sudah ada di cache memori, callback
+    langsung dipanggil dari submit() di thread pemanggil. Frame GUI harus memindahkan
+    pembaruan widget ke thread utama dengan after().
+    """
+    def __init__(self, max_workers=4, timeout=10):
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = timeout
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count() # Pemecah seri agar tugas dengan prioritas sama tetap FIFO
+        self._groups = {} # group -> set(ImageLoadTask) yang belum selesai
+        self._lock = threading.Lock()
+        self._workers = []
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def submit(self, url, callback, size=None, priority=PRIORITY_BACKGROUND, group=None):
+        """
+        Mengantrikan unduhan gambar.
+
+        Args:
+            url (str): URL gambar.
+            callback (callable): Dipanggil dengan (image, error) di thread worker.
+            size (tuple, optional): (lebar, tinggi) maksimum dalam piksel, sesuai ukuran tampilan widget.
+            priority (int): PRIORITY_VISIBLE atau PRIORITY_BACKGROUND.
+            group (hashable, optional): Kunci pengelompokan (misal: frame pemilik) untuk cancel_group().
+
+        Returns:
+            ImageLoadTask: Tugas yang diantrikan (atau sudah selesai jika gambar ada di cache memori).
+        """
+        task = ImageLoadTask(url, callback, size, priority, group)
+        cached_image = get_memory_cache().get(url, size)
+        if cached_image is not None:
+            # Cache hit: tanpa jaringan dan tanpa decode ulang
+            task.started = True
+            callback(cached_image, None)
+            return task
+        with self._lock:
+            if group is not None:
+                self._groups.setdefault(group, set()).add(task)
+            self._ensure_workers()
+            self._enqueue(task)
+        return task
+
+    def reprioritize(self, task, priority):
+        """Mengubah prioritas tugas yang belum mulai diproses (misal: gambar baru terlihat setelah scroll)."""
+        with self._lock:
+            if task.started or task.cancelled or task.priority == priority:
+                return
+            task.priority = priority
+            task._version += 1
+            self._enqueue(task)
+
+    def cancel_group(self, group):
+        """Membatalkan semua tugas milik group yang belum selesai (misal: saat frame disembunyikan)."""
+        with self._lock:
+            tasks = self._groups.pop(group, set())
+        for task in tasks:
+            task.cancel()
+
+    def _enqueue(self, task):
+        self._queue.put((task.priority, next(self._sequence), task._version, task))
+
+    def _ensure_workers(self):
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._worker_loop, name=f"ImageLoader-{len(self._workers)}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _worker_loop(self):
+        while True:
+            _, _, version, task = self._queue.get()
+            with self._lock:
+                # Abaikan entri lama (prioritas sudah diubah), tugas batal, atau tugas yang sudah diambil worker lain
+                if task.cancelled or task.started or version != task._version:
+                    continue
+                task.started = True
+
+            image, error = None, None
+            try:
+                image = self._load(task)
+            except Exception as e:
+                error = e
+
+            with self._lock:
+                group_tasks = self._groups.get(task.group)
+                if group_tasks is not None:
+                    group_tasks.discard(task)
+                    if not group_tasks:
+                        del self._groups[task.group]
+
+            if task.cancelled:
+                continue
+            try:
+                task.callback(image, error)
+            except Exception as e:
+                logger.error("ImageLoader: Error in callback for URL %s: %s", task.url, e)
+
+    def _load(self, task):
+        """
+        Mengambil (dari cache disk atau jaringan) dan men-decode satu gambar. Dijalankan di thread worker.
+
+        Jika size diberikan, URL ImageKit.io diminta dalam ukuran tersebut lewat transformasi URL
+        sehingga server yang memperkecil gambar. Untuk URL lain, JPEG di-decode langsung
+        dalam resolusi yang diperkecil (draft mode) sebelum thumbnail().
+        """
+        fetch_url = get_thumbnail_url(task.url, *task.size) if task.size else task.url
+        data = self._fetch_bytes(fetch_url)
+        img = Image.open(BytesIO(data))
+        if task.size:
+            img.draft(img.mode, task.size) # Hanya berpengaruh pada JPEG: decode dengan skala 1/2, 1/4 atau 1/8
+            img.thumbnail(task.size)
+        else:
+            img.load()
+        get_memory_cache().put(task.url, task.size, img)
+        return img
+
+    def _fetch_bytes(self, url):
+        """
+        Mengembalikan byte gambar untuk URL. Entri disk yang masih segar dipakai langsung;
+        entri yang sudah basi direvalidasi dengan request kondisional (304 = pakai cache).
+        """
+        disk_cache = get_disk_cache()
+        data, metadata = disk_cache.get(url)
+        if data is not None and disk_cache.is_fresh(metadata):
+            return data
+
+        headers = disk_cache.validators(metadata) if data is not None else {}
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            if data is not None:
+                # Jaringan gagal: lebih baik tampilkan salinan lama daripada error
+                logger.warning("ImageLoader: Revalidation failed for URL %s, using cached copy: %s", url, e)
+                return data
+            raise
+
+        if response.status_code == 304 and data is not None:
+            disk_cache.touch(url, metadata)
+            return data
+
+        response.raise_for_status()
+        disk_cache.put(
+            url,
+            response.content,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
+        return response.content
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def get_image_loader():
+    """Mengembalikan ImageLoader bersama untuk seluruh aplikasi, dibuat saat pertama kali dibutuhkan."""
+    global _loader
+    if _loader is None:
+        with _loader_lock:
+            if _loader is None:
+                _loader = ImageLoader(**IMAGE_LOADER_CONFIG)
+    return _loader
+
+
+# --- Test Block ---
+if __name__ == "__main__":
+    # Ini akan dijalankan hanya jika Anda menjalankan image_loader.py langsung
+    print("Testing ImageLoader...")
+
+    test_urls = [
+        "https://ik.imagekit.io/ilsoqlnic/dummy_wallet_1.jpg", # Ganti dengan URL gambar asli
+        "https://ik.imagekit.io/ilsoqlnic/dummy_wallet_2.jpg"
+    ]
+    done = threading.Event()
+    remaining = [len(test_urls)]
+
+    def on_loaded(image, error, url):
+        if error:
+            print(f"  Failed: {url} ({error})")
+        else:
+            print(f"  Loaded: {url} -> {image.size}")
+        remaining[0] -= 1
+        if remaining[0] == 0:
+            done.set()
+
+    loader = get_image_loader()
+    for test_url in test_urls:
+        loader.submit(test_url, lambda image, error, u=test_url: on_loaded(image, error, u), size=(120, 120))
+    done.wait(timeout=30)
+    print("ImageLoader test finished.")
@@ -0,0 +1,140 @@
+# src/image_storage/image_processing.py
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from PIL import Image, ImageOps # Perlu instal Pillow: pip install Pillow
+
+from src.config import IMAGE_PROCESSING_CONFIG
+
+# Ekstensi file untuk setiap format keluaran
+FORMAT_EXTENSIONS = {
+    'JPEG': '.jpg',
+    'WEBP': '.webp',
+}
+
+
+def process_image_file(file_path, max_dimension=1600, output_format='JPEG', quality=85):
+    """
+    Menyiapkan gambar sebelum diunggah: memutar sesuai orientasi EXIF, membuang metadata
+    (EXIF/GPS), memperkecil agar sisi terpanjang paling besar max_dimension, lalu meng-encode ulang.
+
+    Dijalankan di proses worker (lihat ImageProcessor), jadi harus berupa fungsi level modul.
+
+    Args:
+        file_path (str): Jalur file gambar lokal.
+        max_dimension (int): Panjang maksimum sisi terpanjang dalam piksel.
+        output_format (str): 'JPEG' atau 'WEBP'.
+        quality (int): Kualitas encoding (1-100).
+
+    Returns:
+        tuple: (data_bytes, ekstensi_file), misal (b'...', '.jpg').
+    """
+    output_format = output_format.upper()
+    with Image.open(file_path) as img:
+        # draft() mempercepat decode JPEG besar dengan langsung membaca pada skala yang lebih kecil
+        img.draft(img.mode, (max_dimension, max_dimension))
+        img = ImageOps.exif_transpose(img) # Terapkan orientasi EXIF ke piksel
+        if img.mode not in ('RGB', 'L') and not (output_format == 'WEBP' and img.mode == 'RGBA'):
+            if img.mode in ('RGBA', 'LA', 'P'):
+                # JPEG tidak mendukung transparansi: tempel di atas latar putih
+                img = img.convert('RGBA')
+                background = Image.new('RGB', img.size, (255, 255, 255))
+                background.paste(img, mask=img.getchannel('A'))
+                img = background
+            else:
+                img = img.convert('RGB')
+        img.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+        output = BytesIO()
+        # Gambar baru disimpan tanpa argumen exif, sehingga metadata asli (termasuk lokasi GPS) tidak ikut
+        save_options = {'quality': quality}
+        if output_format == 'JPEG':
+            save_options.update(optimize=True, progressive=True)
+        elif output_format == 'WEBP':
+            save_options.update(method=4)
+        img.save(output, format=output_format, **save_options)
+    return output.getvalue(), FORMAT_EXTENSIONS.get(output_format, '.' + output_format.lower())
+
+
+class ImageProcessor:
+    """
+    Menjalankan process_image_file di process pool agar beberapa foto diproses
+    paralel di semua core CPU (decode/resize/encode tidak terhambat GIL).
+    """
+    def __init__(self, max_workers=None, max_dimension=1600, output_format='JPEG', quality=85):
+        """
+        Args:
+            max_workers (int, optional): Jumlah proses worker. None = jumlah core CPU.
+            max_dimension (int): Panjang maksimum sisi terpanjang dalam piksel.
+            output_format (str): 'JPEG' atau 'WEBP'.
+            quality (int): Kualitas encoding (1-100).
+        """
+        self.max_workers = max_workers
+        self.max_dimension = max_dimension
+        self.output_format = output_format
+        self.quality = quality
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Process pool dibuat saat pertama kali dibutuhkan agar aplikasi tetap cepat dibuka
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def submit(self, file_path):
+        """
+        Menjadwalkan pemrosesan satu file.
+
+        Returns:
+            concurrent.futures.Future: Hasilnya (data_bytes, ekstensi_file).
+        """
+        return self._get_executor().submit(
+            process_image_file, file_path, self.max_dimension, self.output_format, self.quality
+        )
+
+    def process(self, file_path):
+        """Memproses satu file dan menunggu hasilnya. Aman dipanggil dari thread mana pun."""
+        return self.submit(file_path).result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_processor = None
+_processor_lock = threading.Lock()
+
+
+def get_image_processor():
+    """Mengembalikan ImageProcessor bersama, dibuat saat pertama kali dibutuhkan."""
+    global _processor
+    if _processor is None:
+        with _processor_lock:
+            if _processor is None:
+                _processor = ImageProcessor(**IMAGE_PROCESSING_CONFIG)
+    return _processor
+
+
+# --- Test Block ---
+if __name__ == "__main__":
+    # Ini akan dijalankan hanya jika Anda menjalankan image_processing.py langsung
+    import os
+    import tempfile
+
+    print("Testing image processing...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_file_path = os.path.join(tmp_dir, "large_photo.jpg")
+        Image.new('RGB', (4000, 3000), (200, 120, 40)).save(test_file_path, quality=95)
+        original_size = os.path.getsize(test_file_path)
+
+        data, ext = get_image_processor().process(test_file_path)
+        with Image.open(BytesIO(data)) as processed:
+            print(f"  Original: {original_size} bytes, 4000x3000")
+            print(f"  Processed: {len(data)} bytes, {processed.size[0]}x{processed.size[1]}, {ext}, EXIF: {bool(processed.info.get('exif'))}")
+    get_image_processor().shutdown()
@@ -4,6 +4,10 @@ from imagekitio import ImageKit
 # Mengimpor konfigurasi ImageKit.io dari src.config
 from src.config import IMAGEKIT_CONFIG
 import os # Diperlukan untuk mengecek keberadaan file
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 # --- Inisialisasi Klien ImageKit.io ---
 # Klien ImageKit.io diinisialisasi menggunakan konfigurasi dari config.py
@@ -11,7 +15,7 @@ try:
     # Pastikan IMAGEKIT_CONFIG memiliki kunci 'private_key', 'public_key', dan 'url_endpoint'
     # dan nilai-nilainya tidak None (sudah dimuat dari .env)
     if not all([IMAGEKIT_CONFIG.get('private_key'), IMAGEKIT_CONFIG.get('public_key'), IMAGEKIT_CONFIG.get('url_endpoint')]):
-         print("Kesalahan konfigurasi ImageKit.io: Kunci atau URL endpoint tidak lengkap di config.py atau .env.")
+         logger.error("Kesalahan konfigurasi ImageKit.io: Kunci atau URL endpoint tidak lengkap di config.py atau .env.")
          imagekit = None # Set None jika konfigurasi tidak lengkap
     else:
         imagekit = ImageKit(
@@ -19,10 +23,10 @@ try:
             public_key=IMAGEKIT_CONFIG['public_key'],
             url_endpoint=IMAGEKIT_CONFIG['url_endpoint']
         )
-        print("Klien ImageKit.io berhasil diinisialisasi.") # Opsional: untuk debugging
+        logger.debug("Klien ImageKit.io berhasil diinisialisasi.")
 except Exception as e:
     # Menampilkan error jika inisialisasi gagal (misal: kunci salah, format salah)
-    print(f"Error inisialisasi ImageKit.io: {e}")
+    logger.error("Error inisialisasi ImageKit.io: %s", e)
     imagekit = None # Set None jika gagal agar tidak crash saat digunakan
 
 # --- Fungsi untuk Interaksi ImageKit.io ---
@@ -41,12 +45,12 @@ def upload_image(file_path, file_name, options=None):
                 Kembalikan objek response agar GUI bisa mengakses response.url.
     """
     if imagekit is None:
-        print("ImageKit.io client tidak terinisialisasi. Unggah dibatalkan.")
+        logger.error("ImageKit.io client tidak terinisialisasi. Unggah dibatalkan.")
         return None
 
     # Periksa apakah file_path valid dan file ada
     if not os.path.exists(file_path):
-        print(f"Gagal mengunggah: File tidak ditemukan di jalur '{file_path}'.")
+        logger.warning("Gagal mengunggah: File tidak ditemukan di jalur '%s'.", file_path)
         return None
 
     try:
@@ -62,9 +66,80 @@ def upload_image(file_path, file_name, options=None):
         return upload_response
 
     except Exception as e:
-        print(f"Gagal mengunggah gambar ke ImageKit.io: {e}")
+        logger.warning("Gagal mengunggah gambar ke ImageKit.io: %s", e)
+        return None
+
+def upload_image_bytes(data, file_name, options=None):
+    """
+    Mengunggah gambar yang sudah ada di memori (misal: hasil image_processing) ke ImageKit.io.
+
+    Args:
+        data (bytes): Isi file gambar.
+        file_name (str): Nama yang diinginkan untuk file di ImageKit.io.
+        options (dict, optional): Opsi tambahan untuk unggahan (lihat dokumentasi ImageKit.io).
+
+    Returns:
+        object: Objek response dari ImageKit.io (memiliki atribut url, fileId, dll.), atau None jika gagal.
+    """
+    if imagekit is None:
+        logger.error("ImageKit.io client tidak terinisialisasi. Unggah dibatalkan.")
+        return None
+
+    try:
+        upload_response = imagekit.upload_file(
+            file=data, # Bytes
+            file_name=file_name, # Nama file di ImageKit.io
+            options=options or {} # Gunakan opsi yang diberikan atau dictionary kosong
+        )
+        return upload_response
+
+    except Exception as e:
+        logger.warning("Gagal mengunggah gambar ke ImageKit.io: %s", e)
         return None
 
+
+def is_imagekit_url(url):
+    """
+    Mengecek apakah URL dilayani oleh ImageKit.io (endpoint dari konfigurasi atau domain ik.imagekit.io),
+    sehingga mendukung parameter transformasi URL.
+    """
+    try:
+        host = urlsplit(url).netloc.lower()
+    except ValueError:
+        return False
+    if not host:
+        return False
+    endpoint_host = urlsplit(IMAGEKIT_CONFIG.get('url_endpoint') or '').netloc.lower()
+    return host == endpoint_host or host.endswith('ik.imagekit.io')
+
+
+def get_thumbnail_url(url, width, height):
+    """
+    Membuat URL rendisi gambar yang sudah diperkecil oleh server ImageKit.io.
+
+    Menggunakan transformasi URL "tr=w-<lebar>,h-<tinggi>,c-at_max" sehingga gambar diperkecil
+    dengan rasio aspek tetap agar muat di dalam kotak lebar x tinggi (tidak diperbesar),
+    sama seperti PIL Image.thumbnail().
+
+    Args:
+        url (str): URL gambar asli.
+        width (int): Lebar maksimum dalam piksel.
+        height (int): Tinggi maksimum dalam piksel.
+
+    Returns:
+        str: URL dengan parameter transformasi, atau URL asli jika bukan URL ImageKit.io
+             atau URL sudah memiliki transformasi.
+    """
+    if not is_imagekit_url(url):
+        return url
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if any(key == 'tr' for key, _ in query) or '/tr:' in parts.path:
+        return url # Jangan menimpa transformasi yang sudah ada
+    query.append(('tr', f"w-{int(width)},h-{int(height)},c-at_max"))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query, safe=',-_'), parts.fragment))
+
+
 # --- Test Block ---
 if __name__ == "__main__":
     # Ini akan dijalankan hanya jika Anda menjalankan imagekit_service.py langsung
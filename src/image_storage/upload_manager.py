@@ -0,0 +1,232 @@
+# src/image_storage/upload_manager.py
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import UPLOAD_CONFIG
+from src.image_storage.imagekit_service import upload_image_bytes
+from src.image_storage.image_processing import get_image_processor
+from src.database.image_upload_dao import get_image_upload_url, add_image_upload
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Status unggah per file
+UPLOAD_PENDING = 'pending'
+UPLOAD_IN_PROGRESS = 'uploading'
+UPLOAD_DONE = 'done'
+UPLOAD_FAILED = 'failed'
+
+
+class UploadJob:
+    """Satu file yang akan diunggah ke ImageKit.io beserta status dan hasilnya."""
+    def __init__(self, path, file_name, options=None):
+        self.path = path
+        self.file_name = file_name # Nama file di ImageKit.io
+        self.options = options
+        self.status = UPLOAD_PENDING
+        self.url = None
+        self.error = None
+        self.attempts = 0
+        self.processed = None # (data_bytes, ekstensi) hasil image_processing, disimpan untuk unggah ulang
+        self.content_hash = None # SHA-256 (hex) dari byte yang diunggah
+        self.reused = False # True jika URL diambil dari unggahan sebelumnya (konten sama)
+
+    @property
+    def display_name(self):
+        return os.path.basename(self.path)
+
+
+class UploadBatch:
+    """
+    Sekumpulan file yang diunggah untuk satu laporan/klaim.
+    Batch disimpan oleh form agar unggah ulang hanya memproses file yang gagal.
+    """
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+
+    @property
+    def urls(self):
+        """URL file yang berhasil diunggah, sesuai urutan file dipilih."""
+        return [job.url for job in self.jobs if job.status == UPLOAD_DONE]
+
+    @property
+    def failed_jobs(self):
+        return [job for job in self.jobs if job.status == UPLOAD_FAILED]
+
+    def is_complete(self):
+        """True jika semua file sudah berhasil diunggah."""
+        return all(job.status == UPLOAD_DONE for job in self.jobs)
+
+
+class UploadManager:
+    """
+    Mengunggah beberapa file ke ImageKit.io secara paralel dengan jumlah worker terbatas.
+    Sebelum diunggah, setiap gambar diproses (orientasi EXIF, buang metadata, perkecil,
+    encode ulang) di process pool ImageProcessor.
+
+    Byte hasil pemrosesan di-hash (SHA-256). Jika hash yang sama sudah pernah diunggah
+    (dicari di indeks memori lalu tabel ImageUploads), URL lama dipakai ulang tanpa unggah.
+
+    Callback on_progress dipanggil setiap kali status satu file berubah, dan on_complete
+    dipanggil sekali setelah semua file dalam satu putaran selesai (berhasil atau gagal).
+    Keduanya dipanggil di thread worker; frame GUI harus memindahkan pembaruan widget
+    ke thread utama dengan after().
+    """
+    def __init__(self, max_workers=3, process_images=True):
+        """
+        Args:
+            max_workers (int): Jumlah file yang diunggah bersamaan.
+            process_images (bool): Jika False, file asli diunggah tanpa diproses.
+        """
+        self.process_images = process_images
+        self._known_urls = {} # Indeks lokal hash -> URL untuk sesi ini
+        self._hash_locks = {} # hash -> Lock, agar file identik dalam satu batch hanya diunggah sekali
+        self._index_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="UploadManager")
+
+    def upload(self, batch, on_progress=None, on_complete=None):
+        """
+        Mengunggah semua file di batch yang belum berhasil (pending atau gagal).
+        File yang sudah berhasil tidak diunggah ulang.
+
+        Args:
+            batch (UploadBatch): File yang akan diunggah.
+            on_progress (callable, optional): Dipanggil dengan (UploadJob) saat status berubah.
+            on_complete (callable, optional): Dipanggil dengan (UploadBatch) setelah putaran selesai.
+        """
+        jobs = [job for job in batch.jobs if job.status != UPLOAD_DONE]
+        if not jobs:
+            if on_complete:
+                on_complete(batch)
+            return
+
+        remaining = [len(jobs)]
+        lock = threading.Lock()
+
+        def run(job):
+            job.status = UPLOAD_IN_PROGRESS
+            job.error = None
+            job.attempts += 1
+            self._notify(on_progress, job)
+            try:
+                logger.debug("UploadManager: Uploading %s as '%s' (attempt %s)...", job.display_name, job.file_name, job.attempts)
+                url = self._upload_job(job)
+                if url:
+                    job.url = url
+                    job.status = UPLOAD_DONE
+                    logger.info("UploadManager: Upload successful. URL: %s", job.url)
+                else:
+                    job.status = UPLOAD_FAILED
+                    job.error = "Unggah gagal"
+                    logger.warning("UploadManager: Failed to upload '%s'.", job.display_name)
+            except Exception as e:
+                job.status = UPLOAD_FAILED
+                job.error = str(e)
+                logger.error("UploadManager: An error occurred during upload of '%s': %s", job.display_name, e)
+            self._notify(on_progress, job)
+
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished and on_complete:
+                on_complete(batch)
+
+        for job in jobs:
+            job.status = UPLOAD_PENDING
+            self._notify(on_progress, job)
+            self._executor.submit(run, job)
+
+    def _prepare(self, job):
+        """
+        Menyiapkan byte yang akan diunggah, sekali per job (hasilnya disimpan untuk unggah ulang).
+        Jika file tidak bisa diproses (atau pemrosesan dimatikan), byte file asli yang dipakai.
+
+        Returns:
+            tuple: (data_bytes, ekstensi_file)
+        """
+        if job.processed is None:
+            if self.process_images:
+                try:
+                    job.processed = get_image_processor().process(job.path)
+                except Exception as e:
+                    logger.warning("UploadManager: Could not process '%s', uploading original file: %s", job.display_name, e)
+            if job.processed is None:
+                with open(job.path, "rb") as file:
+                    job.processed = (file.read(), os.path.splitext(job.file_name)[1])
+            job.content_hash = hashlib.sha256(job.processed[0]).hexdigest()
+        return job.processed
+
+    def _upload_job(self, job):
+        """
+        Mengunggah satu job, atau memakai ulang URL jika konten yang sama sudah pernah diunggah.
+
+        Returns:
+            str: URL gambar, atau None jika gagal.
+        """
+        data, ext = self._prepare(job)
+        content_hash = job.content_hash
+
+        with self._index_lock:
+            hash_lock = self._hash_locks.setdefault(content_hash, threading.Lock())
+
+        with hash_lock:
+            url = self._known_urls.get(content_hash) or get_image_upload_url(content_hash)
+            if url:
+                logger.info("UploadManager: '%s' already uploaded (sha256 %s...), reusing URL.", job.display_name, content_hash[:12])
+                job.reused = True
+                self._known_urls[content_hash] = url
+                return url
+
+            # Ekstensi nama file disesuaikan dengan format hasil encode ulang
+            file_name = os.path.splitext(job.file_name)[0] + ext
+            response = upload_image_bytes(data, file_name, job.options)
+            if not (response and hasattr(response, 'url')):
+                return None
+
+            self._known_urls[content_hash] = response.url
+            add_image_upload(content_hash, response.url, getattr(response, 'file_id', None), len(data))
+            return response.url
+
+    @staticmethod
+    def _notify(callback, job):
+        if callback:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.error("UploadManager: Error in progress callback: %s", e)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_upload_manager():
+    """Mengembalikan UploadManager bersama, dibuat saat pertama kali dibutuhkan."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = UploadManager(**UPLOAD_CONFIG)
+    return _manager
+
+
+# --- Test Block ---
+if __name__ == "__main__":
+    # Ini akan dijalankan hanya jika Anda menjalankan upload_manager.py langsung
+    print("Testing UploadManager...")
+
+    test_paths = ["src/image_storage/dummy/dum.png"] # <--- GANTI DENGAN JALUR FILE ASLI
+    test_batch = UploadBatch(UploadJob(path, f"test_upload/{os.path.basename(path)}") for path in test_paths)
+    done = threading.Event()
+
+    get_upload_manager().upload(
+        test_batch,
+        on_progress=lambda job: print(f"  {job.display_name}: {job.status}"),
+        on_complete=lambda batch: done.set()
+    )
+    done.wait(timeout=60)
+    print(f"Uploaded URLs: {test_batch.urls}")
+    print(f"Failed files: {[job.display_name for job in test_batch.failed_jobs]}")
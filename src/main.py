@@ -25,6 +25,16 @@ from src.gui.admin_panel_frame import AdminPanelFrame
 from src.gui.notifications_frame import NotificationsFrame # Impor NotificationsFrame yang baru
 from src.gui.user_profile_frame import UserProfileFrame
 from src.gui.admin_panel_user_frame import AdminPanelUserFrame
+# Thread pool untuk menjalankan query DAO di luar thread GUI
+from src.utils.task_runner import TaskRunner
+from src.config import TASK_RUNNER_CONFIG, EMAIL_WORKER_IN_APP
+# Worker pengirim email dari tabel EmailOutbox
+from src.utils.email_worker import get_email_worker
+# Statistik query database untuk laporan di akhir sesi
+from src.database.query_stats import get_query_stats
+from src.utils.log_utils import get_logger, configure_logging
+
+logger = get_logger(__name__)
 
 
 
@@ -57,6 +67,15 @@ class MainApp:
         # Menyimpan durasi kedaluwarsa OTP agar bisa diakses oleh frame lain jika diperlukan
         self.otp_expiry_minutes = OTP_EXPIRY_MINUTES
 
+        # Task runner bersama: frame menjalankan query DAO di sini (lihat BaseFrame.run_in_background)
+        # Harus dibuat sebelum frame-frame di bawah
+        self.task_runner = TaskRunner(self.root, **TASK_RUNNER_CONFIG)
+
+        # Kirim email OTP/reset password dari EmailOutbox di thread latar belakang,
+        # kecuali worker dijalankan sebagai proses terpisah (python -m src.utils.email_worker)
+        if EMAIL_WORKER_IN_APP:
+            get_email_worker().start()
+
         # Membuat instance dari setiap frame GUI
         # Semua frame dibuat di awal, dan hanya satu yang ditampilkan pada satu waktu
         # Meneruskan 'self' (instance MainApp) ke setiap frame agar mereka bisa memanggil metode show_frame di MainApp
@@ -82,6 +101,22 @@ class MainApp:
         # Tampilkan frame pertama saat aplikasi dimulai (Login)
         self.show_login_frame()
 
+        # Tutup aplikasi lewat on_close agar data yang masih di buffer sempat disimpan
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """
+        Dipanggil saat jendela ditutup: menulis tanda-baca notifikasi yang masih di buffer,
+        menghentikan task runner, lalu menutup jendela.
+        """
+        logger.debug("MainApp: on_close called.")
+        try:
+            self.notifications_frame.flush_read_receipts_now()
+        except Exception as e:
+            logger.exception("MainApp: Error while flushing read receipts on exit: %s", e)
+        self.task_runner.shutdown()
+        self.root.destroy()
+
     def show_frame(self, frame_to_show):
         """
         Menyembunyikan semua frame yang mungkin sedang ditampilkan
@@ -169,7 +204,7 @@ class MainApp:
             user_id (int): UserID dari pengguna.
             username (str, optional): Username pengguna. Default None.
         """
-        print(f"MainApp: show_otp_verification_frame called for UserID: {user_id}, Username: {username}") # Debugging print
+        logger.debug("MainApp: show_otp_verification_frame called for UserID: %s, Username: %s", user_id, username)
         # Mengatur UserID (dan username) di frame OTP
         self.otp_frame.set_user_to_verify(user_id, username) # Teruskan username juga
         self.show_frame(self.otp_frame)
@@ -186,7 +221,7 @@ class MainApp:
                               Anda mungkin ingin menambahkan FullName, RoleName, NIM_NIP, Email di sini
                               dengan memanggil DAO lain jika diperlukan.
         """
-        print(f"MainApp: show_main_app_frame called for UserID: {user_data['UserID']}, IsAdmin: {user_data['IsAdmin']}")
+        logger.debug("MainApp: show_main_app_frame called for UserID: %s, IsAdmin: %s", user_data['UserID'], user_data['IsAdmin'])
 
         # --- Simpan user_data di instance MainApp ---
         self.user_data = user_data
@@ -198,7 +233,7 @@ class MainApp:
 
     def show_forgot_password_frame(self):
         """Menampilkan frame Lupa Password."""
-        print("MainApp: show_forgot_password_frame called.") # Debugging print
+        logger.debug("MainApp: show_forgot_password_frame called.")
         self.show_frame(self.forgot_password_frame)
         self.forgot_password_frame.entry_username_email.focus_set() # Set fokus ke field input
 
@@ -210,13 +245,13 @@ class MainApp:
         Args:
             reset_token (str, optional): Token reset password jika tersedia.
         """
-        print(f"MainApp: show_reset_password_frame called with token: {reset_token}") # Debugging print
+        logger.debug("MainApp: show_reset_password_frame called (token provided: %s).", reset_token is not None)
         # Meneruskan token ke frame reset password jika frame tersebut memiliki metode set_token
         if reset_token and hasattr(self.reset_password_frame, 'set_token'):
-             print(f"MainApp: Calling set_token({reset_token}) on ResetPasswordFrame.") # Debugging print
+             logger.debug("MainApp: Calling set_token() on ResetPasswordFrame.")
              self.reset_password_frame.set_token(reset_token) # Perlu implementasi di ResetPasswordFrame
         else:
-             print("MainApp: show_reset_password_frame called without token or ResetPasswordFrame has no set_token method.") # Debugging print
+             logger.debug("MainApp: show_reset_password_frame called without token or ResetPasswordFrame has no set_token method.")
 
 
         self.show_frame(self.reset_password_frame)
@@ -226,13 +261,13 @@ class MainApp:
 
     def show_report_item_frame(self):
         """Menampilkan frame Laporkan Barang Ditemukan."""
-        print("MainApp: show_report_item_frame called.") # Debugging print
+        logger.debug("MainApp: show_report_item_frame called.")
         self.show_frame(self.report_item_frame)
         self.report_item_frame.entry_item_name.focus_set() # Set fokus ke field pertama di form
 
     def show_view_items_frame(self):
         """Menampilkan frame Daftar Barang Ditemukan."""
-        print("MainApp: show_view_items_frame called.") # Debugging print
+        logger.debug("MainApp: show_view_items_frame called.")
         # load_items dan display_items dipanggil di metode show() di ViewItemsFrame
         self.show_frame(self.view_items_frame)
 
@@ -243,13 +278,13 @@ class MainApp:
         Args:
             item_id (int): ItemID dari barang yang akan diklaim.
         """
-        print(f"MainApp: show_claim_item_frame called for ItemID: {item_id}") # DEBUGGING PRINT
+        logger.debug("MainApp: show_claim_item_frame called for ItemID: %s", item_id)
         # Set ItemID di ClaimItemFrame agar frame tersebut tahu barang mana yang diklaim
         if hasattr(self.claim_item_frame, 'set_item_id'):
-             print(f"MainApp: Calling set_item_id({item_id}) on ClaimItemFrame.") # DEBUGGING PRINT
+             logger.debug("MainApp: Calling set_item_id(%s) on ClaimItemFrame.", item_id)
              self.claim_item_frame.set_item_id(item_id)
         else:
-             print("MainApp: ClaimItemFrame does not have set_item_id method.") # DEBUGGING PRINT
+             logger.debug("MainApp: ClaimItemFrame does not have set_item_id method.")
 
         self.show_frame(self.claim_item_frame)
 
@@ -257,7 +292,7 @@ class MainApp:
         """
         Menampilkan frame Daftar Klaim Saya.
         """
-        print("MainApp: show_my_claims_frame called.") # Debugging print
+        logger.debug("MainApp: show_my_claims_frame called.")
         # load_claims_data dan display_claims dipanggil di metode show() di MyClaimsFrame
         self.show_frame(self.my_claims_frame)
 
@@ -265,7 +300,7 @@ class MainApp:
         """
         Menampilkan frame Panel Admin.
         """
-        print("MainApp: show_admin_panel_frame called.") # Debugging print
+        logger.debug("MainApp: show_admin_panel_frame called.")
         # load_pending_claims dan display_claims dipanggil di metode show() di AdminPanelFrame
         self.show_frame(self.admin_panel_frame)
 
@@ -274,7 +309,7 @@ class MainApp:
         """
         Menampilkan frame Notifikasi Pengguna.
         """
-        print("MainApp: show_notifications_frame called.") # Debugging print
+        logger.debug("MainApp: show_notifications_frame called.")
         self.show_frame(self.notifications_frame)
     def show_admin_panel_user(self):
         """Show admin user management panel"""
@@ -285,8 +320,14 @@ class MainApp:
         self.show_frame(self.admin_panel_user_frame)
 
 if __name__ == "__main__":
+    configure_logging() # Level/format dari LOG_LEVEL, LOG_FORMAT, LOG_FILE, LOG_MODULE_LEVELS
     root = tk.Tk()
     root.attributes("-fullscreen", True)
     root.geometry("1600x2400")
     app = MainApp(root)
     root.mainloop()
+
+    # Ringkasan waktu query per fungsi DAO selama sesi ini (lihat src/database/query_stats.py)
+    query_stats = get_query_stats()
+    if query_stats.enabled:
+        logger.info("Query statistics for this session:\n%s", query_stats.report())
@@ -2,19 +2,50 @@
 
 import bcrypt # Menggunakan bcrypt untuk hashing password yang aman
 
-def hash_password(password):
+def hash_password(password, rounds=None):
     """
     Menghasilkan hash bcrypt untuk password yang diberikan.
     Bcrypt secara otomatis menangani salt.
+
+    Args:
+        password (str): Password plain text.
+        rounds (int, optional): Cost factor bcrypt. None = default bcrypt (12).
     """
     # Pastikan password adalah bytes sebelum hashing
     if isinstance(password, str):
         password = password.encode('utf-8')
 
     # Menghasilkan salt dan hash password
-    hashed = bcrypt.hashpw(password, bcrypt.gensalt())
+    salt = bcrypt.gensalt(rounds=rounds) if rounds else bcrypt.gensalt()
+    hashed = bcrypt.hashpw(password, salt)
     return hashed.decode('utf-8') # Mengembalikan hash sebagai string utf-8
 
+def get_hash_rounds(hashed_password):
+    """
+    Membaca cost factor dari hash bcrypt (format $2b$<rounds>$<salt+hash>).
+
+    Returns:
+        int: Cost factor, atau None jika hash tidak dikenali.
+    """
+    if isinstance(hashed_password, bytes):
+        hashed_password = hashed_password.decode('utf-8')
+    parts = (hashed_password or '').split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+def needs_rehash(hashed_password, rounds):
+    """
+    Memeriksa apakah hash perlu dibuat ulang karena cost factor-nya berbeda dari konfigurasi.
+
+    Args:
+        hashed_password (str): Hash bcrypt yang tersimpan.
+        rounds (int): Cost factor yang dikonfigurasi. None = tidak pernah rehash.
+    """
+    if not rounds:
+        return False
+    return get_hash_rounds(hashed_password) != rounds
+
 def check_password(password, hashed_password):
     """
     Memeriksa apakah password yang diberikan cocok dengan hash yang tersimpan.
@@ -57,3 +88,8 @@ if __name__ == "__main__":
     print(f"\nChecking password '{test_password}' against a different hash...")
     is_correct_another_hash = check_password(test_password, another_hashed)
     print(f"Is password correct? {is_correct_another_hash}")
+
+    # Menguji deteksi cost factor
+    print(f"\nRounds of hash: {get_hash_rounds(hashed)}")
+    print(f"Needs rehash for rounds=10? {needs_rehash(hashed, 10)}")
+    print(f"Needs rehash for rounds={get_hash_rounds(hashed)}? {needs_rehash(hashed, get_hash_rounds(hashed))}")
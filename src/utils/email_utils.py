@@ -1,12 +1,16 @@
 # src/utils/email_utils.py
 
 import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 # Mengimpor konfigurasi SMTP dari src.config
 from src.config import SMTP_CONFIG
 import os # Import os untuk test block
 from dotenv import load_dotenv # Import load_dotenv untuk test block
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 # --- Load environment variables for the test block ---
 # Note: In the main application entry point (main.py),
@@ -17,6 +21,38 @@ if __name__ == "__main__":
     load_dotenv()
 
 
+def _build_message(sender_email, receiver_email, subject, body):
+    """Membuat objek pesan email plain text."""
+    msg = MIMEMultipart()
+    msg['From'] = sender_email
+    msg['To'] = receiver_email
+    msg['Subject'] = subject
+
+    # Menambahkan isi email (plain text)
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+def _connect_smtp(smtp_host, smtp_port, timeout=30):
+    """
+    Membuka koneksi ke SMTP server sesuai port.
+    Gunakan SMTP_SSL untuk port 465 (SSL), SMTP dan starttls() untuk port 587 (TLS),
+    dan koneksi standar untuk port lain (misal: server SMTP lokal untuk pengujian).
+    """
+    if smtp_port == 465:
+        logger.debug("Connecting to SMTP server %s:%s using SSL...", smtp_host, smtp_port)
+        server = smtplib.SMTP_SSL(smtp_host, smtp_port, timeout=timeout)
+    elif smtp_port == 587:
+        logger.debug("Connecting to SMTP server %s:%s using TLS...", smtp_host, smtp_port)
+        server = smtplib.SMTP(smtp_host, smtp_port, timeout=timeout)
+        server.starttls() # Mengamankan koneksi
+    else:
+        # Port lain, coba koneksi standar tanpa TLS/SSL (tidak disarankan untuk kredensial)
+        logger.warning("Using standard SMTP connection on port %s for %s. TLS/SSL recommended.", smtp_port, smtp_host)
+        server = smtplib.SMTP(smtp_host, smtp_port, timeout=timeout)
+    return server
+
+
 def send_email(receiver_email, subject, body):
     """
     Mengirim email menggunakan konfigurasi SMTP eksternal dari config.py.
@@ -38,64 +74,117 @@ def send_email(receiver_email, subject, body):
     # Lakukan validasi dasar pada konfigurasi
     # Pesan error ini akan muncul jika salah satu nilainya None atau kosong
     if not all([sender_email, sender_password, smtp_host, smtp_port]):
-        print("Kesalahan konfigurasi SMTP: Detail pengirim atau server tidak lengkap di config.py atau .env.")
+        logger.error("Kesalahan konfigurasi SMTP: Detail pengirim atau server tidak lengkap di config.py atau .env.")
         return False
 
     try:
         # Membuat objek pesan email
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = receiver_email
-        msg['Subject'] = subject
-
-        # Menambahkan isi email (plain text)
-        msg.attach(MIMEText(body, 'plain'))
+        msg = _build_message(sender_email, receiver_email, subject, body)
 
         # Menghubungkan ke SMTP server
-        # Gunakan SMTP_SSL untuk port 465 (SSL)
-        # Gunakan SMTP dan starttls() untuk port 587 (TLS)
-        if smtp_port == 465:
-            print(f"Connecting to SMTP server {smtp_host}:{smtp_port} using SSL...")
-            server = smtplib.SMTP_SSL(smtp_host, smtp_port)
-        elif smtp_port == 587:
-            print(f"Connecting to SMTP server {smtp_host}:{smtp_port} using TLS...")
-            server = smtplib.SMTP(smtp_host, smtp_port)
-            server.starttls() # Mengamankan koneksi
-        else:
-             # Port lain, coba koneksi standar tanpa TLS/SSL (tidak disarankan untuk kredensial)
-             print(f"Warning: Using standard SMTP connection on port {smtp_port} for {smtp_host}. TLS/SSL recommended.")
-             server = smtplib.SMTP(smtp_host, smtp_port)
+        server = _connect_smtp(smtp_host, smtp_port)
 
 
         # Login ke server SMTP
-        print(f"Attempting to log in as {sender_email}...")
+        logger.debug("Attempting to log in as %s...", sender_email)
         server.login(sender_email, sender_password)
-        print("Login successful.")
+        logger.debug("Login successful.")
 
         # Mengirim email
-        print(f"Attempting to send email to {receiver_email}...")
+        logger.debug("Attempting to send email to %s...", receiver_email)
         server.sendmail(sender_email, receiver_email, msg.as_string())
-        print("Email sent successfully.")
+        logger.info("Email sent successfully.")
 
         # Menutup koneksi
         server.quit()
 
-        print(f"Email process completed from {sender_email} to {receiver_email} via {smtp_host}.")
+        logger.debug("Email process completed from %s to %s via %s.", sender_email, receiver_email, smtp_host)
         return True
 
     except smtplib.SMTPAuthenticationError:
-        print("Gagal mengirim email: Kesalahan autentikasi SMTP. Periksa SMTP_SENDER_EMAIL dan SMTP_SENDER_PASSWORD di .env. Pastikan App Password Google benar.")
+        logger.error("Gagal mengirim email: Kesalahan autentikasi SMTP. Periksa SMTP_SENDER_EMAIL dan SMTP_SENDER_PASSWORD di .env. Pastikan App Password Google benar.")
         return False
     except smtplib.SMTPConnectError as e:
-         print(f"Gagal mengirim email: Kesalahan koneksi SMTP. Pastikan SMTP_HOST dan SMTP_PORT benar, dan firewall tidak memblokir koneksi keluar. Error: {e}")
+         logger.error("Gagal mengirim email: Kesalahan koneksi SMTP. Pastikan SMTP_HOST dan SMTP_PORT benar, dan firewall tidak memblokir koneksi keluar. Error: %s", e)
          return False
     except smtplib.SMTPException as e:
-        print(f"Gagal mengirim email: Terjadi kesalahan SMTP: {e}")
+        logger.error("Gagal mengirim email: Terjadi kesalahan SMTP: %s", e)
         return False
     except Exception as e:
-        print(f"Gagal mengirim email: Terjadi kesalahan tak terduga: {e}")
+        logger.exception("Gagal mengirim email: Terjadi kesalahan tak terduga: %s", e)
         return False
 
+# --- Sesi SMTP (dipakai oleh worker email, lihat src/utils/email_worker.py) ---
+
+# Kesalahan untuk satu email yang tidak akan hilang jika dicoba lagi (alamat penerima ditolak)
+PERMANENT_SMTP_ERRORS = (smtplib.SMTPRecipientsRefused,)
+# Kesalahan pada sesi SMTP (login salah, alamat pengirim ditolak): semua email akan gagal dengan cara
+# yang sama, jadi email tidak boleh dianggap gagal permanen karenanya
+SESSION_SMTP_ERRORS = (smtplib.SMTPAuthenticationError, smtplib.SMTPSenderRefused)
+
+class OutgoingEmail:
+    """Satu email dari tabel EmailOutbox yang akan dikirim."""
+    def __init__(self, receiver_email, subject, body):
+        self.receiver_email = receiver_email
+        self.subject = subject
+        self.body = body
+
+
+class SMTPSession:
+    """
+    Satu koneksi SMTP yang sudah login dan dipakai ulang untuk banyak email.
+    Koneksi dibuka saat dibutuhkan dan dicek dengan NOOP jika sudah lama tidak dipakai.
+    """
+    def __init__(self, smtp_config, keepalive_check_seconds=30):
+        self.smtp_config = smtp_config
+        self.keepalive_check_seconds = keepalive_check_seconds
+        self.server = None
+        self.last_used = 0
+
+    def ensure_connected(self):
+        """Memastikan koneksi hidup dan sudah login; menyambung ulang jika perlu."""
+        if self.server is not None and time.monotonic() - self.last_used > self.keepalive_check_seconds:
+            try:
+                status, _ = self.server.noop()
+                if status != 250:
+                    self.close()
+            except smtplib.SMTPException:
+                self.close()
+            except OSError:
+                self.close()
+
+        if self.server is None:
+            server = _connect_smtp(self.smtp_config.get('host'), self.smtp_config.get('port'))
+            try:
+                # Login dilewati jika password kosong (misal: server SMTP lokal untuk pengujian)
+                if self.smtp_config.get('sender_password'):
+                    server.login(self.smtp_config.get('sender_email'), self.smtp_config.get('sender_password'))
+            except Exception:
+                server.close()
+                raise
+            self.server = server
+            logger.debug("SMTPSession: SMTP session opened.")
+        self.last_used = time.monotonic()
+
+    def send(self, email):
+        sender_email = self.smtp_config.get('sender_email')
+        msg = _build_message(sender_email, email.receiver_email, email.subject, email.body)
+        self.server.sendmail(sender_email, email.receiver_email, msg.as_string())
+        self.last_used = time.monotonic()
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                try:
+                    self.server.close()
+                except Exception:
+                    pass
+            self.server = None
+            logger.debug("SMTPSession: SMTP session closed.")
+
+
 # --- Email Body Templates ---
 
 def get_otp_email_body(user_full_name, otp_code, expiry_minutes=15):
@@ -206,6 +295,22 @@ if __name__ == "__main__":
     else:
         print("Failed to send test Reset Password email.")
 
+    # --- Test SMTPSession ---
+    # Untuk menguji tanpa server asli, jalankan server SMTP lokal, misal:
+    #   python -m aiosmtpd -n -l localhost:1025
+    # lalu gunakan konfigurasi di bawah (tanpa password sehingga login dilewati).
+    local_smtp_config = {'host': 'localhost', 'port': 1025, 'sender_email': 'noreply@example.com', 'sender_password': ''}
+    test_session = SMTPSession(local_smtp_config)
+    print(f"\nSending 3 emails in one session to local SMTP server {local_smtp_config['host']}:{local_smtp_config['port']}...")
+    try:
+        for i in range(3):
+            test_session.ensure_connected()
+            test_session.send(OutgoingEmail(test_receiver, f"Session test {i}", test_body_reset))
+            print(f"  Email {i}: sent")
+    except (smtplib.SMTPException, OSError) as e:
+        print(f"  Failed: {e}")
+    finally:
+        test_session.close()
 
     print("\nEmail utility testing finished.")
 
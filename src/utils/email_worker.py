@@ -0,0 +1,209 @@
+# src/utils/email_worker.py
+
+import argparse
+import smtplib
+import threading
+
+from src.config import EMAIL_WORKER_CONFIG, SMTP_CONFIG
+from src.database.email_outbox_dao import (
+    claim_outbox_batch, mark_outbox_sent, reschedule_outbox_emails, mark_outbox_dead,
+    requeue_dead_outbox_emails, get_outbox_status_counts
+)
+from src.utils.email_utils import OutgoingEmail, SMTPSession, PERMANENT_SMTP_ERRORS, SESSION_SMTP_ERRORS
+from src.utils.log_utils import get_logger, configure_logging
+
+logger = get_logger(__name__)
+
+
+class EmailWorker:
+    """
+    Mengirim email dari tabel EmailOutbox.
+
+    Setiap putaran mengklaim satu batch baris (lihat claim_outbox_batch), mengirimnya lewat
+    satu sesi SMTP yang dipakai ulang, lalu menandai hasilnya: terkirim, dijadwalkan ulang
+    dengan exponential backoff, atau dipindah ke dead-letter jika gagal permanen / melebihi
+    max_attempts. Karena klaim memakai lease di database, beberapa worker (thread di aplikasi
+    GUI maupun proses terpisah) bisa berjalan bersamaan, dan email yang sedang dikirim
+    saat worker crash akan diambil lagi setelah lease habis.
+    """
+    def __init__(self, smtp_config=None, batch_size=50, max_attempts=8, backoff_base=30, backoff_max=3600,
+                 lease_seconds=300, poll_interval=5):
+        """
+        Args:
+            smtp_config (dict, optional): Sama seperti SMTP_CONFIG. Default: SMTP_CONFIG.
+            batch_size (int): Jumlah email yang diklaim per putaran.
+            max_attempts (int): Percobaan per email sebelum dipindah ke dead-letter.
+            backoff_base (int): Jeda retry awal (detik); dikali dua setiap percobaan gagal.
+            backoff_max (int): Jeda retry maksimum (detik).
+            lease_seconds (int): Lama klaim batch sebelum boleh diambil worker lain.
+            poll_interval (float): Jeda (detik) sebelum mengecek outbox lagi saat kosong.
+        """
+        self.batch_size = max(1, int(batch_size))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+
+        self._session = SMTPSession(smtp_config or SMTP_CONFIG)
+        self._session_failures = 0 # Kegagalan sesi SMTP berturut-turut (koneksi/login), untuk backoff worker
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def _retry_delay(self, attempts):
+        return min(self.backoff_max, self.backoff_base * (2 ** max(0, attempts - 1)))
+
+    def _on_session_failure(self, rows, error):
+        """
+        Sesi SMTP gagal (tidak bisa tersambung, login ditolak, ...): kesalahan ini bukan milik satu
+        email, jadi semua email yang tersisa di batch dikembalikan tanpa menghitung percobaan dan
+        baru boleh diklaim lagi setelah jeda backoff. run_forever() ikut menunggu selama jeda itu.
+        """
+        self._session.close()
+        self._session_failures += 1
+        delay = self._retry_delay(self._session_failures)
+        logger.error("EmailWorker: SMTP session failed (%s in a row), returning %s emails to the queue for %s seconds: %s",
+                     self._session_failures, len(rows), delay, error)
+        reschedule_outbox_emails([row['EmailID'] for row in rows], delay, str(error), refund_attempt=True)
+
+    def run_once(self):
+        """
+        Mengklaim dan mengirim satu batch.
+
+        Returns:
+            int: Jumlah email yang diklaim (0 jika outbox kosong).
+        """
+        batch = claim_outbox_batch(self.batch_size, self.lease_seconds)
+        if not batch:
+            return 0
+
+        sent_ids = []
+        try:
+            for index, row in enumerate(batch):
+                email = OutgoingEmail(row['Recipient'], row['Subject'], row['Body'])
+                try:
+                    self._session.ensure_connected()
+                except (smtplib.SMTPException, OSError) as e:
+                    self._on_session_failure(batch[index:], e)
+                    break
+                try:
+                    self._session.send(email)
+                    sent_ids.append(row['EmailID'])
+                    self._session_failures = 0
+                except SESSION_SMTP_ERRORS as e:
+                    self._on_session_failure(batch[index:], e)
+                    break
+                except PERMANENT_SMTP_ERRORS as e:
+                    logger.warning("EmailWorker: Permanent failure for EmailID %s, moving to dead-letter: %s", row['EmailID'], e)
+                    mark_outbox_dead([row['EmailID']], str(e))
+                except (smtplib.SMTPException, OSError) as e:
+                    # Koneksi putus atau server sibuk: email ini dihitung gagal, sisa batch dikembalikan
+                    # tanpa menghitung percobaan karena belum sempat dikirim
+                    logger.warning("EmailWorker: Failed to send EmailID %s (attempt %s): %s", row['EmailID'], row['Attempts'], e)
+                    self._session.close()
+                    if row['Attempts'] >= self.max_attempts:
+                        mark_outbox_dead([row['EmailID']], str(e))
+                    else:
+                        reschedule_outbox_emails([row['EmailID']], self._retry_delay(row['Attempts']), str(e))
+                    remaining_ids = [other['EmailID'] for other in batch[index + 1:]]
+                    reschedule_outbox_emails(remaining_ids, self._retry_delay(row['Attempts']), refund_attempt=True)
+                    break
+        finally:
+            mark_outbox_sent(sent_ids)
+
+        logger.info("EmailWorker: Batch finished, %s/%s emails sent.", len(sent_ids), len(batch))
+        return len(batch)
+
+    def run_forever(self):
+        """Mengirim email terus-menerus sampai stop() dipanggil. Sesi SMTP ditutup saat outbox kosong."""
+        logger.info("EmailWorker: Started.")
+        while not self._stopping.is_set():
+            try:
+                claimed = self.run_once()
+            except Exception as e:
+                logger.exception("EmailWorker: Unexpected error: %s", e)
+                claimed = 0
+            if self._session_failures:
+                # Server SMTP bermasalah: tunggu jeda backoff sebelum mengklaim batch berikutnya
+                self._stopping.wait(self._retry_delay(self._session_failures))
+                continue
+            if claimed < self.batch_size:
+                # Outbox kosong (atau tinggal sedikit): tutup sesi dan tunggu email baru / wake()
+                if claimed == 0:
+                    self._session.close()
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+        self._session.close()
+        logger.info("EmailWorker: Stopped.")
+
+    def start(self):
+        """Menjalankan run_forever() di thread daemon (dipakai oleh aplikasi GUI)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self.run_forever, name="EmailWorker", daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        """Membangunkan worker agar segera mengecek outbox (misal setelah email baru ditulis)."""
+        self._wake.set()
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        else:
+            self._session.close() # Dipakai lewat run_once() tanpa thread
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_email_worker():
+    """Mengembalikan EmailWorker bersama, dibuat saat pertama kali dibutuhkan."""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = EmailWorker(**EMAIL_WORKER_CONFIG)
+    return _worker
+
+
+def wake_email_worker():
+    """Membangunkan worker di aplikasi ini jika sedang berjalan. Tidak melakukan apa-apa jika belum dibuat."""
+    if _worker is not None:
+        _worker.wake()
+
+
+# --- Entry Point ---
+# Menjalankan worker sebagai proses terpisah:
+#   python -m src.utils.email_worker              # kirim terus-menerus
+#   python -m src.utils.email_worker --once       # kirim sampai outbox kosong lalu keluar
+#   python -m src.utils.email_worker --requeue-dead   # kirim ulang semua email di dead-letter
+#   python -m src.utils.email_worker --stats      # tampilkan jumlah email per status
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Worker pengirim email dari tabel EmailOutbox.")
+    parser.add_argument('--once', action='store_true', help="Kirim sampai outbox kosong, lalu keluar.")
+    parser.add_argument('--requeue-dead', action='store_true', help="Kembalikan semua email 'dead' ke antrean sebelum mulai.")
+    parser.add_argument('--stats', action='store_true', help="Tampilkan jumlah email per status lalu keluar.")
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.stats:
+        print(f"EmailOutbox status counts: {get_outbox_status_counts()}")
+    else:
+        if args.requeue_dead:
+            print(f"Requeued {requeue_dead_outbox_emails()} dead emails.")
+
+        worker = get_email_worker()
+        if args.once:
+            while worker.run_once() > 0:
+                pass
+            worker.stop()
+        else:
+            try:
+                worker.run_forever()
+            except KeyboardInterrupt:
+                worker.stop()
@@ -0,0 +1,131 @@
+# src/utils/log_utils.py
+
+import json
+import logging
+import sys
+import threading
+import time
+
+from src.config import LOGGING_CONFIG
+
+# Semua logger aplikasi berada di bawah logger "src" (nama modul, misal "src.database.item_dao"),
+# sehingga level bisa diatur per paket: set_log_level("DEBUG", "src.database").
+ROOT_LOGGER_NAME = "src"
+
+# Atribut bawaan LogRecord; atribut lain (dari argumen extra=) ikut ditulis ke output JSON
+_RESERVED_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Memformat setiap log sebagai satu baris JSON (untuk dibaca alat agregasi log)."""
+    def format(self, record):
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def get_logger(name):
+    """
+    Mengembalikan logger untuk satu modul. Dipanggil sekali di level modul:
+
+        logger = get_logger(__name__)
+
+    Pesan ditulis dengan argumen gaya % agar format string hanya dibuat jika levelnya aktif:
+
+        logger.debug("Loaded %d items for user %s", len(items), user_id)
+    """
+    if name == "__main__" or not name.startswith(ROOT_LOGGER_NAME):
+        name = f"{ROOT_LOGGER_NAME}.{name}"
+    return logging.getLogger(name)
+
+
+def _parse_level(level):
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level: {level}")
+    return value
+
+
+def configure_logging(level=None, json_output=None, log_file=None, module_levels=None, force=False):
+    """
+    Memasang handler untuk logger "src". Dipanggil sekali di awal aplikasi (main.py) atau
+    di skrip mandiri seperti worker email. Argumen yang None diambil dari LOGGING_CONFIG.
+
+    Args:
+        level (str|int, optional): Level default, misal "INFO" atau "DEBUG".
+        json_output (bool, optional): True = satu baris JSON per log, False = teks biasa.
+        log_file (str, optional): Jika diisi, log ditulis ke file ini, bukan ke stderr.
+        module_levels (dict, optional): Level per logger, misal {"src.database": "DEBUG"}.
+        force (bool): Pasang ulang handler meskipun sudah dikonfigurasi.
+    """
+    global _configured
+    with _configure_lock:
+        if _configured and not force:
+            return
+
+        level = LOGGING_CONFIG['level'] if level is None else level
+        json_output = LOGGING_CONFIG['json'] if json_output is None else json_output
+        log_file = LOGGING_CONFIG['file'] if log_file is None else log_file
+        module_levels = LOGGING_CONFIG['module_levels'] if module_levels is None else module_levels
+
+        root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+        for handler in list(root_logger.handlers):
+            root_logger.removeHandler(handler)
+            handler.close()
+
+        handler = logging.FileHandler(log_file, encoding='utf-8') if log_file else logging.StreamHandler(sys.stderr)
+        if json_output:
+            handler.setFormatter(JsonFormatter())
+        else:
+            handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)-7s [%(threadName)s] %(name)s: %(message)s'))
+        root_logger.addHandler(handler)
+        root_logger.setLevel(_parse_level(level))
+        root_logger.propagate = False # Jangan cetak dua kali lewat root logger Python
+
+        for name, module_level in (module_levels or {}).items():
+            logging.getLogger(name).setLevel(_parse_level(module_level))
+
+        _configured = True
+
+
+def set_log_level(level, logger_name=ROOT_LOGGER_NAME):
+    """
+    Mengubah level log saat aplikasi berjalan, misal set_log_level("DEBUG", "src.database").
+
+    Args:
+        level (str|int): Level baru.
+        logger_name (str): Logger yang diubah. Default: semua logger aplikasi.
+    """
+    logging.getLogger(logger_name).setLevel(_parse_level(level))
+
+
+# --- Test Block ---
+if __name__ == "__main__":
+    # Ini akan dijalankan hanya jika Anda menjalankan log_utils.py langsung
+    print("Testing log_utils...")
+    test_logger = get_logger("src.database.test_dao")
+
+    configure_logging(level="INFO", json_output=False)
+    test_logger.debug("Hidden: %s", "debug is off") # Tidak diformat sama sekali
+    test_logger.info("Text output: %d items", 3)
+
+    configure_logging(level="INFO", json_output=True, force=True)
+    test_logger.warning("JSON output for user %s", 42, extra={'user_id': 42})
+
+    set_log_level("DEBUG", "src.database")
+    test_logger.debug("Debug enabled at runtime for %s", "src.database")
@@ -0,0 +1,56 @@
+# src/utils/notification_maintenance.py
+
+import argparse
+
+from src.config import NOTIFICATION_ARCHIVE_CONFIG
+from src.database.notification_dao import archive_read_notifications, get_notification_table_counts
+from src.utils.log_utils import get_logger, configure_logging
+
+logger = get_logger(__name__)
+
+
+def run_notification_archive(older_than_days=None, batch_size=None, max_batches=None, pause_seconds=None):
+    """
+    Menjalankan pengarsipan notifikasi dengan nilai default dari NOTIFICATION_ARCHIVE_CONFIG.
+
+    Args:
+        older_than_days (int, optional): Umur minimum notifikasi yang diarsipkan (hari).
+        batch_size (int, optional): Notifikasi per batch/transaksi.
+        max_batches (int, optional): Berhenti setelah sekian batch. None = sampai habis.
+        pause_seconds (float, optional): Jeda antar batch (detik).
+
+    Returns:
+        int: Jumlah notifikasi yang diarsipkan, None jika terjadi error.
+    """
+    return archive_read_notifications(
+        older_than_days=NOTIFICATION_ARCHIVE_CONFIG['older_than_days'] if older_than_days is None else older_than_days,
+        batch_size=NOTIFICATION_ARCHIVE_CONFIG['batch_size'] if batch_size is None else batch_size,
+        max_batches=max_batches,
+        pause_seconds=NOTIFICATION_ARCHIVE_CONFIG['pause_seconds'] if pause_seconds is None else pause_seconds
+    )
+
+
+# --- Entry Point ---
+# Dijalankan berkala (misal lewat cron) sebagai proses terpisah:
+#   python -m src.utils.notification_maintenance                      # arsipkan notifikasi dibaca > 90 hari
+#   python -m src.utils.notification_maintenance --older-than-days 30 --max-batches 10
+#   python -m src.utils.notification_maintenance --stats              # tampilkan jumlah baris lalu keluar
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memindahkan notifikasi lama yang sudah dibaca ke NotificationArchive.")
+    parser.add_argument('--older-than-days', type=int, help="Umur minimum notifikasi yang diarsipkan (hari).")
+    parser.add_argument('--batch-size', type=int, help="Jumlah notifikasi per batch/transaksi.")
+    parser.add_argument('--max-batches', type=int, help="Berhenti setelah sekian batch.")
+    parser.add_argument('--pause', type=float, help="Jeda antar batch (detik).")
+    parser.add_argument('--stats', action='store_true', help="Tampilkan jumlah notifikasi aktif/arsip lalu keluar.")
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.stats:
+        print(f"Notification table counts: {get_notification_table_counts()}")
+    else:
+        archived = run_notification_archive(args.older_than_days, args.batch_size, args.max_batches, args.pause)
+        if archived is None:
+            print("Archiving stopped because of a database error (see log). Completed batches are kept.")
+            raise SystemExit(1)
+        print(f"Archived {archived} notifications.")
+        print(f"Notification table counts: {get_notification_table_counts()}")
@@ -0,0 +1,177 @@
+# src/utils/password_service.py
+
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt # Menggunakan bcrypt untuk hashing password yang aman
+
+from src.config import PASSWORD_SERVICE_CONFIG
+from src.utils.auth_utils import hash_password, check_password, needs_rehash
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class PasswordService:
+    """
+    Menjalankan hashing dan verifikasi bcrypt di process pool.
+
+    bcrypt sengaja lambat (ratusan milidetik per panggilan pada cost factor yang wajar), jadi
+    tidak boleh berjalan di thread utama Tkinter. submit_hash()/submit_check() langsung
+    mengembalikan Future; hash()/check() menunggu hasilnya dan dipakai dari thread worker
+    (misal di dalam DAO yang dijalankan lewat BaseFrame.run_in_background).
+    """
+    def __init__(self, max_workers=2, rounds=None):
+        """
+        Args:
+            max_workers (int, optional): Jumlah proses worker. None = jumlah core CPU.
+            rounds (int, optional): Cost factor bcrypt untuk hash baru. None = default bcrypt (12).
+                Hash lama dengan cost factor berbeda dibuat ulang saat login (lihat needs_rehash).
+        """
+        self.max_workers = max_workers
+        self.rounds = rounds
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Process pool dibuat saat pertama kali dibutuhkan agar aplikasi tetap cepat dibuka
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _discard_executor(self, executor):
+        # Pool yang rusak (proses worker mati) tidak bisa dipakai lagi; pool baru dibuat saat dibutuhkan.
+        # Hanya dibuang jika belum diganti oleh thread lain.
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn, *args):
+        """Menjadwalkan fn di process pool; jika pool sudah rusak, dibuat ulang dan dicoba sekali lagi."""
+        executor = self._get_executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            logger.warning("PasswordService: process pool is broken, recreating it.")
+            self._discard_executor(executor)
+            return self._get_executor().submit(fn, *args)
+
+    def _run(self, fn, *args):
+        """Menjalankan fn di process pool dan menunggu hasilnya; dicoba sekali lagi di pool baru jika pool rusak."""
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                return executor.submit(fn, *args).result()
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                if attempt:
+                    raise
+                logger.warning("PasswordService: process pool is broken, retrying on a new pool.")
+
+    def submit_hash(self, password):
+        """
+        Menjadwalkan hashing password.
+
+        Returns:
+            concurrent.futures.Future: Hasilnya hash bcrypt (str).
+        """
+        return self._submit(hash_password, password, self.rounds)
+
+    def submit_check(self, password, hashed_password):
+        """
+        Menjadwalkan verifikasi password terhadap hash yang tersimpan.
+
+        Returns:
+            concurrent.futures.Future: Hasilnya True jika cocok.
+        """
+        return self._submit(check_password, password, hashed_password)
+
+    def hash(self, password):
+        """Menghasilkan hash bcrypt dan menunggu hasilnya. Jangan dipanggil dari thread utama GUI."""
+        return self._run(hash_password, password, self.rounds)
+
+    def check(self, password, hashed_password):
+        """Memverifikasi password dan menunggu hasilnya. Jangan dipanggil dari thread utama GUI."""
+        return self._run(check_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password):
+        """True jika cost factor hash berbeda dari cost factor yang dikonfigurasi."""
+        return needs_rehash(hashed_password, self.rounds)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+def calibrate_bcrypt_rounds(target_ms=250, min_rounds=10, max_rounds=16, samples=3):
+    """
+    Mencari cost factor bcrypt terbesar yang waktu hashing-nya tidak melebihi target_ms
+    di mesin ini. Setiap kenaikan satu cost factor menggandakan waktu hashing.
+
+    Args:
+        target_ms (float): Target waktu satu kali hashing (milidetik).
+        min_rounds (int): Cost factor minimum yang selalu dipakai meskipun lebih lambat dari target.
+        max_rounds (int): Cost factor maksimum yang dicoba.
+        samples (int): Jumlah pengukuran per cost factor (diambil yang tercepat).
+
+    Returns:
+        tuple: (rounds, waktu_ms) cost factor terpilih dan waktu hashing terukurnya.
+    """
+    password = b"calibration-password"
+    chosen = (min_rounds, None)
+    for rounds in range(min_rounds, max_rounds + 1):
+        salt = bcrypt.gensalt(rounds=rounds)
+        timings = []
+        for _ in range(max(1, samples)):
+            start = time.perf_counter()
+            bcrypt.hashpw(password, salt)
+            timings.append((time.perf_counter() - start) * 1000)
+        elapsed_ms = min(timings)
+        logger.info("PasswordService: bcrypt rounds=%s: %.0f ms", rounds, elapsed_ms)
+
+        if elapsed_ms > target_ms and rounds > min_rounds:
+            break
+        chosen = (rounds, elapsed_ms)
+        if elapsed_ms > target_ms:
+            break # min_rounds sudah lebih lambat dari target
+        if elapsed_ms * 2 > target_ms:
+            break # Cost factor berikutnya (dua kali lebih lambat) pasti melebihi target
+    return chosen
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_password_service():
+    """Mengembalikan PasswordService bersama, dibuat saat pertama kali dibutuhkan."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = PasswordService(**PASSWORD_SERVICE_CONFIG)
+    return _service
+
+
+# --- Test Block ---
+if __name__ == "__main__":
+    # Ini akan dijalankan hanya jika Anda menjalankan password_service.py langsung
+    print("Testing PasswordService...")
+
+    service = get_password_service()
+    futures = [service.submit_hash(f"password-{i}") for i in range(4)] # Diproses paralel
+    hashes = [future.result() for future in futures]
+    print(f"  Hashed {len(hashes)} passwords in parallel.")
+    print(f"  Correct password: {service.check('password-0', hashes[0])}")
+    print(f"  Wrong password: {service.check('wrong', hashes[0])}")
+    service.shutdown()
+
+    print("\nCalibrating bcrypt cost factor (target 250 ms)...")
+    rounds, elapsed_ms = calibrate_bcrypt_rounds(target_ms=250)
+    print(f"  Suggested rounds: {rounds} ({elapsed_ms:.0f} ms per hash)")
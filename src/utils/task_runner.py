@@ -0,0 +1,170 @@
+# src/utils/task_runner.py
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import TASK_RUNNER_CONFIG
+from src.utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class BackgroundTask:
+    """
+    Satu pekerjaan yang dijalankan TaskRunner di thread worker.
+    Dikembalikan oleh TaskRunner.submit() agar pemanggil bisa membatalkannya.
+    """
+    def __init__(self, key=None):
+        self.key = key
+        self.cancelled = False
+        self.done = False
+
+    def cancel(self):
+        """Membatalkan tugas. Hasilnya dibuang dan callback tidak dipanggil."""
+        self.cancelled = True
+
+
+class TaskRunner:
+    """
+    Menjalankan pekerjaan yang memblokir (query DAO, hashing, dll.) di thread pool,
+    lalu mengirim hasilnya kembali ke thread utama Tkinter.
+
+    Thread worker tidak pernah menyentuh widget atau memanggil after(): hasil dimasukkan ke
+    antrean, dan thread utama mengurasnya dengan root.after() selama masih ada tugas berjalan.
+    Callback on_success/on_error dan on_done selalu dipanggil di thread utama.
+
+    Jika tugas baru dikirim dengan key yang sama, tugas lama dengan key tersebut dianggap basi
+    dan hasilnya dibuang (misal: pengguna membuka frame yang sama dua kali berturut-turut).
+    """
+    def __init__(self, root, max_workers=4, poll_interval_ms=30):
+        """
+        Args:
+            root: Jendela root Tkinter (tempat after() dijadwalkan).
+            max_workers (int): Jumlah thread worker.
+            poll_interval_ms (int): Interval pengecekan antrean hasil saat ada tugas berjalan.
+        """
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="TaskRunner")
+        self._results = queue.Queue()
+        self._latest_by_key = {} # key -> BackgroundTask terbaru (hanya diakses di thread utama)
+        self._pending = 0 # Jumlah tugas yang hasilnya belum diproses (hanya diakses di thread utama)
+        self._poll_after_id = None
+
+    def submit(self, func, *args, on_success=None, on_error=None, on_done=None, key=None, **kwargs):
+        """
+        Menjalankan func(*args, **kwargs) di thread worker. Harus dipanggil dari thread utama.
+
+        Args:
+            func (callable): Pekerjaan yang memblokir. Tidak boleh menyentuh widget Tkinter.
+            on_success (callable, optional): Dipanggil dengan hasil func di thread utama.
+            on_error (callable, optional): Dipanggil dengan exception di thread utama.
+                Jika tidak diberikan, error hanya dicetak ke konsol.
+            on_done (callable, optional): Dipanggil tanpa argumen setelah on_success/on_error
+                (juga untuk tugas yang dibatalkan), misal untuk menyembunyikan indikator loading.
+            key (hashable, optional): Tugas sebelumnya dengan key yang sama dibatalkan.
+
+        Returns:
+            BackgroundTask: Tugas yang dijadwalkan.
+        """
+        task = BackgroundTask(key)
+        if key is not None:
+            previous = self._latest_by_key.get(key)
+            if previous is not None:
+                previous.cancel() # Hasil lama sudah basi
+            self._latest_by_key[key] = task
+
+        def run():
+            if task.cancelled:
+                self._results.put((task, None, None, on_success, on_error, on_done))
+                return
+            try:
+                result = func(*args, **kwargs)
+                self._results.put((task, result, None, on_success, on_error, on_done))
+            except Exception as e:
+                self._results.put((task, None, e, on_success, on_error, on_done))
+
+        self._pending += 1
+        self._executor.submit(run)
+        self._ensure_polling()
+        return task
+
+    def _ensure_polling(self):
+        if self._poll_after_id is None:
+            self._poll_after_id = self.root.after(self.poll_interval_ms, self._drain_results)
+
+    def _drain_results(self):
+        """Memproses semua hasil yang sudah selesai. Dijalankan di thread utama."""
+        self._poll_after_id = None
+        while True:
+            try:
+                task, result, error, on_success, on_error, on_done = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            task.done = True
+            if task.key is not None and self._latest_by_key.get(task.key) is task:
+                del self._latest_by_key[task.key]
+
+            try:
+                if not task.cancelled:
+                    if error is None:
+                        if on_success:
+                            on_success(result)
+                    elif on_error:
+                        on_error(error)
+                    else:
+                        logger.error("TaskRunner: Unhandled error in background task: %s", error)
+            except Exception as e:
+                logger.exception("TaskRunner: Error in task callback: %s", e)
+            finally:
+                if on_done:
+                    try:
+                        on_done()
+                    except Exception as e:
+                        logger.exception("TaskRunner: Error in task on_done callback: %s", e)
+
+        if self._pending > 0:
+            self._ensure_polling()
+
+    def shutdown(self):
+        """Menghentikan thread pool tanpa menunggu tugas yang masih berjalan."""
+        if self._poll_after_id is not None:
+            try:
+                self.root.after_cancel(self._poll_after_id)
+            except Exception:
+                pass
+            self._poll_after_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def is_main_thread():
+    """True jika kode sedang berjalan di thread utama (thread Tkinter)."""
+    return threading.current_thread() is threading.main_thread()
+
+
+# --- Test Block ---
+if __name__ == "__main__":
+    # Ini akan dijalankan hanya jika Anda menjalankan task_runner.py langsung
+    import time
+    import tkinter as tk
+
+    print("Testing TaskRunner...")
+    root = tk.Tk()
+    root.withdraw()
+    runner = TaskRunner(root, **TASK_RUNNER_CONFIG)
+
+    def slow_query(value, delay):
+        time.sleep(delay)
+        return value
+
+    # Tugas pertama dengan key yang sama akan dibuang karena tugas kedua lebih baru
+    runner.submit(slow_query, "stale", 0.3, key="demo", on_success=lambda r: print(f"  Unexpected result: {r}"))
+    runner.submit(slow_query, "fresh", 0.1, key="demo", on_success=lambda r: print(f"  Result: {r} (main thread: {is_main_thread()})"))
+    runner.submit(slow_query, None, "bad", on_error=lambda e: print(f"  Error delivered: {type(e).__name__}"))
+
+    root.after(1000, root.destroy)
+    root.mainloop()
+    runner.shutdown()
+    print("TaskRunner test finished.")